@@ -0,0 +1,546 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+from indice_documentos import IndiceDocumentos
+
+log = logging.getLogger(__name__)
+
+# Columnas de GlamourProspectosDB en el orden de la hoja
+COLUMNAS = [
+    "Documento_ID", "Nombre", "Tipo_ID", "WhatsApp", "Email", "Direccion", "Barrio",
+    "Departamento", "Ciudad", "Genero", "Orientacion", "Estado_Civil", "Sangre", "Hijos",
+    "Num_Hijos", "Nacimiento_Lugar", "Nacimiento_Fecha", "Medio", "Medio_Otro", "Estudios",
+    "Ingles", "Computacion", "Exp_Laboral", "Fecha_Pre", "Estado",
+    "Motivacion", "Expectativas", "Fetiches", "Disgusto", "Consentimiento_Familiar",
+    "Horario_Preferido", "Observaciones_Entrevista", "Fecha_Entrevista",
+    "Arquetipo", "Respuestas_Arquetipo", "Score_Total", "Clasificacion", "Comentarios", "Puntajes_Items",
+    "Fecha_Eval", "Posible_Duplicado",
+]
+
+
+class ColumnaFaltante(Exception):
+    pass
+
+
+class Almacen:
+    """Interfaz común de persistencia de prospectos."""
+
+    def encabezados(self):
+        raise NotImplementedError
+
+    def existe(self, documento_id):
+        raise NotImplementedError
+
+    def leer(self, documento_id):
+        # Devuelve el registro como dict o None si no existe
+        raise NotImplementedError
+
+    def leer_con_fila(self, documento_id):
+        # (número de fila, registro); la fila es None si el motor no la maneja
+        return None, self.leer(documento_id)
+
+    def registros(self):
+        raise NotImplementedError
+
+    def documentos(self):
+        # Conjunto de Documento_ID existentes, sin leer el resto de columnas
+        return {str(r.get("Documento_ID", "")).strip() for r in self.registros()} - {""}
+
+    def columnas(self, nombres):
+        # Registros reducidos a `nombres`
+        return [{c: r.get(c, "") for c in nombres} for r in self.registros()]
+
+    def bloques(self, tam_bloque=1000):
+        # Filas (listas en el orden de encabezados()) en grupos de hasta tam_bloque
+        headers = self.encabezados()
+        regs = self.registros()
+        for i in range(0, len(regs), tam_bloque):
+            yield [[r.get(h, "") for h in headers] for r in regs[i:i + tam_bloque]]
+
+    def agregar(self, data):
+        raise NotImplementedError
+
+    def agregar_lote(self, registros):
+        for data in registros:
+            self.agregar(data)
+
+    def actualizar(self, documento_id, cambios):
+        # Devuelve False si el documento no existe
+        raise NotImplementedError
+
+    def actualizar_lote(self, cambios_por_doc):
+        # {Documento_ID: {columna: valor}}; devuelve cuántos documentos existían
+        return sum(bool(self.actualizar(doc, cambios)) for doc, cambios in cambios_por_doc.items())
+
+
+# ==============================
+# GOOGLE SHEETS
+# ==============================
+class AlmacenSheets(Almacen):
+    """Hoja activa; con `archivo` (ArchivoHojas) las búsquedas siguen en las hojas de archivo.
+
+    Con `cache` (cache_compartido) los encabezados y el índice de documentos se
+    leen de la hoja una vez para todas las réplicas.
+    """
+
+    def __init__(self, hoja, ttl=300, archivo=None, cache=None):
+        self.hoja = hoja
+        self.ttl = ttl
+        self.archivo = archivo
+        self.cache = cache
+        self.indice = IndiceDocumentos(ttl)
+        self._encabezados = None
+        self._leidos = 0.0
+
+    def encabezados(self):
+        if self._encabezados is None or time.monotonic() - self._leidos > self.ttl:
+            if self.cache is not None:
+                self._encabezados = self.cache.obtener_o_calcular(
+                    "encabezados", lambda: self.hoja.row_values(1), self.ttl
+                )
+            else:
+                self._encabezados = self.hoja.row_values(1)
+            self._leidos = time.monotonic()
+        return self._encabezados
+
+    def _col_doc(self):
+        headers = self.encabezados()
+        if "Documento_ID" not in headers:
+            raise ColumnaFaltante("La columna 'Documento_ID' no existe en la hoja.")
+        return headers.index("Documento_ID") + 1
+
+    def _indice(self):
+        if not self.indice.vigente():
+            if self.cache is not None:
+                compartido = self.cache.obtener_o_calcular("indice_documentos", self._leer_indice, self.ttl)
+                self.indice.cargar(compartido["filas"], edad=time.time() - compartido["instante"])
+            else:
+                self.indice.construir(self.hoja.col_values(self._col_doc()))
+        return self.indice
+
+    def _leer_indice(self):
+        indice = IndiceDocumentos(ultima=self.indice.ultima)
+        indice.construir(self.hoja.col_values(self._col_doc()))
+        return {"filas": indice.filas(), "instante": time.time()}
+
+    def _invalidar_indice(self):
+        self.indice.invalidar()
+        if self.cache is not None:
+            self.cache.borrar("indice_documentos")
+
+    def _registrar(self, filas):
+        # [(Documento_ID, fila)] recién agregadas, también en el índice compartido
+        for documento_id, fila in filas:
+            self.indice.registrar(documento_id, fila)
+        if self.cache is not None and filas:
+            def registrar(compartido):
+                for documento_id, fila in filas:
+                    documento_id = str(documento_id).strip()
+                    if documento_id:
+                        compartido["filas"].setdefault(documento_id, fila)
+                return compartido
+            self.cache.actualizar("indice_documentos", registrar)
+            for documento_id, fila in filas:
+                if str(documento_id).strip():
+                    self.cache.guardar(f"documento:{str(documento_id).strip()}", fila, 2 * self.ttl)
+
+    def fila(self, documento_id):
+        fila = self._indice().fila(documento_id)
+        if fila is None and self.cache is not None:
+            # Agregado por otra réplica después de que esta cargó el índice
+            fila = self.cache.obtener(f"documento:{str(documento_id).strip()}")
+            if fila is not None:
+                self.indice.registrar(documento_id, fila)
+        return fila
+
+    def existe(self, documento_id):
+        if self.fila(documento_id) is not None:
+            return True
+        return bool(self.archivo) and self.archivo.existe(documento_id)
+
+    def documentos(self):
+        documentos = self._indice().documentos()
+        if self.archivo:
+            documentos |= self.archivo.documentos()
+        return documentos
+
+    def leer(self, documento_id):
+        return self.leer_con_fila(documento_id)[1]
+
+    def leer_con_fila(self, documento_id):
+        # Encabezado y fila en un solo batch_get (con el índice vigente, una sola llamada)
+        documento_id = str(documento_id).strip()
+        for _ in range(2):
+            fila = self.fila(documento_id)
+            if fila is None:
+                # Prospecto archivado: se devuelve sin fila en la hoja activa
+                return None, (self.archivo.leer(documento_id) if self.archivo else None)
+            encabezado, valores = self.hoja.batch_get(["1:1", f"{fila}:{fila}"])
+            self._encabezados = list(encabezado[0]) if encabezado else []
+            self._leidos = time.monotonic()
+            valores = list(valores[0]) if valores else []
+            valores += [""] * (len(self._encabezados) - len(valores))
+            data = dict(zip(self._encabezados, valores))
+            if str(data.get("Documento_ID", "")).strip() == documento_id:
+                return fila, data
+            # La hoja se modificó fuera de la app: reconstruir el índice y reintentar
+            self._invalidar_indice()
+        return None, None
+
+    def registros(self):
+        return self.hoja.get_all_records()
+
+    def columnas(self, nombres):
+        # Un solo batch_get con una columna completa por nombre (más las de archivo)
+        from gspread.utils import rowcol_to_a1
+        headers = self.encabezados()
+        presentes = [c for c in nombres if c in headers]
+        registros = []
+        if presentes:
+            letras = [rowcol_to_a1(1, headers.index(c) + 1).rstrip("0123456789") for c in presentes]
+            valores = self.hoja.batch_get([f"{letra}2:{letra}" for letra in letras])
+            largo = max(len(v) for v in valores)
+            for i in range(largo):
+                r = dict.fromkeys(nombres, "")
+                for col, v in zip(presentes, valores):
+                    if i < len(v) and v[i]:
+                        r[col] = v[i][0]
+                registros.append(r)
+        if self.archivo:
+            registros += self.archivo.columnas(nombres)
+        return registros
+
+    def bloques(self, tam_bloque=1000):
+        # Un batch_get por rango A1 de tam_bloque filas; la memoria no crece con la hoja
+        from gspread.utils import rowcol_to_a1
+        ultima_col = rowcol_to_a1(1, len(self.encabezados())).rstrip("0123456789")
+        # Tamaño de la grilla según los metadatos ya cargados (sin llamada); puede estar desactualizado
+        filas_hoja = getattr(self.hoja, "row_count", None)
+        filas_hoja = filas_hoja if isinstance(filas_hoja, int) else 0
+        inicio = 2
+        while True:
+            fin = inicio + tam_bloque - 1
+            filas = self.hoja.batch_get([f"A{inicio}:{ultima_col}{fin}"])[0]
+            if filas:
+                yield [list(f) for f in filas]
+            # La API recorta las filas vacías del final de cada rango, así que un rango
+            # incompleto no indica el final (p.ej. una fila en blanco al cierre del bloque);
+            # solo un rango vacío más allá de la grilla conocida lo indica
+            elif fin >= filas_hoja:
+                break
+            inicio = fin + 1
+        if self.archivo:
+            yield from self.archivo.bloques(self.encabezados(), tam_bloque)
+
+    def agregar(self, data):
+        headers = self.encabezados()
+        respuesta = self.hoja.append_row([data.get(col, "") for col in headers])
+        fila = _fila_agregada(respuesta)
+        if fila:
+            self._registrar([(data.get("Documento_ID", ""), fila)])
+        else:
+            self._invalidar_indice()
+        return fila
+
+    def agregar_lote(self, registros):
+        if not registros:
+            return
+        headers = self.encabezados()
+        try:
+            respuesta = self.hoja.append_rows([[data.get(col, "") for col in headers] for data in registros])
+        except Exception:
+            # Un append que falla con 5xx pudo haberse aplicado: existe() debe leer la hoja
+            self._invalidar_indice()
+            raise
+        fila = _fila_agregada(respuesta)
+        if not fila:
+            self._invalidar_indice()
+            return
+        self._registrar([(data.get("Documento_ID", ""), fila + i) for i, data in enumerate(registros)])
+
+    def actualizar(self, documento_id, cambios):
+        return self.actualizar_lote({documento_id: cambios}) == 1
+
+    def _filas_verificadas(self, documentos):
+        # Las filas del índice se confirman con un batch_get de sus Documento_ID: otra réplica
+        # pudo archivar (borrar) filas y correr las demás hacia arriba
+        from gspread.utils import rowcol_to_a1
+        for intento in range(2):
+            filas = {doc: self.fila(doc) for doc in documentos}
+            filas = {doc: fila for doc, fila in filas.items() if fila is not None}
+            if not filas:
+                return filas
+            col = self._col_doc()
+            valores = self.hoja.batch_get([rowcol_to_a1(fila, col) for fila in filas.values()])
+            validas = {
+                doc: fila for (doc, fila), v in zip(filas.items(), valores)
+                if v and v[0] and str(v[0][0]).strip() == str(doc).strip()
+            }
+            if len(validas) == len(filas) or intento:
+                return validas
+            self._invalidar_indice()
+
+    def actualizar_lote(self, cambios_por_doc):
+        # Todas las celdas de todos los documentos en un solo batch_update
+        from gspread.utils import rowcol_to_a1
+        header_map = {col: i+1 for i, col in enumerate(self.encabezados())}
+        filas = self._filas_verificadas(list(cambios_por_doc))
+        batch = []
+        encontrados = 0
+        reactivados = []
+        for documento_id, cambios in cambios_por_doc.items():
+            fila = filas.get(documento_id)
+            if fila is None:
+                # Un prospecto archivado que se vuelve a editar regresa a la hoja activa
+                data = self.archivo.leer(documento_id) if self.archivo else None
+                if data is not None:
+                    reactivados.append(dict(data, **cambios))
+                continue
+            encontrados += 1
+            for key, value in cambios.items():
+                if key in header_map:
+                    batch.append({
+                        "range": rowcol_to_a1(fila, header_map[key]),
+                        "values": [[value]]
+                    })
+        if batch:
+            self.hoja.batch_update(batch)
+        if reactivados:
+            self.agregar_lote(reactivados)
+        return encontrados + len(reactivados)
+
+    def eliminar_filas(self, filas):
+        # Un solo batch_update del libro con un deleteDimension por tramo contiguo,
+        # de abajo hacia arriba para que los índices de los tramos restantes no cambien
+        tramos = []
+        for fila in sorted(set(filas)):
+            if tramos and tramos[-1][1] == fila - 1:
+                tramos[-1][1] = fila
+            else:
+                tramos.append([fila, fila])
+        if not tramos:
+            return
+        self.hoja.spreadsheet.batch_update({"requests": [
+            {"deleteDimension": {"range": {
+                "sheetId": self.hoja.id, "dimension": "ROWS", "startIndex": inicio - 1, "endIndex": fin
+            }}}
+            for inicio, fin in reversed(tramos)
+        ]})
+        self._invalidar_indice()
+
+
+def _fila_agregada(respuesta):
+    # append_row(s) responde con updates.updatedRange, p.ej. "Hoja1!A12:Y14"
+    from gspread.utils import a1_to_rowcol
+    try:
+        rango = respuesta["updates"]["updatedRange"]
+        return a1_to_rowcol(rango.rsplit("!", 1)[-1].split(":")[0])[0]
+    except Exception:
+        return None
+
+
+# ==============================
+# SQLITE
+# ==============================
+class AlmacenSQLite(Almacen):
+    """Base local indexada; opcionalmente replica cada escritura en otro Almacen."""
+
+    def __init__(self, ruta, encabezados=None, espejo=None):
+        self.ruta = ruta
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(ruta, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if ruta != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._columnas = list(encabezados or (espejo.encabezados() if espejo else COLUMNAS))
+        self._crear_tabla()
+        self.espejo = EspejoAsincrono(espejo) if espejo else None
+        if espejo and not self._conn.execute("SELECT 1 FROM prospectos LIMIT 1").fetchone():
+            self._importar(espejo.registros())
+
+    def _crear_tabla(self):
+        with self._lock, self._conn:
+            if "Documento_ID" not in self._columnas:
+                raise ColumnaFaltante("La columna 'Documento_ID' no existe en la hoja.")
+            cols = ", ".join(_q(c) for c in self._columnas)
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS prospectos ({cols})")
+            existentes = [r[1] for r in self._conn.execute("PRAGMA table_info(prospectos)")]
+            for col in self._columnas:
+                if col not in existentes:
+                    self._conn.execute(f"ALTER TABLE prospectos ADD COLUMN {_q(col)}")
+            for col in existentes:
+                if col not in self._columnas:
+                    self._columnas.append(col)
+            self._conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS ix_documento ON prospectos ("Documento_ID")')
+            if "Estado" in self._columnas:
+                self._conn.execute('CREATE INDEX IF NOT EXISTS ix_estado ON prospectos ("Estado")')
+
+    def _importar(self, registros):
+        cols = ", ".join(_q(c) for c in self._columnas)
+        marcas = ", ".join("?" for _ in self._columnas)
+        filas = [
+            [r.get(c, "") for c in self._columnas]
+            for r in registros if str(r.get("Documento_ID", "")).strip()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(f"INSERT OR IGNORE INTO prospectos ({cols}) VALUES ({marcas})", filas)
+
+    def encabezados(self):
+        return list(self._columnas)
+
+    def existe(self, documento_id):
+        with self._lock:
+            cur = self._conn.execute(
+                'SELECT 1 FROM prospectos WHERE "Documento_ID" = ?', (str(documento_id).strip(),)
+            )
+            return cur.fetchone() is not None
+
+    def leer(self, documento_id):
+        with self._lock:
+            cur = self._conn.execute(
+                'SELECT * FROM prospectos WHERE "Documento_ID" = ?', (str(documento_id).strip(),)
+            )
+            row = cur.fetchone()
+        return _registro(row) if row else None
+
+    def registros(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM prospectos ORDER BY rowid").fetchall()
+        return [_registro(r) for r in rows]
+
+    def documentos(self):
+        with self._lock:
+            rows = self._conn.execute('SELECT "Documento_ID" FROM prospectos').fetchall()
+        return {r[0] for r in rows}
+
+    def columnas(self, nombres):
+        presentes = [c for c in nombres if c in self._columnas]
+        if not presentes:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT {} FROM prospectos".format(", ".join(_q(c) for c in presentes))
+            ).fetchall()
+        return [dict(dict.fromkeys(nombres, ""), **_registro(r)) for r in rows]
+
+    def bloques(self, tam_bloque=1000):
+        # Paginación por rowid: no se mantiene un cursor abierto entre bloques
+        cols = ", ".join(_q(c) for c in self._columnas)
+        ultimo = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT rowid, {cols} FROM prospectos WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (ultimo, tam_bloque)
+                ).fetchall()
+            if not rows:
+                return
+            ultimo = rows[-1][0]
+            yield [["" if v is None else v for v in tuple(r)[1:]] for r in rows]
+
+    def agregar(self, data):
+        data = dict(data)
+        data["Documento_ID"] = str(data.get("Documento_ID", "")).strip()
+        cols = [c for c in self._columnas if c in data]
+        sql = "INSERT INTO prospectos ({}) VALUES ({})".format(
+            ", ".join(_q(c) for c in cols), ", ".join("?" for _ in cols)
+        )
+        with self._lock, self._conn:
+            rowid = self._conn.execute(sql, [data[c] for c in cols]).lastrowid
+        if self.espejo:
+            self.espejo.encolar("agregar", data)
+        return rowid
+
+    def agregar_lote(self, registros):
+        registros = [dict(d, Documento_ID=str(d.get("Documento_ID", "")).strip()) for d in registros]
+        if not registros:
+            return
+        cols = self._columnas
+        sql = "INSERT INTO prospectos ({}) VALUES ({})".format(
+            ", ".join(_q(c) for c in cols), ", ".join("?" for _ in cols)
+        )
+        with self._lock, self._conn:
+            self._conn.executemany(sql, [[d.get(c) for c in cols] for d in registros])
+        if self.espejo:
+            self.espejo.encolar("agregar_lote", registros)
+
+    def actualizar(self, documento_id, cambios):
+        documento_id = str(documento_id).strip()
+        cols = [c for c in cambios if c in self._columnas]
+        if cols:
+            sql = 'UPDATE prospectos SET {} WHERE "Documento_ID" = ?'.format(
+                ", ".join(f"{_q(c)} = ?" for c in cols)
+            )
+            with self._lock, self._conn:
+                cur = self._conn.execute(sql, [cambios[c] for c in cols] + [documento_id])
+            if cur.rowcount == 0:
+                return False
+        elif not self.existe(documento_id):
+            return False
+        if self.espejo:
+            self.espejo.encolar("actualizar", documento_id, dict(cambios))
+        return True
+
+    def actualizar_lote(self, cambios_por_doc):
+        encontrados = {}
+        with self._lock, self._conn:
+            for documento_id, cambios in cambios_por_doc.items():
+                documento_id = str(documento_id).strip()
+                cols = [c for c in cambios if c in self._columnas]
+                if not cols:
+                    continue
+                sql = 'UPDATE prospectos SET {} WHERE "Documento_ID" = ?'.format(
+                    ", ".join(f"{_q(c)} = ?" for c in cols)
+                )
+                if self._conn.execute(sql, [cambios[c] for c in cols] + [documento_id]).rowcount:
+                    encontrados[documento_id] = dict(cambios)
+        if self.espejo and encontrados:
+            self.espejo.encolar("actualizar_lote", encontrados)
+        return len(encontrados)
+
+
+def _q(nombre):
+    return '"' + nombre.replace('"', '""') + '"'
+
+
+def _registro(row):
+    return {k: ("" if row[k] is None else row[k]) for k in row.keys()}
+
+
+class EspejoAsincrono:
+    """Replica en segundo plano las escrituras de la base local en otro Almacen."""
+
+    def __init__(self, destino, reintentos=5):
+        self.destino = destino
+        self.reintentos = reintentos
+        self._cola = queue.Queue()
+        self._hilo = threading.Thread(target=self._trabajar, name="espejo-sheets", daemon=True)
+        self._hilo.start()
+
+    def encolar(self, operacion, *args):
+        self._cola.put((operacion, args))
+
+    def pendientes(self):
+        return self._cola.qsize()
+
+    def esperar(self):
+        self._cola.join()
+
+    def _trabajar(self):
+        while True:
+            operacion, args = self._cola.get()
+            try:
+                for intento in range(self.reintentos):
+                    try:
+                        getattr(self.destino, operacion)(*args)
+                        break
+                    except Exception as e:
+                        log.warning("Espejo %s falló (intento %d): %s", operacion, intento + 1, e)
+                        time.sleep(min(2 ** intento, 30))
+                else:
+                    log.error("Espejo %s descartado tras %d intentos: %s", operacion, self.reintentos, args[:1])
+            finally:
+                self._cola.task_done()
@@ -0,0 +1,263 @@
+import datetime
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+
+from validaciones import FORMATOS_FECHA
+
+# Columnas que necesita el embudo
+COLUMNAS_EMBUDO = ["Documento_ID", "Estado", "Medio", "Ciudad", "Fecha_Pre", "Fecha_Entrevista", "Fecha_Eval"]
+
+DESGLOSES = ["Medio", "Ciudad", "Semana"]
+
+SIN_DATO = "(sin dato)"
+
+
+def instante(valor):
+    """datetime de una fecha de la hoja ("2026-05-17 10:31:02.5", "17/05/2026", ...) o None."""
+    if isinstance(valor, datetime.datetime):
+        return valor
+    texto = str(valor or "").strip()
+    if not texto:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(texto)
+    except ValueError:
+        pass
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.datetime.strptime(texto.split(" ")[0], formato)
+        except ValueError:
+            pass
+    return None
+
+
+# Las esperas se guardan como histogramas: cubetas de 1 h hasta 2 días, de 6 h hasta
+# 2 semanas y de 1 día después. La mediana sale de sumar histogramas, con un error
+# de a lo sumo media cubeta
+def _cubeta(horas):
+    if horas is None or horas < 0:
+        return None
+    if horas < 48:
+        return int(horas)
+    if horas < 24 * 14:
+        return 48 + int((horas - 48) // 6) * 6
+    return int(horas // 24) * 24
+
+
+def _ancho(cubeta):
+    return 1 if cubeta < 48 else 6 if cubeta < 24 * 14 else 24
+
+
+def mediana_horas(histograma):
+    total = sum(histograma.values())
+    if not total:
+        return None
+    acumulado = 0
+    for cubeta in sorted(histograma):
+        acumulado += histograma[cubeta]
+        if acumulado * 2 >= total:
+            return cubeta + _ancho(cubeta) / 2
+    return None
+
+
+class _Acumulado:
+    __slots__ = ("prospectos", "entrevistados", "evaluados", "espera_entrevista", "espera_evaluacion")
+
+    def __init__(self):
+        self.prospectos = self.entrevistados = self.evaluados = 0
+        self.espera_entrevista = Counter()
+        self.espera_evaluacion = Counter()
+
+    def sumar(self, hecho, signo=1):
+        _, _, _, entrevistado, evaluado, espera_ent, espera_eval = hecho
+        self.prospectos += signo
+        self.entrevistados += signo * entrevistado
+        self.evaluados += signo * evaluado
+        for histograma, cubeta in ((self.espera_entrevista, espera_ent), (self.espera_evaluacion, espera_eval)):
+            if cubeta is not None:
+                histograma[cubeta] += signo
+                if not histograma[cubeta]:
+                    del histograma[cubeta]
+
+    def unir(self, otro):
+        self.prospectos += otro.prospectos
+        self.entrevistados += otro.entrevistados
+        self.evaluados += otro.evaluados
+        self.espera_entrevista.update(otro.espera_entrevista)
+        self.espera_evaluacion.update(otro.espera_evaluacion)
+
+    def copia(self):
+        copia = _Acumulado()
+        copia.unir(self)
+        return copia
+
+
+def _semana(dia):
+    # Cohorte: lunes de la semana de pre-inscripción
+    return dia - datetime.timedelta(days=dia.weekday()) if dia else None
+
+
+def _hecho(datos):
+    # (día de Fecha_Pre, Medio, Ciudad, entrevistado, evaluado, cubeta Pre→Entrevista, cubeta Entrevista→Eval)
+    pre = instante(datos.get("Fecha_Pre"))
+    entrevista = instante(datos.get("Fecha_Entrevista"))
+    evaluacion = instante(datos.get("Fecha_Eval"))
+    estado = str(datos.get("Estado") or "")
+    entrevistado = entrevista is not None or estado in ("Entrevistado", "Evaluado")
+    evaluado = evaluacion is not None or estado == "Evaluado"
+    espera_ent = _cubeta((entrevista - pre).total_seconds() / 3600) if pre and entrevista else None
+    espera_eval = _cubeta((evaluacion - entrevista).total_seconds() / 3600) if entrevista and evaluacion else None
+    return (
+        pre.date() if pre else None,
+        str(datos.get("Medio") or "").strip() or SIN_DATO,
+        str(datos.get("Ciudad") or "").strip() or SIN_DATO,
+        int(entrevistado), int(evaluado), espera_ent, espera_eval,
+    )
+
+
+class EmbudoProspectos:
+    """Embudo Pre-inscripción → Entrevista → Evaluación con acumulados diarios.
+
+    Cada prospecto se resume una vez (fechas ya parseadas) en el acumulado de su
+    día de pre-inscripción, Medio y Ciudad, y en los totales por Medio, Ciudad y
+    Semana; una escritura solo mueve al prospecto que cambió. Las consultas leen
+    los totales o suman los acumulados diarios del rango, nunca los prospectos.
+    """
+
+    def __init__(self, ttl=600):
+        self.ttl = ttl
+        self.version = 0
+        self._lock = threading.Lock()
+        self._construido = None
+        self._datos = {}
+        self._hechos = {}
+        self._diario = {}
+        self._totales = {}
+        self._consultas = {}
+
+    def vigente(self):
+        return self._construido is not None and time.monotonic() - self._construido < self.ttl
+
+    def construir(self, registros):
+        with self._lock:
+            self._datos, self._hechos, self._diario = {}, {}, {}
+            for i, r in enumerate(registros):
+                documento_id = str(r.get("Documento_ID", "")).strip() or f"#fila{i + 2}"
+                datos = {c: r.get(c, "") for c in COLUMNAS_EMBUDO}
+                hecho = _hecho(datos)
+                previo = self._hechos.get(documento_id)
+                if previo is not None:
+                    self._diario[previo[:3]].sumar(previo, -1)
+                self._diario.setdefault(hecho[:3], _Acumulado()).sumar(hecho)
+                self._datos[documento_id] = datos
+                self._hechos[documento_id] = hecho
+            # Los totales salen de los acumulados diarios, no de cada prospecto
+            self._totales = {por: {} for por in [None] + DESGLOSES}
+            for (dia, medio, ciudad), acumulado in list(self._diario.items()):
+                if not acumulado.prospectos:
+                    del self._diario[(dia, medio, ciudad)]
+                    continue
+                for por, clave in ((None, "Total"), ("Medio", medio), ("Ciudad", ciudad), ("Semana", _semana(dia))):
+                    self._totales[por].setdefault(clave, _Acumulado()).unir(acumulado)
+            self._construido = time.monotonic()
+            self._cambio()
+
+    def aplicar(self, documento_id, cambios):
+        # Suscriptor del feed de cambios; sin construir todavía no hay nada que mover
+        if self._construido is None or not any(c in cambios for c in COLUMNAS_EMBUDO):
+            return
+        with self._lock:
+            self._aplicar(str(documento_id).strip(), cambios)
+            self._cambio()
+
+    def _cambio(self):
+        self.version += 1
+        self._consultas = {}
+
+    def _aplicar(self, documento_id, cambios):
+        datos = dict(self._datos.get(documento_id, {}))
+        datos.update((c, cambios[c]) for c in COLUMNAS_EMBUDO if c in cambios)
+        hecho = _hecho(datos)
+        previo = self._hechos.get(documento_id)
+        if previo == hecho:
+            self._datos[documento_id] = datos
+            return
+        for h, signo in ((previo, -1), (hecho, 1)):
+            if h is None:
+                continue
+            dia, medio, ciudad = h[:3]
+            for tabla, clave in ((self._diario, h[:3]), (self._totales[None], "Total"),
+                                 (self._totales["Medio"], medio), (self._totales["Ciudad"], ciudad),
+                                 (self._totales["Semana"], _semana(dia))):
+                acumulado = tabla.setdefault(clave, _Acumulado())
+                acumulado.sumar(h, signo)
+                if not acumulado.prospectos:
+                    del tabla[clave]
+        self._datos[documento_id] = datos
+        self._hechos[documento_id] = hecho
+
+    # ------------------------------------------------------------------
+    def _agrupar(self, desde, hasta, por):
+        # Se llama con el lock tomado; los grupos se leen después fuera de él, así que
+        # los totales vivos (que aplicar() sigue moviendo) se devuelven copiados
+        if not desde and not hasta:
+            return {grupo: a.copia() for grupo, a in self._totales.get(por, {}).items()}
+        grupos = {}
+        for (dia, medio, ciudad), acumulado in self._diario.items():
+            if dia is None:
+                continue
+            if (desde and dia < desde) or (hasta and dia > hasta):
+                continue
+            if por == "Medio":
+                grupo = medio
+            elif por == "Ciudad":
+                grupo = ciudad
+            elif por == "Semana":
+                grupo = _semana(dia)
+            else:
+                grupo = "Total"
+            grupos.setdefault(grupo, _Acumulado()).unir(acumulado)
+        return grupos
+
+    def embudo(self, desde=None, hasta=None, por=None):
+        """DataFrame con conversiones y medianas de espera (días) por grupo de `por`.
+
+        `por` es None (una fila total) o uno de DESGLOSES; desde/hasta filtran por
+        el día de pre-inscripción.
+        """
+        with self._lock:
+            clave = (desde, hasta, por, self.version)
+            if clave in self._consultas:
+                return self._consultas[clave].copy()
+            grupos = self._agrupar(desde, hasta, por)
+        filas = []
+        for grupo, a in grupos.items():
+            if por == "Semana" and grupo is None:
+                continue
+            espera_ent = mediana_horas(a.espera_entrevista)
+            espera_eval = mediana_horas(a.espera_evaluacion)
+            filas.append({
+                por or "Grupo": grupo,
+                "Prospectos": a.prospectos,
+                "Entrevistados": a.entrevistados,
+                "Evaluados": a.evaluados,
+                "% Entrevista": round(100 * a.entrevistados / a.prospectos, 1) if a.prospectos else 0.0,
+                "% Evaluación": round(100 * a.evaluados / a.entrevistados, 1) if a.entrevistados else 0.0,
+                "Días Pre→Entrevista": round(espera_ent / 24, 1) if espera_ent is not None else None,
+                "Días Entrevista→Eval": round(espera_eval / 24, 1) if espera_eval is not None else None,
+            })
+        df = pd.DataFrame(filas, columns=[
+            por or "Grupo", "Prospectos", "Entrevistados", "Evaluados", "% Entrevista",
+            "% Evaluación", "Días Pre→Entrevista", "Días Entrevista→Eval",
+        ])
+        # Semanas en orden cronológico; medios y ciudades de mayor a menor volumen (empates por nombre)
+        if por == "Semana":
+            df = df.sort_values("Semana", ignore_index=True)
+        else:
+            df = df.sort_values(["Prospectos", por or "Grupo"], ascending=[False, True], ignore_index=True)
+        with self._lock:
+            self._consultas[clave] = df
+        return df.copy()
@@ -0,0 +1,211 @@
+"""Archivo de prospectos finalizados en hojas por periodo.
+
+    python archivo.py [--dias 365] [--estados Evaluado] [--periodo %Y] [--dry-run]
+
+Mueve a las hojas "Archivo <periodo>" del mismo libro los prospectos cuyo
+estado está en --estados y cuya última fecha de etapa tiene más de --dias
+días; después los borra de la hoja activa con un solo batch_update. Las
+búsquedas por Documento_ID (entrevista, evaluación, duplicados) siguen
+encontrándolos a través de AlmacenSheets; editar uno lo devuelve a la hoja
+activa. Para correrlo periódicamente basta un cron, p.ej. cada domingo:
+
+    0 3 * * 0  cd /app && python archivo.py --dias 365
+
+Requiere archive_sheets = true en .streamlit/secrets.toml de todas las
+réplicas, para que consulten el archivo antes de dar un documento por nuevo.
+"""
+import argparse
+import datetime
+import threading
+import time
+
+from almacenamiento import AlmacenSheets
+from indice_documentos import IndiceDocumentos
+from validaciones import FORMATOS_FECHA
+
+PREFIJO = "Archivo "
+
+# La fecha de la última etapa alcanzada decide la antigüedad y el periodo
+COLUMNAS_FECHA = ["Fecha_Eval", "Fecha_Entrevista", "Fecha_Pre"]
+
+
+def _fecha(texto):
+    texto = str(texto or "").strip().split(" ")[0]
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.datetime.strptime(texto, formato).date()
+        except ValueError:
+            pass
+    return None
+
+
+def fecha_cierre(registro):
+    for col in COLUMNAS_FECHA:
+        fecha = _fecha(registro.get(col))
+        if fecha:
+            return fecha
+    return None
+
+
+# ==============================
+# HOJAS DE ARCHIVO
+# ==============================
+class ArchivoHojas:
+    """Hojas "Archivo <periodo>" de un libro, consultadas de la más reciente a la más antigua.
+
+    `envolver` recibe cada gspread.Worksheet y devuelve lo que usará AlmacenSheets
+    (p.ej. HojaProtegida.hermana para compartir la cuota de la hoja activa).
+    """
+
+    def __init__(self, libro, envolver=None, ttl=3600, prefijo=PREFIJO):
+        self.libro = libro
+        self.envolver = envolver or (lambda hoja: hoja)
+        self.ttl = ttl
+        self.prefijo = prefijo
+        self._almacenes = None
+        self._leidos = 0.0
+        self._lock = threading.Lock()
+
+    def almacenes(self):
+        # [(periodo, AlmacenSheets)] del más reciente al más antiguo; la lista de hojas se
+        # pide una vez por ttl (las de archivo solo cambian cuando corre el archivador)
+        with self._lock:
+            if self._almacenes is None or time.monotonic() - self._leidos > self.ttl:
+                anteriores = dict(self._almacenes or [])
+                almacenes = []
+                for hoja in self.libro.worksheets():
+                    if hoja.title.startswith(self.prefijo):
+                        periodo = hoja.title[len(self.prefijo):]
+                        almacenes.append((periodo, anteriores.get(periodo) or self._almacen(hoja)))
+                self._almacenes = sorted(almacenes, key=lambda p: p[0], reverse=True)
+                self._leidos = time.monotonic()
+            return list(self._almacenes)
+
+    def _almacen(self, hoja):
+        almacen = AlmacenSheets(self.envolver(hoja), ttl=self.ttl)
+        almacen.indice = IndiceDocumentos(self.ttl, ultima=True)
+        return almacen
+
+    def invalidar(self):
+        with self._lock:
+            self._almacenes = None
+
+    def existe(self, documento_id):
+        return any(a.fila(documento_id) is not None for _, a in self.almacenes())
+
+    def documentos(self):
+        documentos = set()
+        for _, almacen in self.almacenes():
+            documentos |= almacen.documentos()
+        return documentos
+
+    def leer(self, documento_id):
+        for _, almacen in self.almacenes():
+            if almacen.fila(documento_id) is not None:
+                return almacen.leer(documento_id)
+        return None
+
+    def columnas(self, nombres):
+        registros = []
+        for _, almacen in self.almacenes():
+            registros += almacen.columnas(nombres)
+        return registros
+
+    def bloques(self, headers, tam_bloque=1000):
+        # Filas de todas las hojas de archivo llevadas al orden de `headers`
+        for _, almacen in self.almacenes():
+            propios = almacen.encabezados()
+            pos = [propios.index(c) if c in propios else None for c in headers]
+            for filas in almacen.bloques(tam_bloque):
+                yield [[f[p] if p is not None and p < len(f) else "" for p in pos] for f in filas]
+
+    def agregar(self, periodo, registros):
+        # Crea la hoja del periodo si no existe y agrega las columnas que le falten
+        from gspread.utils import rowcol_to_a1
+        almacen = dict(self.almacenes()).get(periodo)
+        columnas = list(dict.fromkeys(c for r in registros for c in r))
+        if almacen is None:
+            hoja = self.libro.add_worksheet(title=f"{self.prefijo}{periodo}",
+                                            rows=len(registros) + 1, cols=len(columnas))
+            self.envolver(hoja).update(values=[columnas], range_name="A1")
+            self.invalidar()
+            almacen = dict(self.almacenes())[periodo]
+        else:
+            propios = almacen.encabezados()
+            faltantes = [c for c in columnas if c not in propios]
+            if faltantes:
+                almacen.hoja.add_cols(len(faltantes))
+                almacen.hoja.update(values=[faltantes], range_name=rowcol_to_a1(1, len(propios) + 1))
+                almacen._encabezados = propios + faltantes
+        almacen.agregar_lote(registros)
+
+
+# ==============================
+# ARCHIVADOR
+# ==============================
+class Archivador:
+    """Selecciona los prospectos finalizados de la hoja activa y los mueve al archivo."""
+
+    def __init__(self, almacen, dias=365, estados=("Evaluado",), formato_periodo="%Y"):
+        self.almacen = almacen
+        self.archivo = almacen.archivo
+        self.dias = dias
+        self.estados = set(estados)
+        self.formato_periodo = formato_periodo
+
+    def candidatos(self, hoy=None):
+        """{periodo: [(fila, registro)]} de la hoja activa, con una sola lectura."""
+        limite = (hoy or datetime.date.today()) - datetime.timedelta(days=self.dias)
+        valores = self.almacen.hoja.get_all_values()
+        headers = valores[0] if valores else []
+        por_periodo = {}
+        for num_fila, fila in enumerate(valores[1:], start=2):
+            registro = dict(zip(headers, list(fila) + [""] * (len(headers) - len(fila))))
+            if not str(registro.get("Documento_ID", "")).strip():
+                continue
+            if registro.get("Estado") not in self.estados:
+                continue
+            cierre = fecha_cierre(registro)
+            if cierre is None or cierre > limite:
+                continue
+            por_periodo.setdefault(cierre.strftime(self.formato_periodo), []).append((num_fila, registro))
+        return por_periodo
+
+    def archivar(self, simular=False, hoy=None):
+        por_periodo = self.candidatos(hoy)
+        resumen = {periodo: len(filas) for periodo, filas in sorted(por_periodo.items())}
+        if simular or not por_periodo:
+            return resumen
+        # Primero se copian al archivo; si el borrado falla, volver a correr solo duplica
+        # copias del archivo (la búsqueda se queda con la más reciente)
+        for periodo, filas in sorted(por_periodo.items()):
+            self.archivo.agregar(periodo, [registro for _, registro in filas])
+        self.almacen.eliminar_filas([fila for filas in por_periodo.values() for fila, _ in filas])
+        return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archiva prospectos finalizados en hojas por periodo.")
+    parser.add_argument("--dias", type=int, default=365, help="antigüedad mínima de la última etapa")
+    parser.add_argument("--estados", default="Evaluado", help="estados archivables, separados por coma")
+    parser.add_argument("--periodo", default="%Y", help="formato strftime del periodo (%%Y, %%Y-%%m, ...)")
+    parser.add_argument("--dry-run", action="store_true", help="solo contar lo que se archivaría")
+    args = parser.parse_args()
+
+    import streamlit as st
+    from servicios import get_almacen
+    if not st.secrets.get("archive_sheets", False):
+        raise SystemExit("Activa archive_sheets = true en secrets.toml (en todas las réplicas) antes de archivar.")
+    almacen = get_almacen()
+    if getattr(almacen, "archivo", None) is None:
+        raise SystemExit("El archivo por periodos solo aplica al motor de Google Sheets.")
+    archivador = Archivador(almacen, dias=args.dias, estados=[e.strip() for e in args.estados.split(",")],
+                            formato_periodo=args.periodo)
+    resumen = archivador.archivar(simular=args.dry_run)
+    for periodo, n in resumen.items():
+        print(f"  {PREFIJO}{periodo}: {n}")
+    print(f"{'Se archivarían' if args.dry_run else 'Archivados'}: {sum(resumen.values())}")
+
+
+if __name__ == "__main__":
+    main()
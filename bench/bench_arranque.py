@@ -0,0 +1,112 @@
+"""Tiempo de importación y primer render de cada página de inscripcion.py.
+
+Cada medición corre en un proceso nuevo para que los módulos ya importados no
+se reutilicen. Usa almacenamiento SQLite temporal, así que no toca Google Sheets.
+
+    python bench/bench_arranque.py [--repeticiones 3] [--json salida.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PESADOS = ["plotly", "fpdf", "gspread", "smtplib", "pandas", "numpy"]
+
+PAGINAS = ["Pre-Inscripción", "Entrevista Prospecto", "Test Arquetipos", "Evaluación", "Dashboard"]
+
+# Se ejecuta en el subproceso; imprime una línea JSON con los tiempos
+MEDICION = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t_streamlit = time.perf_counter() - t0
+antes = set(sys.modules)
+
+at = AppTest.from_file("inscripcion.py", default_timeout=120)
+at.secrets.update(json.loads(sys.argv[2]))
+if sys.argv[1] != "Pre-Inscripción":
+    at.session_state["authenticated"] = True
+t1 = time.perf_counter()
+at.run()
+if sys.argv[1] != "Pre-Inscripción":
+    at.sidebar.selectbox[0].select(sys.argv[1]).run()
+t_primero = time.perf_counter() - t1
+# AppTest no siempre puede reproducir el estado de radios con format_func
+try:
+    t2 = time.perf_counter()
+    at.run()
+    t_siguiente = time.perf_counter() - t2
+except ValueError:
+    t_siguiente = None
+
+cargados = set(sys.modules) - antes
+print(json.dumps({
+    "streamlit": t_streamlit,
+    "primero": t_primero,
+    "siguiente": t_siguiente,
+    "errores": [e.value for e in at.exception],
+    "modulos": sorted({m.split(".")[0] for m in cargados}),
+}))
+"""
+
+
+def medir(pagina, secretos):
+    proc = subprocess.run(
+        [sys.executable, "-c", MEDICION, pagina, json.dumps(secretos)],
+        cwd=RAIZ, capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _mediana_ms(valores):
+    valores = [v for v in valores if v is not None]
+    return statistics.median(valores) * 1000 if valores else None
+
+
+def _ms(valor):
+    return f"{valor:.0f}ms" if valor is not None else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--json", help="guardar resultados en este archivo")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        secretos = {
+            "admin_password": "bench",
+            "gmail_user": "bench@example.com",
+            "gmail_pass": "bench",
+            "storage_backend": "sqlite",
+            "sqlite_path": os.path.join(tmp, "glamour.db"),
+            "journal_path": os.path.join(tmp, "diario.db"),
+            "outbox_path": os.path.join(tmp, "outbox.db"),
+        }
+        resultados = {}
+        for pagina in PAGINAS:
+            corridas = [medir(pagina, secretos) for _ in range(args.repeticiones)]
+            resultados[pagina] = {
+                "primero_ms": _mediana_ms(c["primero"] for c in corridas),
+                "siguiente_ms": _mediana_ms(c["siguiente"] for c in corridas),
+                "pesados": [m for m in PESADOS if m in corridas[-1]["modulos"]],
+                "errores": corridas[-1]["errores"],
+            }
+
+    print(f"{'Página':<22}{'1er render':>12}{'rerun':>10}  módulos pesados")
+    for pagina, r in resultados.items():
+        print(f"{pagina:<22}{_ms(r['primero_ms']):>12}{_ms(r['siguiente_ms']):>10}  {', '.join(r['pesados']) or '-'}")
+        for error in r["errores"]:
+            print(f"{'':<22}error: {error}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Costo de cada etapa de la app sobre HojaFalsa y ServidorSMTPFalso.
+
+Las etapas por fila (validación, duplicados, armado de filas, arquetipos,
+evaluación, dashboard) se miden con 1k..1M prospectos; las etapas por
+documento (PDF, correo) con un número fijo de envíos.
+
+    python bench/bench_micro.py [--filas 1000,10000,100000] [--latencia 0.0] [--json salida.json]
+
+Con 1.000.000 de filas se necesitan varios GB de memoria.
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+
+from falsos import HojaFalsa, ServidorSMTPFalso, generar_prospectos, registros
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from almacenamiento import COLUMNAS, AlmacenSheets  # noqa: E402
+from arquetipos import recalcular as recalcular_arquetipos  # noqa: E402
+from correo import BandejaSalida, componer  # noqa: E402
+from evaluacion import Rubrica  # noqa: E402
+from reportes_pdf import PLANTILLA_PRE  # noqa: E402
+from resumen import ResumenProspectos  # noqa: E402
+from sincronizacion import SincronizacionIncremental  # noqa: E402
+from validaciones import validar_edad_minima, validar_email, validar_nombre, validar_telefono  # noqa: E402
+
+CONSULTAS = 1000
+
+
+def cronometrar(funcion, repeticiones=3):
+    # Mejor tiempo de `repeticiones` corridas, en segundos
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        transcurrido = time.perf_counter() - inicio
+        mejor = transcurrido if mejor is None else min(mejor, transcurrido)
+    return mejor
+
+
+def etapas_por_fila(n, latencia):
+    filas = generar_prospectos(n)
+    regs = registros(filas)
+    repeticiones = 3 if n <= 10000 else 1
+    resultados = []
+
+    def anotar(etapa, segundos, unidades=n):
+        resultados.append({"etapa": etapa, "filas": n, "ms": segundos * 1000, "us_unidad": segundos / unidades * 1e6})
+
+    pos = {c: i for i, c in enumerate(COLUMNAS)}
+    nacimiento = datetime.date(1995, 5, 17)
+
+    def validar():
+        for f in filas:
+            validar_nombre(f[pos["Nombre"]])
+            validar_email(f[pos["Email"]])
+            validar_telefono(f[pos["WhatsApp"]])
+            validar_edad_minima(nacimiento)
+    anotar("validacion", cronometrar(validar, repeticiones))
+
+    def armar_filas():
+        for r in regs:
+            [r.get(col, "") for col in COLUMNAS]
+    anotar("armado_fila", cronometrar(armar_filas, repeticiones))
+
+    # Duplicados: construir el índice (1 col_values) y luego consultas en memoria
+    hoja = HojaFalsa([list(COLUMNAS)] + filas, latencia=latencia)
+    almacen = AlmacenSheets(hoja)
+
+    def construir_indice():
+        almacen.indice.invalidar()
+        almacen.existe("no-existe")
+    anotar("duplicados_indice", cronometrar(construir_indice, repeticiones))
+    docs = [filas[i * n // CONSULTAS][0] for i in range(CONSULTAS)]
+    anotar("duplicados_consulta", cronometrar(lambda: [almacen.existe(d) for d in docs], repeticiones), CONSULTAS)
+
+    anotar("arquetipos_recalculo", cronometrar(lambda: recalcular_arquetipos(regs), repeticiones))
+    rubrica = Rubrica()
+    anotar("evaluacion_recalculo", cronometrar(lambda: rubrica.recalcular(regs), repeticiones))
+    anotar("dashboard_resumen", cronometrar(lambda: ResumenProspectos().construir(regs), repeticiones))
+
+    sinc = SincronizacionIncremental(almacen)
+    anotar("dashboard_carga", cronometrar(lambda: (sinc.invalidar(), sinc.dataframe()), repeticiones))
+
+    def delta():
+        # 1% de filas avanzan de etapa y llegan 10 pre-inscripciones nuevas
+        for i in range(0, n, 100):
+            hoja.filas[i + 1][pos["Estado"]] = "Entrevistado" if hoja.filas[i + 1][pos["Estado"]] != "Entrevistado" else "Evaluado"
+        hoja.filas.extend(generar_prospectos(10, semilla=len(hoja.filas)))
+        sinc.dataframe()
+    anotar("dashboard_delta", cronometrar(delta, repeticiones))
+    return resultados
+
+
+def etapas_por_documento(documentos, latencia):
+    resultados = []
+    campos = {
+        "nombre": "Ana Gómez Pérez", "tipo_id": "C.C", "documento_id": "1000000001",
+        "whatsapp": "3001234567", "email": "ana@example.com", "direccion": "Calle 1 # 2-3",
+        "barrio": "Centro", "ciudad": "Medellín", "departamento": "Antioquia", "genero": "Femenino",
+        "orientacion": "", "estado_civil": "Soltero", "sangre": "O+", "hijos": "No",
+        "cantidad_hijos": 0, "nacimiento_lugar": "Medellín", "nacimiento_fecha": "1995-05-17",
+        "medio": "Instagram", "medio_otro": "", "estudios": "Bachiller", "ingles": "Básico",
+        "computacion": "Intermedio", "exp_laboral": "Atención al cliente durante dos años.",
+    }
+
+    def anotar(etapa, segundos):
+        resultados.append({"etapa": etapa, "filas": documentos, "ms": segundos * 1000, "us_unidad": segundos / documentos * 1e6})
+
+    pdfs = []
+    anotar("pdf_render", cronometrar(
+        lambda: pdfs.extend(PLANTILLA_PRE.render(dict(campos, documento_id=str(i))) for i in range(documentos)), 1
+    ))
+    anotar("correo_componer", cronometrar(
+        lambda: [componer("studio@example.com", "ana@example.com", "Pre-Inscripción", "Gracias", pdf, "Pre.pdf").as_string()
+                 for pdf in pdfs], 1
+    ))
+
+    servidor = ServidorSMTPFalso(latencia=latencia)
+    with tempfile.TemporaryDirectory() as tmp:
+        bandeja = BandejaSalida(os.path.join(tmp, "outbox.db"), "studio@example.com", "clave",
+                                host=servidor.host, puerto=servidor.puerto, starttls=False)
+
+        def enviar():
+            for pdf in pdfs:
+                bandeja.encolar("ana@example.com", "Pre-Inscripción", "Gracias", pdf, "Pre.pdf")
+            while bandeja.pendientes():
+                time.sleep(0.005)
+        anotar("correo_smtp", cronometrar(enviar, 1))
+        bandeja.detener()
+    servidor.cerrar()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", default="1000,10000,100000", help="tamaños separados por coma")
+    parser.add_argument("--documentos", type=int, default=50, help="PDFs/correos para las etapas por documento")
+    parser.add_argument("--latencia", type=float, default=0.0, help="segundos por llamada a la hoja/comando SMTP")
+    parser.add_argument("--json", help="guardar resultados en este archivo")
+    args = parser.parse_args()
+
+    resultados = []
+    for n in (int(x) for x in args.filas.split(",")):
+        resultados += etapas_por_fila(n, args.latencia)
+    resultados += etapas_por_documento(args.documentos, args.latencia)
+
+    print(f"{'Etapa':<24}{'Filas':>10}{'Total':>12}{'µs/unidad':>12}")
+    for r in resultados:
+        print(f"{r['etapa']:<24}{r['filas']:>10}{r['ms']:>10.1f}ms{r['us_unidad']:>12.2f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
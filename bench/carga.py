@@ -0,0 +1,316 @@
+"""Prueba de carga de inscripcion.py con sesiones simuladas en AppTest.
+
+Cada proceso trabajador es una réplica de la app (sus propios st.cache_resource,
+diario y bandeja de salida) que ejecuta sesiones de una en una con AppTest,
+porque AppTest modifica estado global de Streamlit. Todas las réplicas comparten
+una HojaFalsa servida por un proceso gestor (latencia y cuota 429 comunes, como
+la API real) y un ServidorSMTPFalso local.
+
+    python bench/carga.py --sesiones 200 --procesos 8 \\
+        --mezcla pre=0.6,entrevista=0.15,evaluacion=0.15,dashboard=0.1 \\
+        --latencia 0.15 --cuota 300 --filas 5000
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from multiprocessing.managers import BaseManager
+
+from falsos import HojaFalsa, ServidorSMTPFalso, generar_prospectos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from almacenamiento import COLUMNAS  # noqa: E402
+
+MEZCLA = "pre=0.6,entrevista=0.15,evaluacion=0.15,dashboard=0.1"
+
+
+class _Gestor(BaseManager):
+    pass
+
+
+_Gestor.register("HojaFalsa", HojaFalsa)
+
+# Estado de cada proceso trabajador
+_secretos = None
+_barrera = None
+
+
+def _iniciar_trabajador(hoja, secretos, lecturas_minuto, escrituras_minuto, barrera):
+    global _secretos, _barrera
+    import servicios
+    from cliente_sheets import HojaProtegida
+
+    carpeta = tempfile.mkdtemp(prefix=f"replica-{os.getpid()}-")
+    _secretos = dict(
+        secretos,
+        journal_path=os.path.join(carpeta, "diario.db"),
+        outbox_path=os.path.join(carpeta, "outbox.db"),
+    )
+    _barrera = barrera
+    # La réplica habla con la hoja compartida a través del mismo cliente de producción
+    protegida = HojaProtegida(hoja, lecturas_por_minuto=lecturas_minuto, escrituras_por_minuto=escrituras_minuto)
+    servicios.get_gsheet = lambda: protegida
+
+
+def _widget(lista, etiqueta):
+    for w in lista:
+        if w.label == etiqueta:
+            return w
+    raise LookupError(f"No se encontró el widget '{etiqueta}'")
+
+
+def _nueva_app(autenticado):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.join(RAIZ, "inscripcion.py"), default_timeout=300)
+    at.secrets.update(_secretos)
+    if autenticado:
+        at.session_state["authenticated"] = True
+    return at
+
+
+def _problemas(at):
+    return [e.value for e in at.exception] + [e.value for e in at.error]
+
+
+def _buscar_prospecto(at, etiqueta, documento):
+    # Buscador de paginas/buscador.py: no elige nada hasta que se toma una coincidencia
+    _widget(at.text_input, etiqueta).input(documento).run()
+    coincidencias = next(w for w in at.selectbox if w.label.startswith("Coincidencias"))
+    coincidencias.select(documento).run()
+
+
+def _ir_a(at, pagina):
+    at.run()
+    at.sidebar.selectbox[0].select(pagina).run()
+
+
+def _pre(at, rnd, pausa, documento_existente):
+    at.run()
+    yield "carga"
+    documento = str(rnd.randrange(2 * 10**9, 3 * 10**9))
+    for etiqueta, valor in [
+        ("Nombres y apellidos", f"Prospecto {documento}"),
+        ("Número de Documento", documento),
+        ("WhatsApp / Celular", f"3{rnd.randrange(10**9):09d}"),
+        ("E-mail", f"p{documento}@example.com"),
+        ("Ciudad", "Medellín"),
+    ]:
+        _widget(at.text_input, etiqueta).input(valor)
+    _widget(at.checkbox, "Acepto autorización preliminar de datos").check()
+    time.sleep(pausa)
+    _widget(at.button, "Enviar Pre-Inscripción").click().run()
+    yield "envio"
+
+
+def _entrevista(at, rnd, pausa, documento_existente):
+    _ir_a(at, "Entrevista Prospecto")
+    yield "carga"
+    _buscar_prospecto(at, "Buscar prospecto para entrevista", documento_existente)
+    yield "consulta"
+    _widget(at.text_area, "Motivación principal para ser modelo webcam").input("Crecer profesionalmente")
+    time.sleep(pausa)
+    _widget(at.button, "Guardar Entrevista").click().run()
+    yield "envio"
+
+
+def _evaluacion(at, rnd, pausa, documento_existente):
+    _ir_a(at, "Evaluación")
+    yield "carga"
+    _buscar_prospecto(at, "Buscar prospecto", documento_existente)
+    yield "consulta"
+    for slider in at.slider:
+        slider.set_value(rnd.randint(1, 4))
+    time.sleep(pausa)
+    _widget(at.button, "Calcular Evaluación Final").click().run()
+    yield "envio"
+
+
+def _dashboard(at, rnd, pausa, documento_existente):
+    _ir_a(at, "Dashboard")
+    yield "carga"
+
+
+ESCENARIOS = {
+    "pre": (_pre, False),
+    "entrevista": (_entrevista, True),
+    "evaluacion": (_evaluacion, True),
+    "dashboard": (_dashboard, True),
+}
+
+
+def _sesion(tarea):
+    indice, tipo, pausa, documento_existente = tarea
+    rnd = random.Random(indice)
+    escenario, autenticado = ESCENARIOS[tipo]
+    resultado = {"tipo": tipo, "pasos": {}, "errores": [], "replica": os.getpid()}
+    at = _nueva_app(autenticado)
+    inicio = time.perf_counter()
+    try:
+        for paso in escenario(at, rnd, pausa, documento_existente):
+            ahora = time.perf_counter()
+            resultado["pasos"][paso] = ahora - inicio
+            inicio = ahora
+            problemas = _problemas(at)
+            if problemas:
+                resultado["errores"] = [str(p) for p in problemas]
+                break
+    except Exception as e:
+        resultado["errores"].append(f"{type(e).__name__}: {e}")
+    return resultado
+
+
+def _drenar(_):
+    # Una tarea por réplica (la barrera impide que un trabajador tome dos):
+    # vuelca el diario y espera a que la bandeja de salida quede vacía
+    import servicios
+    try:
+        servicios.get_diario().vaciar()
+        bandeja = servicios.get_bandeja()
+        limite = time.monotonic() + 60
+        while bandeja.pendientes() and time.monotonic() < limite:
+            time.sleep(0.1)
+    except Exception:
+        pass
+    _barrera.wait()
+
+
+def percentil(valores, p):
+    if not valores:
+        return None
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, max(0, int(round(p / 100 * len(valores) + 0.5)) - 1))]
+
+
+def _clasificar_error(texto):
+    texto = texto.lower()
+    if "429" in texto or "quota" in texto or "cuota" in texto:
+        return "cuota"
+    if "timeout" in texto or "timed out" in texto:
+        return "timeout"
+    return "otro"
+
+
+def informe(resultados, duracion, hoja, smtp):
+    por_tipo = defaultdict(list)
+    for r in resultados:
+        por_tipo[r["tipo"]].append(r)
+    salida = {"duracion_s": duracion, "sesiones": len(resultados),
+              "sesiones_por_s": len(resultados) / duracion, "tipos": {}}
+    for tipo, lista in sorted(por_tipo.items()):
+        pasos = defaultdict(list)
+        for r in lista:
+            for paso, segundos in r["pasos"].items():
+                pasos[paso].append(segundos)
+        errores = Counter(_clasificar_error(r["errores"][0]) for r in lista if r["errores"])
+        salida["tipos"][tipo] = {
+            "sesiones": len(lista),
+            "errores": sum(errores.values()),
+            "tasa_error": sum(errores.values()) / len(lista),
+            "errores_por_causa": dict(errores),
+            "ejemplos_error": sorted({r["errores"][0][:200] for r in lista if r["errores"]})[:3],
+            "pasos": {
+                paso: {"n": len(v), "p50_ms": percentil(v, 50) * 1000, "p95_ms": percentil(v, 95) * 1000,
+                       "p99_ms": percentil(v, 99) * 1000, "max_ms": max(v) * 1000}
+                for paso, v in pasos.items()
+            },
+        }
+    envios = sum(1 for r in resultados if "envio" in r["pasos"] and not r["errores"])
+    salida["envios_por_s"] = envios / duracion
+    salida["hoja"] = hoja.conteo()
+    salida["correos_recibidos"] = len(smtp.mensajes)
+    return salida
+
+
+def imprimir(salida):
+    print(f"Sesiones: {salida['sesiones']} en {salida['duracion_s']:.1f}s "
+          f"({salida['sesiones_por_s']:.2f} sesiones/s, {salida['envios_por_s']:.2f} envíos OK/s)")
+    print(f"{'Tipo':<12}{'Paso':<10}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'máx':>10}")
+    for tipo, t in salida["tipos"].items():
+        for paso, p in t["pasos"].items():
+            print(f"{tipo:<12}{paso:<10}{p['n']:>6}{p['p50_ms']:>8.0f}ms{p['p95_ms']:>8.0f}ms"
+                  f"{p['p99_ms']:>8.0f}ms{p['max_ms']:>8.0f}ms")
+        print(f"{'':<12}errores: {t['errores']}/{t['sesiones']} ({t['tasa_error']:.1%}) {t['errores_por_causa'] or ''}")
+        for ejemplo in t["ejemplos_error"]:
+            print(f"{'':<14}- {ejemplo}")
+    print(f"Llamadas a la hoja: {salida['hoja']}")
+    print(f"Correos recibidos: {salida['correos_recibidos']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sesiones", type=int, default=100)
+    parser.add_argument("--procesos", type=int, default=4, help="réplicas concurrentes de la app")
+    parser.add_argument("--mezcla", default=MEZCLA, help="tipo=peso separados por coma")
+    parser.add_argument("--filas", type=int, default=2000, help="prospectos precargados en la hoja")
+    parser.add_argument("--latencia", type=float, default=0.1, help="segundos por llamada a la hoja")
+    parser.add_argument("--latencia-smtp", type=float, default=0.02)
+    parser.add_argument("--cuota", type=int, default=None, help="llamadas/minuto antes de responder 429")
+    parser.add_argument("--lecturas-minuto", type=int, default=60, help="límite del cliente por réplica")
+    parser.add_argument("--escrituras-minuto", type=int, default=60)
+    parser.add_argument("--pausa", type=float, default=0.0, help="segundos que el usuario tarda en llenar")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--json", help="guardar el informe en este archivo")
+    args = parser.parse_args()
+
+    # AppTest reemplaza sys.modules["__main__"] al ejecutar inscripcion.py, así que
+    # los trabajadores deben encontrar estas funciones en un módulo importable
+    from carga import _drenar, _iniciar_trabajador, _sesion
+
+    mezcla = {k: float(v) for k, v in (p.split("=") for p in args.mezcla.split(","))}
+    rnd = random.Random(args.semilla)
+    filas = generar_prospectos(args.filas, semilla=args.semilla)
+    tareas = [
+        (i, rnd.choices(list(mezcla), weights=list(mezcla.values()))[0], args.pausa, rnd.choice(filas)[0])
+        for i in range(args.sesiones)
+    ]
+
+    # spawn: los trabajadores no heredan los hilos del servidor SMTP ni del gestor
+    contexto = multiprocessing.get_context("spawn")
+    smtp = ServidorSMTPFalso(latencia=args.latencia_smtp)
+    gestor = _Gestor(ctx=contexto)
+    gestor.start()
+    hoja = gestor.HojaFalsa([list(COLUMNAS)] + filas, latencia=args.latencia, jitter=args.latencia / 4,
+                            cuota_por_minuto=args.cuota)
+    secretos = {
+        "admin_password": "carga",
+        "gmail_user": "studio@example.com",
+        "gmail_pass": "carga",
+        "storage_backend": "sheets",
+        "journal_interval": 1,
+        "smtp_host": smtp.host,
+        "smtp_port": smtp.puerto,
+        "smtp_starttls": False,
+    }
+    barrera = contexto.Manager().Barrier(args.procesos)
+
+    resultados = []
+    inicio = time.perf_counter()
+    with contexto.Pool(
+        args.procesos, initializer=_iniciar_trabajador,
+        initargs=(hoja, secretos, args.lecturas_minuto, args.escrituras_minuto, barrera)
+    ) as pool:
+        for i, r in enumerate(pool.imap_unordered(_sesion, tareas), 1):
+            resultados.append(r)
+            if i % max(1, args.sesiones // 10) == 0:
+                print(f"  {i}/{args.sesiones} sesiones", file=sys.stderr)
+        duracion = time.perf_counter() - inicio
+        pool.map(_drenar, range(args.procesos), chunksize=1)
+
+    salida = informe(resultados, duracion, hoja, smtp)
+    imprimir(salida)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(salida, f, indent=2, ensure_ascii=False)
+    smtp.cerrar()
+    gestor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""Dobles locales de Google Sheets y de un servidor SMTP para benchmarks y pruebas de carga.
+
+HojaFalsa implementa los métodos de gspread.Worksheet que usa la app sobre una
+lista en memoria; ServidorSMTPFalso acepta conexiones SMTP reales en 127.0.0.1.
+Ambos pueden simular latencia de red.
+"""
+import os
+import random
+import socketserver
+import sys
+import threading
+import time
+from collections import Counter
+
+from gspread.exceptions import APIError
+from gspread.utils import a1_range_to_grid_range, a1_to_rowcol, numericise_all, rowcol_to_a1
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from almacenamiento import COLUMNAS  # noqa: E402
+
+NOMBRES = ["Ana", "Laura", "Valentina", "Camila", "Daniela", "Sofía", "Mariana", "Paula", "Juliana", "Sara"]
+APELLIDOS = ["Gómez", "Rodríguez", "López", "Martínez", "García", "Pérez", "Sánchez", "Ramírez", "Torres", "Díaz"]
+CIUDADES = ["Medellín", "Bogotá", "Cali", "Barranquilla", "Pereira", "Manizales"]
+MEDIOS = ["Facebook", "Instagram", "TikTok", "Referido", "Google", "Otro"]
+ARQUETIPOS = ["El Mago", "El Amante", "El Héroe", "El Sabio", "El Bufón", "El Explorador"]
+
+
+def _celda_vacia(valor):
+    return valor is None or valor == ""
+
+
+def _texto(valor):
+    # La API devuelve siempre el valor formateado como texto
+    return "" if valor is None else str(valor)
+
+
+def _recortar(filas):
+    # Como la API: sin celdas vacías al final de cada fila ni filas vacías al final
+    filas = [list(f) for f in filas]
+    for f in filas:
+        while f and _celda_vacia(f[-1]):
+            f.pop()
+    while filas and not filas[-1]:
+        filas.pop()
+    return filas
+
+
+class _Respuesta:
+    def __init__(self, codigo):
+        self.status_code = codigo
+        self.text = ""
+
+    def json(self):
+        return {"error": {"code": self.status_code, "message": "simulado", "status": "RESOURCE_EXHAUSTED"}}
+
+
+class HojaFalsa:
+    """Worksheet en memoria con latencia simulada y conteo de llamadas.
+
+    `cuota_por_minuto` (opcional) hace que la hoja responda 429 como la API real
+    cuando se supera ese número de llamadas en los últimos 60 segundos.
+    """
+
+    id = 0
+    title = "Hoja1"
+
+    def __init__(self, filas=None, latencia=0.0, latencia_escritura=None, jitter=0.0, cuota_por_minuto=None):
+        self.filas = [list(f) for f in (filas if filas is not None else [list(COLUMNAS)])]
+        self.latencia = latencia
+        self.latencia_escritura = latencia if latencia_escritura is None else latencia_escritura
+        self.jitter = jitter
+        self.cuota_por_minuto = cuota_por_minuto
+        self.llamadas = Counter()
+        self._recientes = []
+        self._lock = threading.Lock()
+
+    def _llamada(self, metodo, escritura=False):
+        with self._lock:
+            self.llamadas[metodo] += 1
+            if self.cuota_por_minuto:
+                ahora = time.monotonic()
+                self._recientes = [t for t in self._recientes if ahora - t < 60]
+                if len(self._recientes) >= self.cuota_por_minuto:
+                    self.llamadas["429"] += 1
+                    raise APIError(_Respuesta(429))
+                self._recientes.append(ahora)
+        espera = self.latencia_escritura if escritura else self.latencia
+        if espera or self.jitter:
+            time.sleep(max(0.0, espera + random.uniform(-self.jitter, self.jitter)))
+
+    def conteo(self):
+        with self._lock:
+            return dict(self.llamadas)
+
+    @property
+    def row_count(self):
+        # Como en gspread: tamaño de la grilla según los metadatos, sin llamada a la API
+        return len(self.filas)
+
+    def _rango(self, rango, ancho):
+        rango = rango.rsplit("!", 1)[-1]
+        grid = a1_range_to_grid_range(rango)
+        r0 = grid.get("startRowIndex", 0)
+        r1 = grid.get("endRowIndex", len(self.filas))
+        c0 = grid.get("startColumnIndex", 0)
+        c1 = grid.get("endColumnIndex", ancho)
+        return _recortar(f[c0:c1] for f in self.filas[r0:r1])
+
+    # Lecturas ------------------------------------------------------------
+    def row_values(self, fila, **kwargs):
+        self._llamada("row_values")
+        with self._lock:
+            return (_recortar([self.filas[fila - 1]]) or [[]])[0] if fila <= len(self.filas) else []
+
+    def col_values(self, col, **kwargs):
+        self._llamada("col_values")
+        with self._lock:
+            valores = [f[col - 1] if col <= len(f) else "" for f in self.filas]
+        while valores and _celda_vacia(valores[-1]):
+            valores.pop()
+        return valores
+
+    def get_all_values(self, **kwargs):
+        self._llamada("get_all_values")
+        with self._lock:
+            return _recortar(self.filas)
+
+    def get_all_records(self, **kwargs):
+        self._llamada("get_all_records")
+        with self._lock:
+            headers = list(self.filas[0])
+            filas = [list(f) for f in self.filas[1:]]
+        registros = []
+        for f in filas:
+            f = f + [""] * (len(headers) - len(f))
+            registros.append(dict(zip(headers, numericise_all(f[:len(headers)]))))
+        return registros
+
+    def batch_get(self, rangos, **kwargs):
+        self._llamada("batch_get")
+        with self._lock:
+            ancho = max((len(f) for f in self.filas), default=0)
+            return [self._rango(r, ancho) for r in rangos]
+
+    # Escrituras ----------------------------------------------------------
+    def append_row(self, valores, **kwargs):
+        return self._agregar("append_row", [valores])
+
+    def append_rows(self, valores, **kwargs):
+        return self._agregar("append_rows", valores)
+
+    def _agregar(self, metodo, filas):
+        self._llamada(metodo, escritura=True)
+        with self._lock:
+            inicio = len(self.filas) + 1
+            self.filas.extend([[_texto(v) for v in f] for f in filas])
+            fin = len(self.filas)
+        ancho = max((len(f) for f in filas), default=1)
+        return {"updates": {"updatedRange": f"Hoja1!A{inicio}:{rowcol_to_a1(fin, ancho)}"}}
+
+    def batch_update(self, datos, **kwargs):
+        self._llamada("batch_update", escritura=True)
+        with self._lock:
+            for d in datos:
+                self._escribir(d["range"], d["values"])
+        return {"totalUpdatedCells": sum(len(v) for d in datos for v in d["values"])}
+
+    def update(self, values=None, range_name=None, **kwargs):
+        self._llamada("update", escritura=True)
+        with self._lock:
+            self._escribir(range_name or "A1", values)
+
+    def add_cols(self, cols):
+        self._llamada("add_cols", escritura=True)
+
+    def _escribir(self, rango, valores):
+        fila, col = a1_to_rowcol(rango.rsplit("!", 1)[-1].split(":")[0])
+        for i, valores_fila in enumerate(valores):
+            while len(self.filas) < fila + i:
+                self.filas.append([])
+            destino = self.filas[fila + i - 1]
+            for j, v in enumerate(valores_fila):
+                while len(destino) < col + j:
+                    destino.append("")
+                destino[col + j - 1] = _texto(v)
+
+
+class LibroFalso:
+    """Spreadsheet en memoria: lista de HojaFalsa, add_worksheet y borrado de filas por batch_update."""
+
+    def __init__(self, *hojas):
+        self.hojas = []
+        for hoja in hojas:
+            self._incluir(hoja)
+
+    def _incluir(self, hoja):
+        hoja.id = len(self.hojas)
+        hoja.spreadsheet = self
+        self.hojas.append(hoja)
+        return hoja
+
+    def worksheets(self):
+        self.hojas[0]._llamada("fetch_sheet_metadata")
+        return list(self.hojas)
+
+    def add_worksheet(self, title, rows=100, cols=26, **kwargs):
+        self.hojas[0]._llamada("add_worksheet", escritura=True)
+        hoja = HojaFalsa([], latencia=self.hojas[0].latencia)
+        hoja.title = title
+        return self._incluir(hoja)
+
+    def batch_update(self, cuerpo):
+        self.hojas[0]._llamada("spreadsheet_batch_update", escritura=True)
+        for pedido in cuerpo["requests"]:
+            rango = pedido["deleteDimension"]["range"]
+            hoja = self.hojas[rango["sheetId"]]
+            with hoja._lock:
+                del hoja.filas[rango["startIndex"]:rango["endIndex"]]
+        return {}
+
+
+def generar_prospectos(n, semilla=0, evaluados=0.4):
+    """Filas de datos (sin encabezado) con el orden de COLUMNAS."""
+    rnd = random.Random(semilla)
+    pos = {c: i for i, c in enumerate(COLUMNAS)}
+    filas = []
+    for i in range(n):
+        f = [""] * len(COLUMNAS)
+        nombre = f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}"
+        f[pos["Documento_ID"]] = str(1000000000 + i)
+        f[pos["Nombre"]] = nombre
+        f[pos["Tipo_ID"]] = "C.C"
+        f[pos["WhatsApp"]] = f"3{rnd.randrange(10**9):09d}"
+        f[pos["Email"]] = f"{nombre.split()[0].lower()}{i}@example.com"
+        f[pos["Ciudad"]] = rnd.choice(CIUDADES)
+        f[pos["Medio"]] = rnd.choice(MEDIOS)
+        f[pos["Hijos"]] = rnd.choice(["Sí", "No"])
+        f[pos["Num_Hijos"]] = str(rnd.randrange(3))
+        f[pos["Estado"]] = "Pre-inscrito"
+        f[pos["Fecha_Pre"]] = f"2026-{rnd.randrange(1, 10):02d}-{rnd.randrange(1, 29):02d} 10:00:00"
+        if rnd.random() < evaluados:
+            f[pos["Estado"]] = "Evaluado"
+            f[pos["Arquetipo"]] = rnd.choice(ARQUETIPOS)
+            f[pos["Respuestas_Arquetipo"]] = "".join(rnd.choice("abcd") for _ in range(20))
+            f[pos["Puntajes_Items"]] = "".join(str(rnd.randrange(1, 5)) for _ in range(29))
+            f[pos["Score_Total"]] = str(round(rnd.uniform(20, 100), 1))
+            f[pos["Clasificacion"]] = "Bueno - Potencial con entrenamiento"
+        filas.append(f)
+    return filas
+
+
+def registros(filas, headers=COLUMNAS):
+    return [dict(zip(headers, f)) for f in filas]
+
+
+# ==============================
+# SMTP
+# ==============================
+class _SesionSMTP(socketserver.StreamRequestHandler):
+
+    def _responder(self, linea):
+        if self.server.latencia:
+            time.sleep(self.server.latencia)
+        self.wfile.write(linea.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        self._responder("220 localhost ESMTP falso")
+        remitente, destinatarios = None, []
+        while True:
+            try:
+                linea = self.rfile.readline()
+            except ConnectionError:
+                return
+            if not linea:
+                return
+            comando = linea.decode("utf-8", "replace").strip()
+            verbo = comando[:4].upper()
+            if verbo in ("EHLO", "HELO"):
+                self.wfile.write(b"250-localhost\r\n250-AUTH PLAIN\r\n")
+                self._responder("250 SIZE 35882577")
+            elif verbo == "MAIL":
+                remitente, destinatarios = comando.split(":", 1)[1].strip(" <>"), []
+                self._responder("250 OK")
+            elif verbo == "RCPT":
+                destinatarios.append(comando.split(":", 1)[1].strip(" <>"))
+                self._responder("250 OK")
+            elif verbo == "DATA":
+                self._responder("354 Fin con <CRLF>.<CRLF>")
+                partes = []
+                while True:
+                    parte = self.rfile.readline()
+                    if not parte or parte == b".\r\n":
+                        break
+                    partes.append(parte)
+                with self.server.lock:
+                    self.server.mensajes.append((remitente, destinatarios, b"".join(partes)))
+                self._responder("250 OK encolado")
+            elif verbo == "AUTH":
+                self._responder("235 Autenticado")
+            elif verbo in ("RSET", "NOOP"):
+                self._responder("250 OK")
+            elif verbo == "QUIT":
+                self._responder("221 Adios")
+                return
+            else:
+                self._responder("502 No implementado")
+
+
+class ServidorSMTPFalso(socketserver.ThreadingTCPServer):
+    """Servidor SMTP mínimo (sin TLS ni login) que guarda los mensajes en memoria."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latencia=0.0):
+        super().__init__(("127.0.0.1", 0), _SesionSMTP)
+        self.latencia = latencia
+        self.mensajes = []
+        self.lock = threading.Lock()
+        self.host, self.puerto = self.server_address
+        self._hilo = threading.Thread(target=self.serve_forever, name="smtp-falso", daemon=True)
+        self._hilo.start()
+
+    def cerrar(self):
+        self.shutdown()
+        self.server_close()
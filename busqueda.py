@@ -0,0 +1,166 @@
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from duplicados import normalizar_documento, normalizar_email, normalizar_telefono, tokens_nombre
+
+# Columnas que necesita el índice; Estado solo se muestra en los resultados
+COLUMNAS_BUSQUEDA = ["Documento_ID", "Nombre", "WhatsApp", "Email", "Estado"]
+
+# Términos más cortos no acotan la búsqueda y se ignoran
+MIN_CARACTERES = 2
+
+
+def _claves(r):
+    # Palabras del nombre, email completo y parte local, documento y teléfono; los
+    # dígitos también invertidos ("~" + reverso) para buscar por los últimos números
+    claves = set(tokens_nombre(r.get("Nombre")))
+    email = normalizar_email(r.get("Email"))
+    if email:
+        claves.add(email)
+        claves.add(email.split("@")[0])
+    telefono = re.sub(r"[^0-9]", "", str(r.get("WhatsApp") or ""))
+    for digitos in (normalizar_documento(r.get("Documento_ID")).lower(), telefono, normalizar_telefono(telefono)):
+        if digitos:
+            claves.add(digitos)
+            if digitos.isdigit():
+                claves.add("~" + digitos[::-1])
+    return claves
+
+
+def terminos(texto):
+    """Términos de búsqueda normalizados como las claves del índice."""
+    texto = str(texto or "")
+    # Teléfono escrito con espacios, guiones o indicativo: un solo término
+    if re.fullmatch(r"[0-9+()\-. ]+", texto.strip()):
+        digitos = normalizar_telefono(texto)
+        return [digitos] if len(digitos) >= MIN_CARACTERES else []
+    resultado = []
+    for parte in texto.split():
+        if "@" in parte:
+            termino = normalizar_email(parte)
+        elif any(c.isdigit() for c in parte):
+            # Parte local de un email o documento alfanumérico
+            termino = re.sub(r"[^0-9a-z]", "", parte.lower())
+        else:
+            termino = " ".join(tokens_nombre(parte)) or normalizar_documento(parte).lower()
+        for t in termino.split():
+            if len(t) >= MIN_CARACTERES:
+                resultado.append(t)
+    return resultado
+
+
+class IndiceBusqueda:
+    """Índice de prefijos sobre Nombre, WhatsApp, Email y Documento_ID.
+
+    Las claves de todos los prospectos viven en una lista ordenada; cada término
+    es un rango contiguo (bisect), así que una búsqueda no recorre la base. Los
+    cambios de un prospecto solo mueven sus propias claves.
+    """
+
+    def __init__(self, ttl=600):
+        self.ttl = ttl
+        self._claves = []
+        self._ids = []
+        self._largos = []
+        self._prospectos = []
+        self._por_documento = {}
+        self._construido = None
+        self._lock = threading.Lock()
+
+    def vigente(self):
+        return self._construido is not None and time.monotonic() - self._construido < self.ttl
+
+    def construir(self, registros):
+        prospectos, por_documento, pares = [], {}, []
+        for r in registros:
+            documento_id = str(r.get("Documento_ID", "")).strip()
+            if not documento_id:
+                continue
+            datos = {c: r.get(c, "") for c in COLUMNAS_BUSQUEDA}
+            pid = por_documento.get(documento_id)
+            if pid is None:
+                pid = por_documento[documento_id] = len(prospectos)
+                prospectos.append(None)
+            prospectos[pid] = (datos, _claves(datos))
+        for pid, (_, claves) in enumerate(prospectos):
+            pares.extend((clave, pid) for clave in claves)
+        pares.sort()
+        with self._lock:
+            self._claves = [c for c, _ in pares]
+            self._ids = [pid for _, pid in pares]
+            self._largos = [len(c) for c in self._claves]
+            self._prospectos, self._por_documento = prospectos, por_documento
+            self._construido = time.monotonic()
+
+    def aplicar(self, documento_id, cambios):
+        # Suscriptor del feed de cambios
+        if self._construido is None or not any(c in cambios for c in COLUMNAS_BUSQUEDA):
+            return
+        documento_id = str(documento_id).strip()
+        with self._lock:
+            pid = self._por_documento.get(documento_id)
+            if pid is None:
+                pid = self._por_documento[documento_id] = len(self._prospectos)
+                self._prospectos.append(({}, set()))
+            datos, anteriores = self._prospectos[pid]
+            datos = dict(datos)
+            datos.update((c, v) for c, v in cambios.items() if c in COLUMNAS_BUSQUEDA)
+            datos["Documento_ID"] = documento_id
+            claves = _claves(datos)
+            for clave in anteriores - claves:
+                i = bisect_left(self._claves, clave)
+                while self._ids[i] != pid:
+                    i += 1
+                del self._claves[i], self._ids[i], self._largos[i]
+            for clave in claves - anteriores:
+                i = bisect_right(self._claves, clave)
+                self._claves.insert(i, clave)
+                self._ids.insert(i, pid)
+                self._largos.insert(i, len(clave))
+            self._prospectos[pid] = (datos, claves)
+
+    def __len__(self):
+        return len(self._prospectos)
+
+    def _rango(self, termino):
+        return bisect_left(self._claves, termino), bisect_left(self._claves, termino + "\uffff")
+
+    def buscar(self, texto, maximo=10):
+        """[(puntaje, datos)] de los prospectos que tienen todos los términos de `texto`.
+
+        Una clave igual al término vale más que una que solo empieza por él, y
+        entre prefijos vale más la clave más corta ("ana" antes que "anabel").
+        """
+        lista = terminos(texto)
+        if not lista:
+            return []
+        terminos_unicos = list(dict.fromkeys(lista))
+        with self._lock:
+            n = len(self._prospectos)
+            total = np.zeros(n)
+            presentes = np.zeros(n, dtype=np.int64)
+            for termino in terminos_unicos:
+                # Los dígitos se buscan también por el final (clave invertida)
+                variantes = [termino] + (["~" + termino[::-1]] if termino.isdigit() else [])
+                mejor = np.zeros(n)
+                for buscado in variantes:
+                    inicio, fin = self._rango(buscado)
+                    if inicio == fin:
+                        continue
+                    ids = np.array(self._ids[inicio:fin], dtype=np.int64)
+                    puntaje = len(buscado) / np.array(self._largos[inicio:fin], dtype=float)
+                    # Las claves iguales al término quedan al principio del rango
+                    puntaje[:bisect_right(self._claves, buscado, inicio, fin) - inicio] = 2.0
+                    np.maximum.at(mejor, ids, puntaje)
+                if not mejor.any():
+                    return []
+                total += mejor
+                presentes += mejor > 0
+            candidatos = np.flatnonzero(presentes == len(terminos_unicos))
+            # Empates en el orden de la hoja
+            mejores = candidatos[np.argsort(-total[candidatos], kind="stable")[:maximo]]
+            return [(round(float(total[pid]), 2), dict(self._prospectos[pid][0])) for pid in mejores]
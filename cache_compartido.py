@@ -0,0 +1,333 @@
+"""Caché y coordinación compartidos entre réplicas de la app.
+
+    shared_cache = "/datos/cache.db"          # SQLite en un volumen común
+    shared_cache = "redis://cache:6379/0"     # Redis (requiere pip install redis)
+
+Guarda lo que cada réplica pediría a la hoja por su cuenta (encabezados, índice
+de documentos, copia de la hoja), la cuota por minuto de la API y los límites
+por cliente (bloqueo de login, espera entre envíos). Sin shared_cache todo
+queda en memoria del proceso, como con una sola réplica.
+"""
+import json
+import random
+import sqlite3
+import threading
+import time
+import zlib
+
+# Valores más grandes se comprimen (la copia de la hoja, el índice de documentos)
+COMPRIMIR_DESDE = 64 * 1024
+
+
+# JSON y no pickle: quien pueda escribir en el caché (Redis, el archivo SQLite) no debe
+# poder ejecutar código en las réplicas. Los valores son listas, dicts con claves de
+# texto, números y textos; una tupla vuelve como lista. Lo que no se reconoce (p.ej. lo
+# que dejó una versión anterior) cuenta como ausente
+def _serializar(valor):
+    datos = json.dumps(valor, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(datos) >= COMPRIMIR_DESDE:
+        return b"z" + zlib.compress(datos, 1)
+    return b"j" + datos
+
+
+def _deserializar(datos):
+    datos = bytes(datos)
+    if datos[:1] == b"z":
+        return json.loads(zlib.decompress(datos[1:]))
+    if datos[:1] == b"j":
+        return json.loads(datos[1:])
+    return None
+
+
+class Cache:
+    """Interfaz común. Los ttl son en segundos; obtener() devuelve None si la clave no existe o venció."""
+
+    compartido = True
+
+    def obtener(self, clave):
+        raise NotImplementedError
+
+    def guardar(self, clave, valor, ttl):
+        raise NotImplementedError
+
+    def borrar(self, clave):
+        raise NotImplementedError
+
+    def incrementar(self, clave, ttl):
+        # Contador que vence `ttl` segundos después del primer incremento; devuelve el nuevo valor
+        raise NotImplementedError
+
+    def adquirir(self, clave, ttl):
+        # True solo para quien crea la clave; sirve de candado que vence solo
+        raise NotImplementedError
+
+    def liberar(self, clave):
+        self.borrar(clave)
+
+    def actualizar(self, clave, funcion):
+        # Aplica funcion(valor) de forma atómica conservando el vencimiento; no hace nada si no existe
+        raise NotImplementedError
+
+    def obtener_o_calcular(self, clave, calcular, ttl, espera=10.0):
+        """Valor de `clave`; si falta, una sola réplica lo calcula y las demás esperan hasta `espera` s."""
+        valor = self.obtener(clave)
+        if valor is not None:
+            return valor
+        candado = f"calculando:{clave}"
+        limite = time.monotonic() + espera
+        while True:
+            if self.adquirir(candado, max(espera, 30)):
+                try:
+                    valor = calcular()
+                    self.guardar(clave, valor, ttl)
+                    return valor
+                finally:
+                    self.liberar(candado)
+            time.sleep(0.1)
+            valor = self.obtener(clave)
+            if valor is not None:
+                return valor
+            if time.monotonic() > limite:
+                # Quien calculaba tarda demasiado o murió con el candado tomado
+                return calcular()
+
+
+# ==============================
+# EN MEMORIA
+# ==============================
+class CacheLocal(Cache):
+    """Caché del proceso: lo mismo que hacía cada réplica por su cuenta."""
+
+    compartido = False
+
+    def __init__(self):
+        self._datos = {}
+        self._lock = threading.Lock()
+
+    def _vigente(self, clave):
+        entrada = self._datos.get(clave)
+        if entrada is not None and entrada[1] <= time.time():
+            del self._datos[clave]
+            return None
+        return entrada
+
+    def obtener(self, clave):
+        with self._lock:
+            entrada = self._vigente(clave)
+        return entrada[0] if entrada else None
+
+    def guardar(self, clave, valor, ttl):
+        with self._lock:
+            self._datos[clave] = (valor, time.time() + ttl)
+
+    def borrar(self, clave):
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def incrementar(self, clave, ttl):
+        with self._lock:
+            entrada = self._vigente(clave)
+            valor, vence = (entrada[0] + 1, entrada[1]) if entrada else (1, time.time() + ttl)
+            self._datos[clave] = (valor, vence)
+        return valor
+
+    def adquirir(self, clave, ttl):
+        with self._lock:
+            if self._vigente(clave):
+                return False
+            self._datos[clave] = (True, time.time() + ttl)
+        return True
+
+    def actualizar(self, clave, funcion):
+        with self._lock:
+            entrada = self._vigente(clave)
+            if entrada is None:
+                return None
+            valor = funcion(entrada[0])
+            self._datos[clave] = (valor, entrada[1])
+        return valor
+
+
+# ==============================
+# SQLITE
+# ==============================
+class CacheSQLite(Cache):
+    """Archivo SQLite compartido por las réplicas de una misma máquina o volumen."""
+
+    def __init__(self, ruta, purgar_cada=200):
+        self.ruta = ruta
+        self.purgar_cada = purgar_cada
+        self._escrituras = 0
+        self._lock = threading.Lock()
+        # Transacciones manuales (BEGIN IMMEDIATE) para incrementar/adquirir/actualizar
+        self._conn = sqlite3.connect(ruta, timeout=30, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (clave TEXT PRIMARY KEY, valor BLOB, vence REAL)"
+            )
+
+    def _leer(self, clave):
+        # (valor, vence) o None; dentro o fuera de una transacción
+        row = self._conn.execute("SELECT valor, vence FROM cache WHERE clave = ?", (clave,)).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        valor = _deserializar(row[0])
+        return (valor, row[1]) if valor is not None else None
+
+    def _escribir(self, clave, valor, vence):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache (clave, valor, vence) VALUES (?, ?, ?)",
+            (clave, _serializar(valor), vence)
+        )
+        self._escrituras += 1
+        if self._escrituras % self.purgar_cada == 0:
+            self._conn.execute("DELETE FROM cache WHERE vence <= ?", (time.time(),))
+
+    def _transaccion(self, funcion):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                resultado = funcion()
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return resultado
+
+    def obtener(self, clave):
+        with self._lock:
+            entrada = self._leer(clave)
+        return entrada[0] if entrada else None
+
+    def guardar(self, clave, valor, ttl):
+        with self._lock:
+            self._escribir(clave, valor, time.time() + ttl)
+
+    def borrar(self, clave):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE clave = ?", (clave,))
+
+    def incrementar(self, clave, ttl):
+        def incrementar():
+            entrada = self._leer(clave)
+            valor, vence = (entrada[0] + 1, entrada[1]) if entrada else (1, time.time() + ttl)
+            self._escribir(clave, valor, vence)
+            return valor
+        return self._transaccion(incrementar)
+
+    def adquirir(self, clave, ttl):
+        def adquirir():
+            if self._leer(clave):
+                return False
+            self._escribir(clave, True, time.time() + ttl)
+            return True
+        return self._transaccion(adquirir)
+
+    def actualizar(self, clave, funcion):
+        def actualizar():
+            entrada = self._leer(clave)
+            if entrada is None:
+                return None
+            valor = funcion(entrada[0])
+            self._escribir(clave, valor, entrada[1])
+            return valor
+        return self._transaccion(actualizar)
+
+
+# ==============================
+# REDIS
+# ==============================
+class CacheRedis(Cache):
+    """Redis o compatible (Valkey, KeyDB); para réplicas en distintas máquinas."""
+
+    def __init__(self, url, prefijo="glamour:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("Para shared_cache con Redis instala redis (pip install redis).")
+        self._redis = redis
+        self._cliente = redis.Redis.from_url(url)
+        self.prefijo = prefijo
+
+    def obtener(self, clave):
+        datos = self._cliente.get(self.prefijo + clave)
+        return _deserializar(datos) if datos is not None else None
+
+    def guardar(self, clave, valor, ttl):
+        self._cliente.set(self.prefijo + clave, _serializar(valor), px=int(ttl * 1000))
+
+    def borrar(self, clave):
+        self._cliente.delete(self.prefijo + clave)
+
+    def incrementar(self, clave, ttl):
+        # Los contadores se guardan como enteros de Redis (INCR), no serializados. SET NX PX
+        # e INCR van en un MULTI: el contador no puede quedar sin vencimiento si el proceso
+        # muere entre los dos pasos
+        clave = self.prefijo + clave
+        with self._cliente.pipeline(transaction=True) as pipe:
+            pipe.set(clave, 0, nx=True, px=int(ttl * 1000))
+            pipe.incr(clave)
+            _, valor = pipe.execute()
+        return valor
+
+    def adquirir(self, clave, ttl):
+        return bool(self._cliente.set(self.prefijo + clave, b"1", nx=True, px=int(ttl * 1000)))
+
+    def actualizar(self, clave, funcion):
+        clave = self.prefijo + clave
+        with self._cliente.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(clave)
+                    datos, restante = pipe.get(clave), pipe.pttl(clave)
+                    valor = _deserializar(datos) if datos is not None else None
+                    if valor is None or restante <= 0:
+                        pipe.reset()
+                        return None
+                    valor = funcion(valor)
+                    pipe.multi()
+                    pipe.set(clave, _serializar(valor), px=restante)
+                    pipe.execute()
+                    return valor
+                except self._redis.WatchError:
+                    continue
+
+
+def crear_cache(destino):
+    """CacheLocal sin destino, CacheRedis para redis:// o rediss://, si no CacheSQLite en esa ruta."""
+    destino = str(destino or "").strip()
+    if not destino:
+        return CacheLocal()
+    if destino.startswith(("redis://", "rediss://", "unix://")):
+        return CacheRedis(destino)
+    if destino.startswith("sqlite:///"):
+        destino = destino[len("sqlite:///"):]
+    return CacheSQLite(destino)
+
+
+# ==============================
+# CUOTA DE LA API
+# ==============================
+class LimiteCompartido:
+    """Misma interfaz que cliente_sheets.LimiteTokens, pero contando las llamadas de todas las réplicas.
+
+    Ventanas fijas de un minuto, como las cuenta la API de Sheets.
+    """
+
+    def __init__(self, cache, clave, por_minuto):
+        self.cache = cache
+        self.clave = clave
+        self.por_minuto = por_minuto
+
+    def tomar(self):
+        # Bloquea hasta que la ventana actual tenga cupo; devuelve cuántos segundos esperó
+        esperado = 0.0
+        while True:
+            ventana = int(time.time() // 60)
+            if self.cache.incrementar(f"{self.clave}:{ventana}", 120) <= self.por_minuto:
+                return esperado
+            # Jitter para que las réplicas no se despierten todas a la vez
+            falta = (ventana + 1) * 60 - time.time() + random.uniform(0, 1)
+            time.sleep(max(falta, 0.05))
+            esperado += max(falta, 0.05)
@@ -0,0 +1,53 @@
+import logging
+import threading
+import time
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+
+class FeedCambios:
+    """Cambios de prospectos hechos por esta réplica, numerados y en orden.
+
+    Cada escritura publica el Documento_ID y los campos que cambió. Los
+    suscriptores (resumen del dashboard, copia local de la hoja) se actualizan
+    en el momento; las sesiones guardan la última versión que vieron y con
+    desde() obtienen solo lo que cambió después.
+    """
+
+    def __init__(self, capacidad=5000):
+        self.version = 0
+        self._cambios = deque(maxlen=capacidad)
+        self._suscriptores = []
+        self._lock = threading.Lock()
+
+    def suscribir(self, funcion):
+        # funcion(documento_id, campos)
+        with self._lock:
+            self._suscriptores.append(funcion)
+
+    def publicar(self, documento_id, campos):
+        documento_id = str(documento_id).strip()
+        campos = dict(campos)
+        with self._lock:
+            self.version += 1
+            self._cambios.append((self.version, documento_id, campos, time.time()))
+            suscriptores = list(self._suscriptores)
+        for funcion in suscriptores:
+            try:
+                funcion(documento_id, campos)
+            except Exception:
+                log.exception("Suscriptor del feed falló con %s", documento_id)
+        return self.version
+
+    def desde(self, version):
+        """[(version, documento_id, campos, instante)] posteriores a `version`.
+
+        None si algunos ya salieron del feed: quien los pide debe recargar completo.
+        """
+        with self._lock:
+            if version >= self.version:
+                return []
+            if not self._cambios or self._cambios[0][0] > version + 1:
+                return None
+            return [c for c in self._cambios if c[0] > version]
@@ -0,0 +1,219 @@
+import logging
+import random
+import threading
+import time
+
+import requests
+from google.auth.transport.requests import AuthorizedSession
+from gspread.exceptions import APIError
+
+from metricas import REGISTRO, medir
+
+log = logging.getLogger(__name__)
+
+# Cuota por defecto de la API de Sheets para una cuenta de servicio:
+# 60 lecturas y 60 escrituras por minuto
+LECTURAS_POR_MINUTO = 60
+ESCRITURAS_POR_MINUTO = 60
+
+REINTENTABLES = {429, 500, 502, 503, 504}
+
+
+class LimiteTokens:
+    """Cubeta de tokens: hasta `capacidad` llamadas seguidas y luego `por_minuto` al minuto."""
+
+    def __init__(self, por_minuto, capacidad=None):
+        self.por_segundo = por_minuto / 60.0
+        self.capacidad = capacidad or por_minuto
+        self._tokens = float(self.capacidad)
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def tomar(self):
+        # Bloquea hasta que haya un token; devuelve cuántos segundos esperó
+        esperado = 0.0
+        while True:
+            with self._lock:
+                ahora = time.monotonic()
+                self._tokens = min(self.capacidad, self._tokens + (ahora - self._ultimo) * self.por_segundo)
+                self._ultimo = ahora
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return esperado
+                falta = (1 - self._tokens) / self.por_segundo
+            time.sleep(falta)
+            esperado += falta
+
+
+class _Llamada:
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+def _copia(resultado):
+    # Quien se une a una lectura en curso recibe sus propias listas/dicts de primer nivel
+    if isinstance(resultado, list):
+        return [list(x) if isinstance(x, list) else dict(x) if isinstance(x, dict) else x for x in resultado]
+    return resultado
+
+
+def _codigo(error):
+    if isinstance(error, APIError):
+        return getattr(error.response, "status_code", None) or error.code
+    return None
+
+
+class HojaProtegida:
+    """Envoltura de un gspread.Worksheet compartida entre sesiones.
+
+    Aplica la cuota por minuto, reintenta con backoff exponencial y jitter los
+    429/5xx y une en una sola llamada las lecturas idénticas que estén en curso.
+    """
+
+    def __init__(self, hoja, lecturas_por_minuto=LECTURAS_POR_MINUTO,
+                 escrituras_por_minuto=ESCRITURAS_POR_MINUTO, reintentos=5,
+                 espera_base=1.0, espera_max=64.0):
+        self.hoja = hoja
+        self.lecturas = LimiteTokens(lecturas_por_minuto)
+        self.escrituras = LimiteTokens(escrituras_por_minuto)
+        self.reintentos = reintentos
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self._en_curso = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, nombre):
+        # id, title, row_count, etc. pasan directo a la hoja
+        return getattr(self.hoja, nombre)
+
+    @property
+    def spreadsheet(self):
+        # El libro, con la misma cuota: su batch_update (borrar filas) también gasta escrituras
+        return LibroProtegido(self.hoja.spreadsheet, self)
+
+    def hermana(self, hoja):
+        # Otra hoja del mismo libro (p.ej. de archivo): la cuota es por proyecto, se comparte
+        otra = HojaProtegida(hoja, reintentos=self.reintentos, espera_base=self.espera_base,
+                             espera_max=self.espera_max)
+        otra.lecturas, otra.escrituras = self.lecturas, self.escrituras
+        return otra
+
+    # ------------------------------------------------------------------
+    # Lecturas
+    # ------------------------------------------------------------------
+    def row_values(self, fila, **kwargs):
+        return self._leer("row_values", fila, **kwargs)
+
+    def col_values(self, col, **kwargs):
+        return self._leer("col_values", col, **kwargs)
+
+    def get_all_values(self, **kwargs):
+        return self._leer("get_all_values", **kwargs)
+
+    def get_all_records(self, **kwargs):
+        return self._leer("get_all_records", **kwargs)
+
+    def batch_get(self, rangos, **kwargs):
+        return self._leer("batch_get", list(rangos), **kwargs)
+
+    # ------------------------------------------------------------------
+    # Escrituras: nunca se unen. Un append que falla con 5xx pudo haberse
+    # aplicado, así que solo se reintenta cuando la API lo rechazó por cuota.
+    # ------------------------------------------------------------------
+    def append_row(self, valores, **kwargs):
+        return self._escribir("append_row", {429}, valores, **kwargs)
+
+    def append_rows(self, valores, **kwargs):
+        return self._escribir("append_rows", {429}, valores, **kwargs)
+
+    def batch_update(self, datos, **kwargs):
+        return self._escribir("batch_update", REINTENTABLES, datos, **kwargs)
+
+    def update(self, *args, **kwargs):
+        return self._escribir("update", REINTENTABLES, *args, **kwargs)
+
+    # ------------------------------------------------------------------
+    def _leer(self, metodo, *args, **kwargs):
+        clave = (metodo, repr(args), repr(sorted(kwargs.items())))
+        with self._lock:
+            llamada = self._en_curso.get(clave)
+            lider = llamada is None
+            if lider:
+                llamada = self._en_curso[clave] = _Llamada()
+        REGISTRO.cache("sheets_lecturas_unidas", not lider)
+        if not lider:
+            llamada.listo.wait()
+            if llamada.error is not None:
+                raise llamada.error
+            return _copia(llamada.resultado)
+        try:
+            llamada.resultado = self._con_reintentos(self.lecturas, REINTENTABLES, metodo, *args, **kwargs)
+            return llamada.resultado
+        except Exception as e:
+            llamada.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._en_curso[clave]
+            llamada.listo.set()
+
+    def _escribir(self, metodo, reintentables, *args, **kwargs):
+        return self._con_reintentos(self.escrituras, reintentables, metodo, *args, **kwargs)
+
+    def _con_reintentos(self, limite, reintentables, metodo, *args, **kwargs):
+        intento = 0
+        while True:
+            espera = limite.tomar()
+            if espera:
+                REGISTRO.observar("sheets.cuota_espera", espera)
+            try:
+                with medir(f"sheets.{metodo}"):
+                    return getattr(self.hoja, metodo)(*args, **kwargs)
+            except (APIError, requests.ConnectionError, requests.Timeout) as e:
+                codigo = _codigo(e)
+                # Sin código (conexión) se reintenta solo lo que también se reintentaría con un 5xx
+                reintentable = codigo in reintentables if codigo is not None else 500 in reintentables
+                if not reintentable or intento >= self.reintentos:
+                    raise
+                espera = min(self.espera_max, self.espera_base * 2 ** intento) * random.uniform(0.5, 1)
+                log.warning("Sheets %s falló (%s), reintento %d en %.1fs", metodo, codigo or e, intento + 1, espera)
+                time.sleep(espera)
+                intento += 1
+
+
+class LibroProtegido(HojaProtegida):
+    """Spreadsheet de una HojaProtegida: comparte su cuota y sus reintentos.
+
+    worksheets(), add_worksheet() y demás pasan directo al libro.
+    """
+
+    def __init__(self, libro, hoja):
+        super().__init__(libro, reintentos=hoja.reintentos, espera_base=hoja.espera_base,
+                         espera_max=hoja.espera_max)
+        self.lecturas, self.escrituras = hoja.lecturas, hoja.escrituras
+
+    def batch_update(self, cuerpo, **kwargs):
+        # Cambios de estructura (deleteDimension): un 5xx pudo aplicarse y repetirlo borraría otras filas
+        return self._escribir("batch_update", {429}, cuerpo, **kwargs)
+
+
+class SesionSheets(AuthorizedSession):
+    """Sesión HTTP con pool de conexiones compartido por todos los hilos de Streamlit."""
+
+    def __init__(self, credenciales, conexiones=10):
+        super().__init__(credenciales)
+        adaptador = requests.adapters.HTTPAdapter(
+            pool_connections=conexiones, pool_maxsize=conexiones, pool_block=True
+        )
+        self.mount("https://", adaptador)
+        self._lock_token = threading.Lock()
+
+    def request(self, method, url, *args, **kwargs):
+        # Un solo hilo renueva el token cuando expira
+        if not self.credentials.valid:
+            with self._lock_token:
+                if not self.credentials.valid:
+                    self.credentials.refresh(self._auth_request)
+        return super().request(method, url, *args, **kwargs)
@@ -0,0 +1,175 @@
+import logging
+import random
+import smtplib
+import sqlite3
+import threading
+import time
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from metricas import medir
+
+log = logging.getLogger(__name__)
+
+
+def componer(remitente, to, subject, body, attachment_bytes=None, filename="documento.pdf"):
+    msg = MIMEMultipart()
+    msg['From'] = remitente
+    msg['To'] = to
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'plain'))
+    if attachment_bytes:
+        part = MIMEApplication(attachment_bytes, Name=filename)
+        part['Content-Disposition'] = f'attachment; filename="{filename}"'
+        msg.attach(part)
+    return msg
+
+
+class BandejaSalida:
+    """Cola persistente de correos drenada por un hilo con una sola conexión SMTP."""
+
+    def __init__(self, ruta, usuario, clave, host="smtp.gmail.com", puerto=587,
+                 max_intentos=6, espera_base=5, espera_max=600, inactividad=60,
+                 smtp_factory=smtplib.SMTP, starttls=True):
+        self.usuario = usuario
+        self.clave = clave
+        self.host = host
+        self.puerto = puerto
+        self.max_intentos = max_intentos
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self.inactividad = inactividad
+        self.smtp_factory = smtp_factory
+        self.starttls = starttls
+        self._smtp = None
+        self._ultimo_uso = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(ruta, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    destinatario TEXT NOT NULL,
+                    mensaje TEXT NOT NULL,
+                    estado TEXT NOT NULL DEFAULT 'pendiente',
+                    intentos INTEGER NOT NULL DEFAULT 0,
+                    proximo REAL NOT NULL DEFAULT 0,
+                    error TEXT,
+                    creado REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_outbox_estado ON outbox (estado, proximo)")
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._trabajar, name="bandeja-salida", daemon=True)
+        self._hilo.start()
+
+    def encolar(self, to, subject, body, attachment_bytes=None, filename="documento.pdf"):
+        msg = componer(self.usuario, to, subject, body, attachment_bytes, filename)
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO outbox (destinatario, mensaje, creado) VALUES (?, ?, ?)",
+                (to, msg.as_string(), time.time())
+            )
+        self._despertar.set()
+        return cur.lastrowid
+
+    def pendientes(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox WHERE estado = 'pendiente'").fetchone()[0]
+
+    def estado(self, id_mensaje):
+        with self._lock:
+            row = self._conn.execute("SELECT estado FROM outbox WHERE id = ?", (id_mensaje,)).fetchone()
+        return row[0] if row else None
+
+    def detener(self, timeout=5):
+        self._detener.set()
+        self._despertar.set()
+        self._hilo.join(timeout)
+
+    # ------------------------------------------------------------------
+    def _siguiente(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, destinatario, mensaje, intentos FROM outbox "
+                "WHERE estado = 'pendiente' AND proximo <= ? ORDER BY id LIMIT 1",
+                (time.time(),)
+            ).fetchone()
+
+    def _proxima_espera(self):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(proximo) FROM outbox WHERE estado = 'pendiente'"
+            ).fetchone()
+        if row[0] is None:
+            return self.inactividad
+        return max(0.0, min(row[0] - time.time(), self.inactividad))
+
+    def _marcar(self, id_mensaje, estado, intentos, proximo=0, error=None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET estado = ?, intentos = ?, proximo = ?, error = ? WHERE id = ?",
+                (estado, intentos, proximo, error, id_mensaje)
+            )
+
+    def _conexion(self):
+        if self._smtp is None:
+            with medir("smtp.conectar"):
+                smtp = self.smtp_factory(self.host, self.puerto, timeout=30)
+                if self.starttls:
+                    smtp.starttls()
+                if self.usuario:
+                    smtp.login(self.usuario, self.clave)
+            self._smtp = smtp
+        return self._smtp
+
+    def _cerrar(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+
+    def _enviar(self, destinatario, mensaje):
+        reutilizada = self._smtp is not None
+        try:
+            self._conexion().sendmail(self.usuario, destinatario, mensaje)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            # La conexión reutilizada pudo caducar en el servidor: reconectar una vez
+            self._cerrar()
+            if not reutilizada:
+                raise
+            self._conexion().sendmail(self.usuario, destinatario, mensaje)
+        self._ultimo_uso = time.monotonic()
+
+    def _trabajar(self):
+        while not self._detener.is_set():
+            item = self._siguiente()
+            if item is None:
+                if self._smtp is not None and time.monotonic() - self._ultimo_uso > self.inactividad:
+                    self._cerrar()
+                self._despertar.wait(self._proxima_espera())
+                self._despertar.clear()
+                continue
+
+            id_mensaje, destinatario, mensaje, intentos = item
+            intentos += 1
+            try:
+                with medir("smtp.enviar"):
+                    self._enviar(destinatario, mensaje)
+                self._marcar(id_mensaje, "enviado", intentos)
+            except smtplib.SMTPRecipientsRefused as e:
+                self._marcar(id_mensaje, "fallido", intentos, error=str(e))
+            except Exception as e:
+                self._cerrar()
+                if intentos >= self.max_intentos:
+                    log.error("Correo %s descartado tras %d intentos: %s", id_mensaje, intentos, e)
+                    self._marcar(id_mensaje, "fallido", intentos, error=str(e))
+                else:
+                    espera = min(self.espera_base * 2 ** (intentos - 1), self.espera_max)
+                    espera *= random.uniform(0.5, 1.0)
+                    self._marcar(id_mensaje, "pendiente", intentos, time.time() + espera, str(e))
+        self._cerrar()
@@ -0,0 +1,218 @@
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+def _definitivo(error):
+    # Rechazos que reintentar no arregla: 4xx de la API (salvo 408/429) o datos inválidos.
+    # Cuota, 5xx y errores de conexión son transitorios
+    respuesta = getattr(error, "response", None)
+    codigo = getattr(respuesta, "status_code", None) or getattr(error, "code", None)
+    if isinstance(codigo, int):
+        return 400 <= codigo < 500 and codigo not in (408, 429)
+    return isinstance(error, (ValueError, TypeError, sqlite3.IntegrityError))
+
+
+class DiarioInscripciones:
+    """Diario local de pre-inscripciones que se vuelca en lotes al Almacen.
+
+    Cada registro queda confirmado en disco al llamar a registrar(); un hilo
+    agrupa los pendientes y los escribe con agregar_lote() cuando se juntan
+    tam_lote filas o pasan `intervalo` segundos desde la más antigua.
+
+    Estados: 'pendiente' → 'enviando' → 'escrito', o 'fallido' si el destino
+    rechaza el registro (4xx, datos inválidos); los fallidos no se reintentan
+    y se pasan a `al_fallar(data, error)` para que alguien los cargue a mano.
+    """
+
+    def __init__(self, ruta, destino, tam_lote=50, intervalo=5, espera_max=300, al_fallar=None):
+        self.destino = destino
+        self.al_fallar = al_fallar
+        self.tam_lote = tam_lote
+        self.intervalo = intervalo
+        self.espera_max = espera_max
+        self._fallos = 0
+        self._reanudar = 0.0
+        self._lock = threading.Lock()
+        self._volcando = threading.Lock()
+        self._conn = sqlite3.connect(ruta, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA synchronous=FULL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS diario (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    documento_id TEXT NOT NULL,
+                    datos TEXT NOT NULL,
+                    estado TEXT NOT NULL DEFAULT 'pendiente',
+                    intentos INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    creado REAL NOT NULL,
+                    escrito REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_diario_estado ON diario (estado, id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_diario_documento ON diario (documento_id)")
+        self._recuperar()
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._trabajar, name="diario-inscripciones", daemon=True)
+        self._hilo.start()
+
+    def registrar(self, data):
+        documento_id = str(data.get("Documento_ID", "")).strip()
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO diario (documento_id, datos, creado) VALUES (?, ?, ?)",
+                (documento_id, json.dumps(data, ensure_ascii=False, default=str), time.time())
+            )
+            pendientes = self._pendientes()
+        if pendientes >= self.tam_lote:
+            self._despertar.set()
+        return cur.lastrowid
+
+    def contiene(self, documento_id):
+        # Registros aún por escribir en el destino (cuentan para detectar duplicados)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM diario WHERE documento_id = ? AND estado IN ('pendiente', 'enviando') LIMIT 1",
+                (str(documento_id).strip(),)
+            ).fetchone()
+        return row is not None
+
+    def estado(self, documento_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT estado, intentos, error FROM diario WHERE documento_id = ? ORDER BY id DESC LIMIT 1",
+                (str(documento_id).strip(),)
+            ).fetchone()
+        return dict(zip(("estado", "intentos", "error"), row)) if row else None
+
+    def resumen(self):
+        with self._lock:
+            return dict(self._conn.execute("SELECT estado, COUNT(*) FROM diario GROUP BY estado").fetchall())
+
+    def vaciar(self):
+        # Vuelca todo lo pendiente de inmediato (scripts y apagado ordenado)
+        while self._volcar(forzar=True):
+            pass
+
+    def detener(self, timeout=10):
+        self._detener.set()
+        self._despertar.set()
+        self._hilo.join(timeout)
+
+    # ------------------------------------------------------------------
+    def _pendientes(self):
+        return self._conn.execute("SELECT COUNT(*) FROM diario WHERE estado = 'pendiente'").fetchone()[0]
+
+    def _recuperar(self, propagar=False):
+        # Lotes interrumpidos o fallidos a mitad de escritura (pudieron aplicarse):
+        # confirmar contra el destino antes de reintentarlos. Sin confirmación siguen
+        # en 'enviando' y no se vuelven a agregar
+        with self._lock:
+            filas = self._conn.execute(
+                "SELECT id, documento_id FROM diario WHERE estado = 'enviando'"
+            ).fetchall()
+        for id_reg, documento_id in filas:
+            try:
+                existe = self.destino.existe(documento_id)
+            except Exception:
+                if propagar:
+                    raise
+                continue
+            with self._lock, self._conn:
+                if existe:
+                    self._conn.execute(
+                        "UPDATE diario SET estado = 'escrito', error = NULL, escrito = ? WHERE id = ?",
+                        (time.time(), id_reg)
+                    )
+                else:
+                    self._conn.execute("UPDATE diario SET estado = 'pendiente' WHERE id = ?", (id_reg,))
+
+    def _lote(self, forzar):
+        with self._lock:
+            filas = self._conn.execute(
+                "SELECT id, datos, creado FROM diario WHERE estado = 'pendiente' ORDER BY id LIMIT ?",
+                (self.tam_lote,)
+            ).fetchall()
+        if not filas:
+            return []
+        if forzar or len(filas) >= self.tam_lote or time.time() - filas[0][2] >= self.intervalo:
+            return filas
+        return []
+
+    def _volcar(self, forzar=False):
+        with self._volcando:
+            return self._volcar_lote(forzar)
+
+    def _volcar_lote(self, forzar):
+        self._recuperar(propagar=True)
+        filas = self._lote(forzar)
+        if not filas:
+            return False
+        self._enviar(filas)
+        return True
+
+    def _enviar(self, filas):
+        ids = [f[0] for f in filas]
+        marcas = ", ".join("?" for _ in ids)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE diario SET estado = 'enviando' WHERE id IN ({marcas})", ids)
+        try:
+            self.destino.agregar_lote([json.loads(f[1]) for f in filas])
+        except Exception as e:
+            definitivo = _definitivo(e)
+            # Un error transitorio deja el lote en 'enviando' para confirmarlo con existe()
+            # antes del reintento; un rechazo de un registro solo es terminal
+            estado = "enviando" if not definitivo else "fallido" if len(filas) == 1 else "pendiente"
+            with self._lock, self._conn:
+                self._conn.execute(
+                    f"UPDATE diario SET estado = ?, intentos = intentos + 1, error = ? "
+                    f"WHERE id IN ({marcas})", [estado, str(e)] + ids
+                )
+            if not definitivo:
+                raise
+            if len(filas) == 1:
+                log.error("El destino rechazó la pre-inscripción del diario %s: %s", ids[0], e)
+                self._avisar_fallo(json.loads(filas[0][1]), e)
+                return
+            # Un registro inválido rechaza el lote entero: se reenvían de a uno para aislarlo
+            for fila in filas:
+                self._enviar([fila])
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE diario SET estado = 'escrito', intentos = intentos + 1, error = NULL, escrito = ? "
+                f"WHERE id IN ({marcas})", [time.time()] + ids
+            )
+
+    def _avisar_fallo(self, data, error):
+        # A quien se inscribió ya se le confirmó el envío: el registro no puede perderse en silencio
+        if self.al_fallar is None:
+            return
+        try:
+            self.al_fallar(data, error)
+        except Exception:
+            log.exception("No se pudo avisar la pre-inscripción fallida %s", data.get("Documento_ID"))
+
+    def _trabajar(self):
+        while not self._detener.is_set():
+            if time.monotonic() >= self._reanudar:
+                try:
+                    if self._volcar():
+                        self._fallos = 0
+                        continue
+                except Exception as e:
+                    # Cuota o error transitorio de la hoja: reintentar con backoff
+                    self._fallos += 1
+                    espera = min(self.intervalo * 2 ** self._fallos, self.espera_max)
+                    espera *= random.uniform(0.5, 1.0)
+                    self._reanudar = time.monotonic() + espera
+                    log.warning("No se pudo volcar el diario (reintento en %.0fs): %s", espera, e)
+            self._despertar.wait(max(1.0, self._reanudar - time.monotonic()))
+            self._despertar.clear()
@@ -0,0 +1,186 @@
+import difflib
+import re
+import threading
+import time
+import unicodedata
+from itertools import combinations
+
+# Columnas que necesita el índice
+COLUMNAS_INDICE = ["Documento_ID", "Nombre", "Email", "WhatsApp"]
+
+# Puntaje a partir del cual una pre-inscripción se marca como posible duplicado
+UMBRAL = 0.6
+
+# Aporte de cada coincidencia al puntaje (se satura en 1). El mismo email o el mismo
+# WhatsApp bastan solos: es quien se vuelve a inscribir con el documento mal escrito
+PESO_EMAIL = 0.6
+PESO_TELEFONO = 0.6
+PESO_DOCUMENTO = 0.4
+PESO_NOMBRE = 0.3
+SIMILITUD_NOMBRE = 0.85
+
+# Bloques de nombre o de parte local del email más grandes que esto (p.ej. "ana|gome",
+# "info", "contacto") no discriminan y se ignoran; email completo, teléfono y documento
+# siguen encontrando esos duplicados
+MAX_BLOQUE = 1000
+BLOQUES_ACOTADOS = ("n:", "u:")
+
+
+# ==============================
+# NORMALIZACIÓN
+# ==============================
+def normalizar_email(email):
+    # Minúsculas y sin la etiqueta "+algo" de la parte local
+    email = str(email or "").strip().lower()
+    local, _, dominio = email.partition("@")
+    return f"{local.split('+')[0]}@{dominio}" if dominio else local
+
+
+def normalizar_telefono(tel):
+    # Solo dígitos, como validar_telefono; sin indicativo (últimos 10)
+    return re.sub(r"[^0-9]", "", str(tel or ""))[-10:]
+
+
+def normalizar_documento(doc):
+    return re.sub(r"[^0-9A-Za-z]", "", str(doc or "")).upper()
+
+
+def tokens_nombre(nombre):
+    texto = unicodedata.normalize("NFKD", str(nombre or "")).encode("ascii", "ignore").decode().lower()
+    return sorted(t for t in re.findall(r"[a-z]+", texto) if len(t) > 1)
+
+
+def _claves(documento, nombre, email, telefono):
+    claves = set()
+    if email:
+        claves.add("e:" + email)
+        # Mismo usuario con el dominio mal escrito (gmial.com)
+        claves.add("u:" + email.split("@")[0])
+    if len(telefono) >= 7:
+        claves.add("t:" + telefono)
+    # Pares de tokens recortados a 4 letras: tolera errores al final y el orden
+    recortes = sorted({t[:4] for t in nombre})
+    for a, b in combinations(recortes, 2):
+        claves.add(f"n:{a}|{b}")
+    # Vecindad por borrado: documentos a un dígito de distancia comparten una clave
+    if len(documento) >= 5:
+        claves.update("d:" + documento[:i] + documento[i + 1:] for i in range(len(documento)))
+    return claves
+
+
+def _a_una_edicion(a, b):
+    if a == b or abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diferentes = [i for i in range(len(a)) if a[i] != b[i]]
+        return len(diferentes) == 1 or (
+            len(diferentes) == 2 and diferentes[1] == diferentes[0] + 1
+            and a[diferentes[0]] == b[diferentes[1]] and a[diferentes[1]] == b[diferentes[0]]
+        )
+    corto, largo = sorted((a, b), key=len)
+    return any(largo[:i] + largo[i + 1:] == corto for i in range(len(largo)))
+
+
+# ==============================
+# ÍNDICE
+# ==============================
+class IndiceDuplicados:
+    """Índice por claves de bloqueo (email, teléfono, nombre, documento) para detectar duplicados.
+
+    Cada búsqueda solo compara contra los prospectos que comparten alguna clave
+    con el nuevo registro, nunca contra toda la base.
+    """
+
+    def __init__(self, ttl=600):
+        self.ttl = ttl
+        self._bloques = {}
+        self._prospectos = {}
+        self._construido = None
+        self._lock = threading.Lock()
+
+    def vigente(self):
+        return self._construido is not None and time.monotonic() - self._construido < self.ttl
+
+    def construir(self, registros):
+        bloques, prospectos = {}, {}
+        for r in registros:
+            self._agregar(bloques, prospectos, r.get("Documento_ID"), r)
+        with self._lock:
+            self._bloques, self._prospectos = bloques, prospectos
+            self._construido = time.monotonic()
+
+    def aplicar(self, documento_id, cambios):
+        # Suscriptor del feed de cambios: solo interesan altas y cambios de los campos indexados
+        if self._construido is None or not any(c in cambios for c in COLUMNAS_INDICE):
+            return
+        with self._lock:
+            previo = self._prospectos.get(str(documento_id).strip())
+            data = dict(previo["datos"], **cambios) if previo else cambios
+            self._agregar(self._bloques, self._prospectos, documento_id, data)
+
+    def __len__(self):
+        return len(self._prospectos)
+
+    @staticmethod
+    def _agregar(bloques, prospectos, documento_id, r):
+        documento_id = str(documento_id or "").strip()
+        if not documento_id:
+            return
+        previo = prospectos.get(documento_id)
+        if previo:
+            for clave in previo["claves"]:
+                bloques.get(clave, set()).discard(documento_id)
+        p = {
+            "datos": {c: r.get(c, "") for c in COLUMNAS_INDICE},
+            "documento": normalizar_documento(documento_id),
+            "nombre": tokens_nombre(r.get("Nombre")),
+            "email": normalizar_email(r.get("Email")),
+            "telefono": normalizar_telefono(r.get("WhatsApp")),
+        }
+        p["claves"] = _claves(p["documento"], p["nombre"], p["email"], p["telefono"])
+        for clave in p["claves"]:
+            bloques.setdefault(clave, set()).add(documento_id)
+        prospectos[documento_id] = p
+
+    def buscar(self, data, umbral=UMBRAL, maximo=5):
+        """[(puntaje, Documento_ID, Nombre, motivos)] de los posibles duplicados de `data`."""
+        documento_id = str(data.get("Documento_ID", "")).strip()
+        nuevo = {
+            "documento": normalizar_documento(documento_id),
+            "nombre": tokens_nombre(data.get("Nombre")),
+            "email": normalizar_email(data.get("Email")),
+            "telefono": normalizar_telefono(data.get("WhatsApp")),
+        }
+        claves = _claves(nuevo["documento"], nuevo["nombre"], nuevo["email"], nuevo["telefono"])
+        with self._lock:
+            candidatos = set()
+            for clave in claves:
+                bloque = self._bloques.get(clave, set())
+                if clave.startswith(BLOQUES_ACOTADOS) and len(bloque) > MAX_BLOQUE:
+                    continue
+                candidatos |= bloque
+            candidatos.discard(documento_id)
+            prospectos = [(doc, self._prospectos[doc]) for doc in candidatos]
+
+        resultado = []
+        for doc, p in prospectos:
+            puntaje, motivos = 0.0, []
+            if nuevo["email"] and nuevo["email"] == p["email"]:
+                puntaje += PESO_EMAIL
+                motivos.append("email")
+            if len(nuevo["telefono"]) >= 7 and nuevo["telefono"] == p["telefono"]:
+                puntaje += PESO_TELEFONO
+                motivos.append("whatsapp")
+            if _a_una_edicion(nuevo["documento"], p["documento"]):
+                puntaje += PESO_DOCUMENTO
+                motivos.append("documento")
+            if nuevo["nombre"] and p["nombre"]:
+                similitud = difflib.SequenceMatcher(None, " ".join(nuevo["nombre"]), " ".join(p["nombre"])).ratio()
+                if similitud >= SIMILITUD_NOMBRE:
+                    puntaje += PESO_NOMBRE * similitud
+                    motivos.append("nombre")
+            puntaje = min(puntaje, 1.0)
+            if puntaje >= umbral:
+                resultado.append((round(puntaje, 2), doc, p["datos"].get("Nombre", ""), motivos))
+        resultado.sort(key=lambda c: c[0], reverse=True)
+        return resultado[:maximo]
@@ -0,0 +1,151 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Las etiquetas con el porcentaje ("Actitud y Valores (20%)") salen de los pesos configurados
+CATEGORIAS = {
+    "Actitud y Valores": [
+        "Actitud positiva", "Franqueza/Integridad", "Responsabilidad",
+        "Tolerancia a la presión", "Disciplina personal", "Nivel de compromiso",
+        "Dinamismo/Energía", "Resiliencia emocional"
+    ],
+    "Presentación, Imagen y Personalidad": [
+        "Presentación personal", "Higiene", "Expresión y desenvolvimiento",
+        "Timidez (inversa)", "Extrovertida", "Confianza en cámara",
+        "Creatividad en autoexpresión"
+    ],
+    "Aptitudes y Comportamientos": [
+        "Iniciativa/Autonomía", "Orientado a resultados", "Proactividad",
+        "Capacidad de aprendizaje", "Adaptabilidad", "Habilidades de ventas/persuasión",
+        "Manejo de tiempo"
+    ],
+    "Conocimientos y Background": [
+        "Manejo de inglés", "Manejo de PC", "Nivel ortográfico",
+        "Experiencia laboral", "Plataformas webcam", "Habilidades digitales",
+        "Seguridad online"
+    ]
+}
+
+PESOS = {
+    "Actitud y Valores": 0.20,
+    "Presentación, Imagen y Personalidad": 0.25,
+    "Aptitudes y Comportamientos": 0.25,
+    "Conocimientos y Background": 0.30
+}
+
+ARQUETIPOS_BONO = ["El Mago", "El Amante"]
+
+MUY_BUENO = "Muy Bueno - Perfil Ideal"
+BUENO = "Bueno - Potencial con entrenamiento"
+MALO = "Malo - No recomendado en este momento"
+
+ITEM_MIN, ITEM_MAX = 1, 4
+
+
+def nombre_categoria(clave):
+    # "Actitud y Valores (20%)" -> "Actitud y Valores"; configuraciones anteriores usan la etiqueta
+    return re.sub(r"\s*\(\s*[\d.,]+\s*%\s*\)\s*$", "", str(clave)).strip()
+
+
+class Rubrica:
+    """Pesos, bono por arquetipo y umbrales de clasificación de la evaluación."""
+
+    def __init__(self, categorias=CATEGORIAS, pesos=PESOS, bono=5, arquetipos_bono=ARQUETIPOS_BONO,
+                 umbral_muy_bueno=80, umbral_bueno=50):
+        self.categorias = categorias
+        self.pesos = {cat: float(pesos[cat]) for cat in categorias}
+        self.etiquetas = {cat: f"{cat} ({round(peso * 100, 1):g}%)" for cat, peso in self.pesos.items()}
+        self.bono = bono
+        self.arquetipos_bono = list(arquetipos_bono)
+        self.umbral_muy_bueno = umbral_muy_bueno
+        self.umbral_bueno = umbral_bueno
+        self.items = [(cat, item) for cat, items in categorias.items() for item in items]
+        # Columnas de la matriz de ítems que pertenecen a cada categoría
+        self._cortes = []
+        inicio = 0
+        for items in categorias.values():
+            self._cortes.append(slice(inicio, inicio + len(items)))
+            inicio += len(items)
+        self._vector_pesos = np.array([self.pesos[cat] for cat in categorias])
+
+    @classmethod
+    def desde_config(cls, config):
+        # config: mapeo opcional (p.ej. st.secrets["rubrica"]) con las claves a sobrescribir
+        config = dict(config or {})
+        pesos = dict(PESOS)
+        pesos.update({nombre_categoria(k): float(v) for k, v in dict(config.get("pesos", {})).items()})
+        return cls(
+            pesos=pesos,
+            bono=float(config.get("bono_arquetipo", 5)),
+            arquetipos_bono=config.get("arquetipos_bono", ARQUETIPOS_BONO),
+            umbral_muy_bueno=float(config.get("umbral_muy_bueno", 80)),
+            umbral_bueno=float(config.get("umbral_bueno", 50)),
+        )
+
+    def por_categoria(self, items):
+        # items: (n, num_items) con valores 1..4 -> (n, num_categorias) en porcentaje
+        items = np.atleast_2d(np.asarray(items, dtype=float))
+        return np.stack(
+            [items[:, c].sum(axis=1) / ((c.stop - c.start) * ITEM_MAX) * 100 for c in self._cortes],
+            axis=1
+        )
+
+    def totales(self, items, arquetipos):
+        por_cat = self.por_categoria(items)
+        bono = np.where(
+            pd.Series(list(arquetipos), dtype=object).fillna("").astype(str).str.strip().isin(self.arquetipos_bono),
+            self.bono, 0
+        )
+        # Se suma categoría por categoría y se redondea con round() de Python para
+        # reproducir exactamente los puntajes ya guardados
+        total = np.zeros(len(por_cat))
+        for j, peso in enumerate(self._vector_pesos):
+            total = total + por_cat[:, j] * peso
+        total = np.minimum(total + bono, 100)
+        return np.fromiter((round(t, 1) for t in total.tolist()), dtype=float, count=len(total))
+
+    def clasificar(self, totales):
+        totales = np.asarray(totales, dtype=float)
+        return np.select(
+            [totales > self.umbral_muy_bueno, totales >= self.umbral_bueno],
+            [MUY_BUENO, BUENO],
+            default=MALO
+        )
+
+    def evaluar(self, items, arquetipo):
+        # Un solo prospecto: (total, clasificación, {etiqueta de la categoría: %})
+        por_cat = self.por_categoria([items])[0]
+        total = float(self.totales([items], [arquetipo])[0])
+        return total, str(self.clasificar([total])[0]), dict(zip(self.etiquetas.values(), por_cat))
+
+    def recalcular(self, registros):
+        """Recalcula Score_Total y Clasificacion de todos los registros con ítems guardados.
+
+        Devuelve {Documento_ID: {"Score_Total": ..., "Clasificacion": ...}} solo para los que cambian.
+        """
+        df = pd.DataFrame(list(registros))
+        if df.empty or "Puntajes_Items" not in df.columns:
+            return {}
+        codigos = df["Puntajes_Items"].fillna("").astype(str).str.strip()
+        validos = codigos.str.fullmatch(f"[{ITEM_MIN}-{ITEM_MAX}]{{{len(self.items)}}}")
+        validos &= df["Documento_ID"].astype(str).str.strip() != ""
+        df, codigos = df[validos], codigos[validos]
+        if df.empty:
+            return {}
+        items = np.array([list(c) for c in codigos], dtype=np.int8)
+        arquetipos = df["Arquetipo"] if "Arquetipo" in df.columns else [""] * len(df)
+        totales = self.totales(items, arquetipos)
+        clasif = self.clasificar(totales)
+        actuales = pd.to_numeric(df.get("Score_Total", pd.Series(index=df.index, dtype=float)), errors="coerce")
+        clasif_actual = df.get("Clasificacion", pd.Series("", index=df.index)).astype(str)
+        cambia = (actuales.to_numpy() != totales) | (clasif_actual.to_numpy() != clasif)
+        docs = df["Documento_ID"].astype(str).str.strip().to_numpy()
+        return {
+            doc: {"Score_Total": float(t), "Clasificacion": str(c)}
+            for doc, t, c in zip(docs[cambia], totales[cambia], clasif[cambia])
+        }
+
+
+def codificar(items):
+    return "".join(str(int(v)) for v in items)
@@ -0,0 +1,176 @@
+"""Exportación de la base de prospectos a CSV o Parquet.
+
+    python exportacion.py prospectos.parquet [--bloque 1000]
+    python exportacion.py prospectos.csv.gz
+
+Lee la hoja por rangos A1 de tamaño fijo (un batch_get por bloque) y escribe
+cada bloque apenas llega, así que la memoria no depende del número de
+prospectos. Las fechas y los números se exportan con su tipo; el resto de
+columnas como texto. Parquet requiere pyarrow. La configuración de
+almacenamiento se toma de .streamlit/secrets.toml, igual que la app.
+"""
+import argparse
+import gzip
+import importlib.util
+import os
+
+import pandas as pd
+
+# Columnas con tipo; las demás se exportan como texto
+FECHAS_HORA = ["Fecha_Pre", "Fecha_Entrevista", "Fecha_Eval"]
+FECHAS = ["Nacimiento_Fecha"]
+DECIMALES = ["Score_Total"]
+ENTEROS = ["Num_Hijos"]
+
+FORMATOS = {".csv": "csv", ".gz": "csv", ".parquet": "parquet"}
+
+
+def _fechas(serie):
+    texto = serie.astype(str).str.strip()
+    fechas = pd.to_datetime(texto, errors="coerce", format="ISO8601")
+    # Fechas escritas a mano en la hoja, p.ej. 17/05/1995
+    faltan = fechas.isna() & (texto != "")
+    if faltan.any():
+        fechas[faltan] = pd.to_datetime(texto[faltan], errors="coerce", format="mixed", dayfirst=True)
+    return fechas
+
+
+def tipar(filas, headers):
+    """DataFrame de un bloque de filas de la hoja con las columnas tipadas."""
+    ancho = len(headers)
+    df = pd.DataFrame([(list(f) + [""] * ancho)[:ancho] for f in filas], columns=headers, dtype=object)
+    for col in headers:
+        if col in FECHAS_HORA:
+            df[col] = _fechas(df[col]).astype("datetime64[us]")
+        elif col in FECHAS:
+            df[col] = _fechas(df[col]).dt.date
+        elif col in DECIMALES:
+            df[col] = pd.to_numeric(df[col].replace("", None), errors="coerce").astype("float64")
+        elif col in ENTEROS:
+            df[col] = pd.to_numeric(df[col].replace("", None), errors="coerce").round().astype("Int64")
+        else:
+            df[col] = df[col].astype(str)
+    return df
+
+
+def esquema_arrow(headers):
+    import pyarrow as pa
+    tipos = {}
+    for col in headers:
+        if col in FECHAS_HORA:
+            tipos[col] = pa.timestamp("us")
+        elif col in FECHAS:
+            tipos[col] = pa.date32()
+        elif col in DECIMALES:
+            tipos[col] = pa.float64()
+        elif col in ENTEROS:
+            tipos[col] = pa.int64()
+        else:
+            tipos[col] = pa.string()
+    return pa.schema(list(tipos.items()))
+
+
+# ==============================
+# ESCRITORES
+# ==============================
+class _EscritorCSV:
+
+    def __init__(self, ruta, headers):
+        self._archivo = (gzip.open(ruta, "wt", newline="", encoding="utf-8") if ruta.endswith(".gz")
+                         else open(ruta, "w", newline="", encoding="utf-8"))
+        self._encabezado = True
+        self.headers = headers
+
+    def escribir(self, df):
+        df.to_csv(self._archivo, header=self._encabezado, index=False)
+        self._encabezado = False
+
+    def cerrar(self):
+        if self._encabezado:
+            pd.DataFrame(columns=self.headers).to_csv(self._archivo, index=False)
+        self._archivo.close()
+
+
+class _EscritorParquet:
+    # Cada bloque queda como un row group
+
+    def __init__(self, ruta, headers):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Para exportar a Parquet instala pyarrow (pip install pyarrow).")
+        self._pa = pa
+        self.esquema = esquema_arrow(headers)
+        self._escritor = pq.ParquetWriter(ruta, self.esquema, compression="zstd")
+
+    def escribir(self, df):
+        self._escritor.write_table(self._pa.Table.from_pandas(df, schema=self.esquema, preserve_index=False))
+
+    def cerrar(self):
+        self._escritor.close()
+
+
+ESCRITORES = {"csv": _EscritorCSV, "parquet": _EscritorParquet}
+
+
+# ==============================
+# EXPORTACIÓN
+# ==============================
+class ExportadorProspectos:
+    """Recorre el almacén por bloques y los escribe tipados en CSV o Parquet."""
+
+    def __init__(self, almacen, tam_bloque=1000):
+        self.almacen = almacen
+        self.tam_bloque = tam_bloque
+
+    def exportar(self, ruta, formato=None, al_avanzar=None):
+        formato = formato or FORMATOS.get(os.path.splitext(ruta)[1].lower())
+        if formato not in ESCRITORES:
+            raise ValueError(f"Formato no soportado para {ruta}: usa .csv, .csv.gz o .parquet")
+        headers = list(self.almacen.encabezados())
+        # Un archivo a medio escribir no debe reemplazar una exportación anterior
+        temporal = f"{ruta}.tmp"
+        escritor = ESCRITORES[formato](temporal, headers)
+        total = 0
+        try:
+            for filas in self.almacen.bloques(self.tam_bloque):
+                # Filas vacías en medio de la hoja
+                filas = [f for f in filas if any(str(v).strip() for v in f)]
+                if not filas:
+                    continue
+                escritor.escribir(tipar(filas, headers))
+                total += len(filas)
+                if al_avanzar:
+                    al_avanzar(total)
+        except BaseException:
+            escritor.cerrar()
+            os.remove(temporal)
+            raise
+        escritor.cerrar()
+        os.replace(temporal, ruta)
+        return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta la base de prospectos a CSV o Parquet.")
+    parser.add_argument("archivo", help="destino .csv, .csv.gz o .parquet")
+    parser.add_argument("--formato", choices=sorted(ESCRITORES), help="por defecto según la extensión")
+    parser.add_argument("--bloque", type=int, default=1000, help="filas por batch_get y por escritura")
+    args = parser.parse_args()
+    formato = args.formato or FORMATOS.get(os.path.splitext(args.archivo)[1].lower())
+    # Antes de conectar con la hoja: sin pyarrow no hay nada que exportar a Parquet
+    if formato == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        parser.error("para exportar a Parquet instala pyarrow (pip install pyarrow)")
+
+    from servicios import get_almacen
+    exportador = ExportadorProspectos(get_almacen(), tam_bloque=args.bloque)
+    total = exportador.exportar(
+        args.archivo, args.formato,
+        al_avanzar=lambda n: print(f"  {n} filas exportadas", flush=True)
+    )
+    print(f"Exportadas: {total}  Archivo: {args.archivo}")
+
+
+if __name__ == "__main__":
+    main()
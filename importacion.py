@@ -0,0 +1,236 @@
+"""Importación masiva de prospectos desde CSV o Excel.
+
+    python importacion.py leads.csv --reporte errores.csv [--bloque 500] [--dry-run]
+
+Lee el archivo por bloques, aplica las mismas validaciones del formulario de
+Pre-Inscripción, descarta Documento_ID ya existentes (solo se descarga esa
+columna) o repetidos en el archivo y escribe cada bloque con un solo
+agregar_lote (append_rows en Google Sheets). La configuración de
+almacenamiento se toma de .streamlit/secrets.toml, igual que la app.
+"""
+import argparse
+import csv
+import datetime
+import itertools
+import os
+import re
+import unicodedata
+
+from almacenamiento import COLUMNAS
+from validaciones import (
+    FORMATOS_FECHA, validar_edad_minima, validar_email, validar_nombre, validar_telefono
+)
+
+ESTADO_INICIAL = "Pre-inscrito"
+
+CAMPOS_REPORTE = ["Fila", "Documento_ID", "Resultado", "Errores"]
+
+
+def _clave(nombre):
+    # "E-mail", "email", " EMAIL " -> "email"; "Num Hijos" -> "numhijos"
+    texto = unicodedata.normalize("NFKD", str(nombre or "")).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]", "", texto.lower())
+
+
+COLUMNAS_POR_CLAVE = {_clave(c): c for c in COLUMNAS}
+
+
+def _texto(valor):
+    if valor is None:
+        return ""
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor).strip()
+
+
+def _fecha(valor):
+    if isinstance(valor, datetime.datetime):
+        return valor.date()
+    if isinstance(valor, datetime.date):
+        return valor
+    texto = _texto(valor).split(" ")[0]
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.datetime.strptime(texto, formato).date()
+        except ValueError:
+            pass
+    return None
+
+
+# ==============================
+# LECTURA POR BLOQUES
+# ==============================
+def _filas_csv(ruta):
+    with open(ruta, newline="", encoding="utf-8-sig") as f:
+        muestra = f.read(8192)
+        f.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t|")
+        except csv.Error:
+            dialecto = csv.excel
+        lector = csv.reader(f, dialecto)
+        encabezados = next(lector, [])
+        for fila in lector:
+            if any(c.strip() for c in fila):
+                yield lector.line_num, encabezados, fila
+
+
+def _filas_excel(ruta):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError("Para importar Excel instala openpyxl (pip install openpyxl).")
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        filas = libro.active.iter_rows(values_only=True)
+        encabezados = [_texto(c) for c in next(filas, [])]
+        for num, fila in enumerate(filas, start=2):
+            if any(_texto(c) for c in fila):
+                yield num, encabezados, list(fila)
+    finally:
+        libro.close()
+
+
+def _registros(filas):
+    # Los encabezados del archivo se llevan a los nombres de COLUMNAS una sola vez
+    columnas = None
+    for num, encabezados, fila in filas:
+        if columnas is None:
+            columnas = [COLUMNAS_POR_CLAVE.get(_clave(e), e) for e in encabezados]
+        yield num, dict(zip(columnas, fila))
+
+
+def leer_bloques(ruta, tam_bloque=500):
+    """Genera listas de (número de fila en el archivo, registro) de hasta tam_bloque elementos."""
+    extension = os.path.splitext(ruta)[1].lower()
+    registros = _registros(_filas_excel(ruta) if extension in (".xlsx", ".xlsm") else _filas_csv(ruta))
+    while True:
+        bloque = list(itertools.islice(registros, tam_bloque))
+        if not bloque:
+            return
+        yield bloque
+
+
+# ==============================
+# VALIDACIÓN
+# ==============================
+def preparar(registro, ahora=None):
+    """Normaliza un registro del archivo y devuelve (data, errores)."""
+    data = {c: _texto(v) for c, v in registro.items() if c in COLUMNAS}
+    errores = []
+
+    if not data.get("Documento_ID"):
+        errores.append("Documento requerido.")
+    if not validar_nombre(data.get("Nombre", "")):
+        errores.append("Nombre inválido (mínimo 3 caracteres).")
+    if not validar_email(data.get("Email", "")):
+        errores.append("Correo inválido.")
+    if not validar_telefono(data.get("WhatsApp", "")):
+        errores.append("Teléfono inválido.")
+
+    nacimiento = _fecha(registro.get("Nacimiento_Fecha"))
+    if nacimiento is None:
+        errores.append("Fecha de nacimiento inválida.")
+    else:
+        edad_valida, mensaje = validar_edad_minima(nacimiento)
+        if not edad_valida:
+            errores.append(mensaje)
+        data["Nacimiento_Fecha"] = str(nacimiento)
+
+    hijos = data.get("Hijos", "")
+    if hijos.lower() in ("si", "sí"):
+        data["Hijos"] = "Sí"
+        try:
+            num_hijos = int(float(data.get("Num_Hijos") or 0))
+        except ValueError:
+            num_hijos = 0
+        if num_hijos <= 0:
+            errores.append("Si tiene hijos, la cantidad no puede ser 0.")
+        data["Num_Hijos"] = num_hijos
+    else:
+        data["Hijos"] = "No" if hijos else ""
+        data["Num_Hijos"] = 0
+
+    data["Estado"] = data.get("Estado") or ESTADO_INICIAL
+    data["Fecha_Pre"] = data.get("Fecha_Pre") or str(ahora or datetime.datetime.now())
+    return data, errores
+
+
+# ==============================
+# IMPORTACIÓN
+# ==============================
+class ImportadorProspectos:
+    """Valida, deduplica y escribe por bloques; reporta el resultado de cada fila."""
+
+    def __init__(self, almacen, tam_bloque=500, simular=False):
+        self.almacen = almacen
+        self.tam_bloque = tam_bloque
+        self.simular = simular
+
+    def importar(self, ruta, reporte=None, al_avanzar=None):
+        # reporte: objeto con write() (p.ej. un archivo abierto) para el CSV por fila
+        escritor = csv.DictWriter(reporte, CAMPOS_REPORTE) if reporte else None
+        if escritor:
+            escritor.writeheader()
+        existentes = self.almacen.documentos()
+        resumen = {"leidas": 0, "importadas": 0, "rechazadas": 0, "duplicadas": 0, "fallidas": 0}
+
+        for bloque in leer_bloques(ruta, self.tam_bloque):
+            validos, filas = [], []
+            for num, registro in bloque:
+                data, errores = preparar(registro)
+                documento_id = data.get("Documento_ID", "")
+                if errores:
+                    resultado = "rechazada"
+                elif documento_id in existentes:
+                    resultado, errores = "duplicada", ["Este número de documento ya fue registrado."]
+                else:
+                    resultado = "importada"
+                    existentes.add(documento_id)
+                    validos.append(data)
+                filas.append({"Fila": num, "Documento_ID": documento_id,
+                              "Resultado": resultado, "Errores": " | ".join(errores)})
+
+            if validos and not self.simular:
+                try:
+                    self.almacen.agregar_lote(validos)
+                except Exception as e:
+                    for fila in filas:
+                        if fila["Resultado"] == "importada":
+                            fila["Resultado"], fila["Errores"] = "fallida", f"Error al guardar: {e}"
+                    existentes.difference_update(d["Documento_ID"] for d in validos)
+
+            for fila in filas:
+                resumen["leidas"] += 1
+                resumen[{"importada": "importadas", "rechazada": "rechazadas",
+                         "duplicada": "duplicadas", "fallida": "fallidas"}[fila["Resultado"]]] += 1
+                if escritor and fila["Resultado"] != "importada":
+                    escritor.writerow(fila)
+            if al_avanzar:
+                al_avanzar(dict(resumen))
+        return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa prospectos desde CSV o Excel.")
+    parser.add_argument("archivo", help=".csv o .xlsx con los nombres de columna de la hoja")
+    parser.add_argument("--reporte", default="importacion_errores.csv", help="CSV con las filas no importadas")
+    parser.add_argument("--bloque", type=int, default=500, help="filas por lectura y por append_rows")
+    parser.add_argument("--dry-run", action="store_true", help="validar y deduplicar sin escribir")
+    args = parser.parse_args()
+
+    from servicios import get_almacen
+    importador = ImportadorProspectos(get_almacen(), tam_bloque=args.bloque, simular=args.dry_run)
+    with open(args.reporte, "w", newline="", encoding="utf-8") as reporte:
+        resumen = importador.importar(
+            args.archivo, reporte,
+            al_avanzar=lambda r: print(f"  {r['leidas']} filas leídas, {r['importadas']} importadas", flush=True)
+        )
+    print(f"Leídas: {resumen['leidas']}  Importadas: {resumen['importadas']}  "
+          f"Rechazadas: {resumen['rechazadas']}  Duplicadas: {resumen['duplicadas']}  "
+          f"Fallidas: {resumen['fallidas']}")
+    print(f"Reporte de filas no importadas: {args.reporte}")
+
+
+if __name__ == "__main__":
+    main()
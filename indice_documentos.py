@@ -0,0 +1,65 @@
+import threading
+import time
+
+
+class IndiceDocumentos:
+    """Índice en memoria Documento_ID -> número de fila en la hoja."""
+
+    def __init__(self, ttl=300, ultima=False):
+        self.ttl = ttl
+        # En las hojas de archivo un documento puede repetirse: gana la copia más reciente
+        self.ultima = ultima
+        self._filas = {}
+        self._construido = None
+        self._lock = threading.Lock()
+
+    def vigente(self):
+        return self._construido is not None and time.monotonic() - self._construido < self.ttl
+
+    def construir(self, valores_columna):
+        # valores_columna es la columna completa, incluido el encabezado (fila 1)
+        filas = {}
+        for num_fila, valor in enumerate(valores_columna[1:], start=2):
+            valor = str(valor).strip()
+            if valor and (self.ultima or valor not in filas):
+                filas[valor] = num_fila
+        with self._lock:
+            self._filas = filas
+            self._construido = time.monotonic()
+
+    def cargar(self, filas, edad=0.0):
+        # Índice construido por otra réplica hace `edad` segundos (caché compartido)
+        with self._lock:
+            self._filas = dict(filas)
+            self._construido = time.monotonic() - max(0.0, edad)
+
+    def filas(self):
+        with self._lock:
+            return dict(self._filas)
+
+    def invalidar(self):
+        with self._lock:
+            self._construido = None
+
+    def fila(self, documento_id):
+        return self._filas.get(str(documento_id).strip())
+
+    def __contains__(self, documento_id):
+        return str(documento_id).strip() in self._filas
+
+    def __len__(self):
+        return len(self._filas)
+
+    def documentos(self):
+        with self._lock:
+            return set(self._filas)
+
+    def registrar(self, documento_id, num_fila):
+        documento_id = str(documento_id).strip()
+        if not documento_id:
+            return
+        with self._lock:
+            if self.ultima:
+                self._filas[documento_id] = num_fila
+            else:
+                self._filas.setdefault(documento_id, num_fila)
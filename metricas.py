@@ -0,0 +1,179 @@
+import bisect
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+# Límites (en segundos) de los tramos del histograma de latencia
+TRAMOS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+# Las operaciones de los hilos de fondo (diario, bandeja de salida) no tienen página
+SIN_PAGINA = "fondo"
+
+_pagina = contextvars.ContextVar("pagina", default=SIN_PAGINA)
+_local = threading.local()
+
+
+def _etiqueta(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Registro:
+    """Histogramas de latencia, errores por operación externa y aciertos de caché."""
+
+    def __init__(self, tramos=TRAMOS):
+        self.tramos = list(tramos)
+        self._lock = threading.Lock()
+        self._hist = {}
+        self._errores = {}
+        self._cache = {}
+
+    def observar(self, operacion, segundos, error=False, pagina=None):
+        clave = (operacion, pagina or _pagina.get())
+        with self._lock:
+            h = self._hist.get(clave)
+            if h is None:
+                h = self._hist[clave] = {"tramos": [0] * (len(self.tramos) + 1), "suma": 0.0, "n": 0}
+            h["tramos"][bisect.bisect_left(self.tramos, segundos)] += 1
+            h["suma"] += segundos
+            h["n"] += 1
+            if error:
+                self._errores[clave] = self._errores.get(clave, 0) + 1
+
+    @contextmanager
+    def medir(self, operacion):
+        inicio = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.observar(operacion, time.perf_counter() - inicio, error=True)
+            raise
+        self.observar(operacion, time.perf_counter() - inicio)
+
+    def cache(self, nombre, acierto):
+        with self._lock:
+            aciertos, fallos = self._cache.get(nombre, (0, 0))
+            self._cache[nombre] = (aciertos + acierto, fallos + (not acierto))
+
+    def foto(self):
+        with self._lock:
+            return {
+                "operaciones": [
+                    {"operacion": op, "pagina": pag, "llamadas": h["n"], "segundos": h["suma"],
+                     "errores": self._errores.get((op, pag), 0), "tramos": list(h["tramos"])}
+                    for (op, pag), h in sorted(self._hist.items())
+                ],
+                "cache": {
+                    nombre: {"aciertos": a, "fallos": f, "tasa": a / (a + f) if a + f else None}
+                    for nombre, (a, f) in sorted(self._cache.items())
+                },
+            }
+
+    def prometheus(self):
+        foto = self.foto()
+        lineas = [
+            "# HELP glamour_operacion_segundos Latencia de operaciones externas (Sheets, SMTP, PDF).",
+            "# TYPE glamour_operacion_segundos histogram",
+        ]
+        for o in foto["operaciones"]:
+            etiquetas = f'operacion="{_etiqueta(o["operacion"])}",pagina="{_etiqueta(o["pagina"])}"'
+            acumulado = 0
+            for limite, n in zip(self.tramos + ["+Inf"], o["tramos"]):
+                acumulado += n
+                lineas.append(f'glamour_operacion_segundos_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+            lineas.append(f"glamour_operacion_segundos_sum{{{etiquetas}}} {o['segundos']:.6f}")
+            lineas.append(f"glamour_operacion_segundos_count{{{etiquetas}}} {o['llamadas']}")
+        lineas += [
+            "# HELP glamour_operacion_errores_total Operaciones externas que terminaron en excepción.",
+            "# TYPE glamour_operacion_errores_total counter",
+        ]
+        for o in foto["operaciones"]:
+            etiquetas = f'operacion="{_etiqueta(o["operacion"])}",pagina="{_etiqueta(o["pagina"])}"'
+            lineas.append(f"glamour_operacion_errores_total{{{etiquetas}}} {o['errores']}")
+        lineas += [
+            "# HELP glamour_cache_consultas_total Consultas a cachés (Streamlit, PDF, lecturas unidas) por resultado.",
+            "# TYPE glamour_cache_consultas_total counter",
+        ]
+        for nombre, c in foto["cache"].items():
+            lineas.append(f'glamour_cache_consultas_total{{cache="{_etiqueta(nombre)}",resultado="acierto"}} {c["aciertos"]}')
+            lineas.append(f'glamour_cache_consultas_total{{cache="{_etiqueta(nombre)}",resultado="fallo"}} {c["fallos"]}')
+        return "\n".join(lineas) + "\n"
+
+    def reiniciar(self):
+        with self._lock:
+            self._hist.clear()
+            self._errores.clear()
+            self._cache.clear()
+
+
+REGISTRO = Registro()
+
+
+def medir(operacion):
+    return REGISTRO.medir(operacion)
+
+
+@contextmanager
+def pagina(nombre):
+    # Etiqueta con `nombre` todo lo que se mida en este hilo (y en los contextos copiados)
+    token = _pagina.set(nombre)
+    try:
+        yield
+    finally:
+        _pagina.reset(token)
+
+
+def con_cache(nombre):
+    """Cuenta aciertos de una función decorada con st.cache_data/st.cache_resource.
+
+    La función cacheada debe llamar a `calculado()` cuando realmente se ejecuta.
+    """
+    def decorador(funcion_cacheada):
+        @functools.wraps(funcion_cacheada)
+        def envoltura(*args, **kwargs):
+            _local.calculado = False
+            resultado = funcion_cacheada(*args, **kwargs)
+            REGISTRO.cache(nombre, not _local.calculado)
+            return resultado
+        envoltura.clear = funcion_cacheada.clear
+        return envoltura
+    return decorador
+
+
+def calculado():
+    _local.calculado = True
+
+
+class ExportadorArchivo:
+    """Escribe periódicamente el registro en formato Prometheus (textfile collector)."""
+
+    def __init__(self, ruta, intervalo=60, registro=REGISTRO):
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self.registro = registro
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._ciclo, name="metricas", daemon=True)
+        self._hilo.start()
+
+    def escribir(self):
+        temporal = f"{self.ruta}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            f.write(self.registro.prometheus())
+        os.replace(temporal, self.ruta)
+
+    def detener(self):
+        self._detener.set()
+        self._hilo.join()
+        self.escribir()
+
+    def _ciclo(self):
+        while not self._detener.wait(self.intervalo):
+            try:
+                self.escribir()
+            except OSError:
+                log.exception("No se pudieron escribir las métricas en %s", self.ruta)
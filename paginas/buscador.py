@@ -0,0 +1,32 @@
+import streamlit as st
+
+from servicios import buscar_prospectos, get_almacen
+
+
+def seleccionar_prospecto(etiqueta, key):
+    """Documento_ID del prospecto elegido, buscándolo por nombre, WhatsApp, email o documento.
+
+    Devuelve None hasta que se elige uno de la lista: guardar nunca apunta a la
+    primera coincidencia de una búsqueda parcial. Sin coincidencias en el índice,
+    un Documento_ID exacto que ya existe (p.ej. recién inscrito en otra réplica)
+    aparece como única opción.
+    """
+    texto = st.text_input(etiqueta, key=key, placeholder="Nombre, WhatsApp, email o documento").strip()
+    if not texto:
+        return None
+    prospectos = {datos["Documento_ID"]: datos for _, datos in buscar_prospectos(texto)}
+    if not prospectos and get_almacen().existe(texto):
+        prospectos = {texto: {"Documento_ID": texto}}
+    if not prospectos:
+        st.caption("Sin coincidencias.")
+        return None
+    return st.selectbox(
+        f"Coincidencias ({len(prospectos)})",
+        list(prospectos),
+        index=None,
+        placeholder="Selecciona un prospecto",
+        format_func=lambda doc: " · ".join(
+            v for v in (prospectos[doc].get("Nombre"), doc, prospectos[doc].get("WhatsApp"), prospectos[doc].get("Estado")) if v
+        ),
+        key=f"{key}_resultado",
+    )
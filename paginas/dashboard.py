@@ -0,0 +1,115 @@
+import plotly.express as px
+import streamlit as st
+
+from analitica import DESGLOSES
+from servicios import get_dataframe, get_embudo, get_feed, get_resumen, get_tabla_prospectos
+
+TAMANOS_PAGINA = [25, 50, 100, 200]
+
+
+# Revisa el feed de cambios en memoria (no la hoja); si alguien guardó algo desde
+# que se dibujó la página, la vuelve a ejecutar completa
+@st.fragment(run_every=5)
+def _vigilar_cambios():
+    if get_feed().version != st.session_state.get("dashboard_version"):
+        st.rerun()
+
+
+# Embudo de reclutamiento: cambiar el desglose o el rango solo vuelve a ejecutar esta
+# sección, que lee los acumulados ya calculados
+@st.fragment
+def _embudo():
+    embudo = get_embudo()
+    if not embudo.vigente():
+        embudo.construir(get_dataframe().to_dict("records"))
+    st.subheader("Embudo de Reclutamiento")
+    c1, c2 = st.columns([1, 2])
+    por = c1.selectbox("Desglose", ["Total"] + DESGLOSES, key="embudo_desglose")
+    rango = c2.date_input("Pre-inscripción entre", value=(), key="embudo_rango")
+    rango = tuple(rango) if isinstance(rango, (list, tuple)) else (rango,)
+    desde, hasta = (rango + (None, None))[:2]
+
+    total = embudo.embudo(desde, hasta)
+    if total.empty:
+        st.info("No hay pre-inscripciones en ese rango.")
+        return
+    fila = total.iloc[0]
+    fig = px.funnel(x=[fila["Prospectos"], fila["Entrevistados"], fila["Evaluados"]],
+                    y=["Pre-inscritos", "Entrevistados", "Evaluados"])
+    st.plotly_chart(fig, use_container_width=True)
+    cols = st.columns(2)
+    for col, etiqueta in zip(cols, ["Días Pre→Entrevista", "Días Entrevista→Eval"]):
+        valor = fila[etiqueta]
+        col.metric(f"Mediana {etiqueta}", "—" if valor is None or valor != valor else f"{valor:.1f}")
+
+    if por != "Total":
+        df = embudo.embudo(desde, hasta, por)
+        if por == "Semana" and len(df):
+            fig_cohortes = px.line(df, x="Semana", y=["% Entrevista", "% Evaluación"], markers=True,
+                                   labels={"value": "%", "variable": "Conversión"},
+                                   title="Conversión por cohorte semanal")
+            st.plotly_chart(fig_cohortes, use_container_width=True)
+        st.dataframe(df, hide_index=True)
+
+
+def mostrar():
+    st.title("Dashboard Ejecutivo - GlamourCam Studios")
+    st.session_state["dashboard_version"] = get_feed().version
+    _vigilar_cambios()
+    try:
+        resumen = get_resumen()
+        if not resumen.vigente():
+            resumen.construir(get_dataframe().to_dict("records"))
+        foto = resumen.foto()
+        if foto["total"]:
+            st.subheader("Resumen General")
+            cols = st.columns(4)
+            cols[0].metric("Total Pre-Inscritas", foto["total"])
+            cols[1].metric("Entrevistadas", foto["por_estado"].get("Entrevistado", 0))
+            cols[2].metric("Evaluadas", foto["por_estado"].get("Evaluado", 0))
+            aprobadas = foto["aprobadas"]
+            porc = aprobadas / foto["total"] * 100
+            cols[3].metric("Aprobadas", aprobadas, f"{porc:.1f}%")
+
+            estados = list(foto["por_estado"].keys())
+            if any(estados):
+                st.subheader("Distribución por Estado")
+                fig = px.pie(names=estados, values=list(foto["por_estado"].values()), title="Estados")
+                st.plotly_chart(fig, use_container_width=True)
+
+            if any(foto["por_tramo"].values()):
+                st.subheader("Distribución de Score")
+                fig_score = px.bar(x=list(foto["por_tramo"].keys()), y=list(foto["por_tramo"].values()),
+                                   labels={"x": "Score_Total", "y": "Prospectos"})
+                st.plotly_chart(fig_score, use_container_width=True)
+
+            _embudo()
+
+            st.subheader("Tabla de Prospectos")
+            tabla = get_tabla_prospectos()
+            if tabla.columnas:
+                filtro = st.multiselect("Filtrar estado", options=estados, default=estados)
+                c1, c2, c3, c4 = st.columns([3, 2, 1, 1])
+                texto = c1.text_input("Buscar (nombre, documento, email, WhatsApp, ciudad)")
+                orden = c2.selectbox("Ordenar por", tabla.columnas,
+                                     index=tabla.columnas.index("Score_Total") if "Score_Total" in tabla.columnas else 0)
+                descendente = c3.toggle("Descendente", value=True)
+                por_pagina = c4.selectbox("Filas", TAMANOS_PAGINA, index=1)
+                # Otro filtro, búsqueda, orden o tamaño de página: volver a la primera página
+                firma = (tuple(filtro), texto, orden, descendente, por_pagina)
+                if st.session_state.get("dashboard_firma") != firma:
+                    st.session_state["dashboard_firma"] = firma
+                    st.session_state["dashboard_pagina"] = 1
+                # Solo las filas de la página viajan al navegador
+                pagina = st.session_state.get("dashboard_pagina", 1)
+                df_p, filas, paginas = tabla.consultar(filtro or None, texto, orden, descendente, pagina, por_pagina)
+                # El widget toma su valor de la sesión: se acota antes de crearlo, sin value=
+                pagina = st.session_state["dashboard_pagina"] = min(max(pagina, 1), paginas)
+                st.dataframe(df_p, hide_index=True)
+                c1, c2 = st.columns([1, 3])
+                c1.number_input("Página", min_value=1, max_value=paginas, step=1, key="dashboard_pagina")
+                c2.caption(f"{filas} prospectos · página {pagina} de {paginas}")
+        else:
+            st.info("Aún no hay registros.")
+    except Exception as e:
+        st.error(f"Error en dashboard: {str(e)}")
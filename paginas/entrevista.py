@@ -0,0 +1,57 @@
+import datetime
+
+import streamlit as st
+
+from almacenamiento import ColumnaFaltante
+from paginas.buscador import seleccionar_prospecto
+from servicios import guardar_prospecto, leer_prospecto
+
+
+def mostrar():
+    st.title("Entrevista Prospecto - GlamourCam Studios")
+    documento_id = seleccionar_prospecto("Buscar prospecto para entrevista", key="entrevista_busqueda")
+    if documento_id:
+        try:
+            try:
+                data = leer_prospecto(documento_id)
+            except ColumnaFaltante as e:
+                st.error(str(e))
+                st.stop()
+            if data is None:
+                st.error("ID no encontrado.")
+                st.stop()
+
+            st.write("**Datos del Prospecto**")
+            st.write(f"Nombre: {data.get('Nombre', 'N/A')}")
+            st.write(f"WhatsApp: {data.get('WhatsApp', 'N/A')}")
+
+            st.subheader("Formulario de Entrevista")
+            motivacion = st.text_area("Motivación principal para ser modelo webcam")
+            expectativas = st.text_area("Expectativas económicas y personales")
+            fetiches = st.text_area("Fetiches o preferencias de interés")
+            disgusto = st.text_area("Disgustos o límites personales/laborales/sexuales")
+            consentimiento_familiar = st.checkbox("Consentimiento familiar para actividad webcam")
+            horario_preferido = st.text_input("Horario preferido para entrevistas/shows")
+            observaciones = st.text_area("Observaciones del entrevistador")
+
+            if st.button("Guardar Entrevista"):
+                try:
+                    updates = {
+                        "Motivacion": motivacion,
+                        "Expectativas": expectativas,
+                        "Fetiches": fetiches,
+                        "Disgusto": disgusto,
+                        "Consentimiento_Familiar": "Sí" if consentimiento_familiar else "No",
+                        "Horario_Preferido": horario_preferido,
+                        "Observaciones_Entrevista": observaciones,
+                        "Estado": "Entrevistado",
+                        "Fecha_Entrevista": str(datetime.datetime.now())
+                    }
+                    guardar_prospecto(documento_id, updates)
+                    st.success("Entrevista guardada correctamente.")
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error al guardar entrevista: {str(e)}")
+
+        except Exception as e:
+            st.error(f"Error al cargar prospecto: {str(e)}")
@@ -0,0 +1,140 @@
+import datetime
+
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from almacenamiento import ColumnaFaltante
+from evaluacion import codificar as codificar_items
+from paginas.buscador import seleccionar_prospecto
+from servicios import (
+    get_almacen, get_generador_pdf, get_rubrica, guardar_prospecto,
+    leer_prospecto, registrar_cambio, send_email, studio_email
+)
+
+
+def mostrar():
+    st.title("Evaluación - GlamourCam Studios")
+    documento_id = seleccionar_prospecto("Buscar prospecto", key="evaluacion_busqueda")
+    if documento_id:
+        try:
+            try:
+                data = leer_prospecto(documento_id)
+            except ColumnaFaltante as e:
+                st.error(str(e))
+                st.stop()
+            if data is None:
+                st.error("ID no encontrado.")
+                st.stop()
+
+            st.write("**Datos Prospecto (resumen)**")
+            st.write(f"Nombre: {data.get('Nombre', 'N/A')}")
+            st.write(f"Arquetipo: {data.get('Arquetipo', 'No disponible')}")
+
+            rubrica = get_rubrica()
+            puntajes_items = []
+
+            with st.form("evaluacion"):
+                for cat, items in rubrica.categorias.items():
+                    st.subheader(rubrica.etiquetas[cat])
+                    for item in items:
+                        score = st.slider(
+                            f"{item} (1=Bajo → 4=Excelente)",
+                            min_value=1,
+                            max_value=4,
+                            value=2,
+                            step=1,
+                            key=f"{cat}_{item}"
+                        )
+                        puntajes_items.append(score)
+
+                comentarios = st.text_area("Comentarios / Observaciones generales")
+                submit_eval = st.form_submit_button("Calcular Evaluación Final")
+
+            if submit_eval:
+                total_score, clasif, scores_cats = rubrica.evaluar(puntajes_items, data.get("Arquetipo", ""))
+
+                st.success(f"**Score Total: {total_score}%** - **{clasif}**")
+
+                # El reporte se genera en el pool mientras se dibujan los gráficos y se guarda
+                from reportes_pdf import PLANTILLA_EVALUACION
+                futuro_pdf = get_generador_pdf().enviar(PLANTILLA_EVALUACION, {
+                    "documento_id": documento_id,
+                    "nombre": data.get('Nombre', 'N/A'),
+                    "arquetipo": data.get('Arquetipo', 'No disponible'),
+                    "total_score": total_score,
+                    "clasif": clasif,
+                    "categorias": [f"{cat}: {score:.1f}%" for cat, score in scores_cats.items()],
+                    "comentarios": comentarios or 'Sin comentarios adicionales.'
+                })
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    fig_bar = px.bar(
+                        x=list(scores_cats.keys()),
+                        y=list(scores_cats.values()),
+                        title="Puntuación por Categoría (%)",
+                        color=list(scores_cats.values()),
+                        color_continuous_scale="YlOrRd"
+                    )
+                    st.plotly_chart(fig_bar, use_container_width=True)
+
+                with col2:
+                    fig_radar = go.Figure(data=go.Scatterpolar(
+                        r=list(scores_cats.values()),
+                        theta=list(scores_cats.keys()),
+                        fill='toself'
+                    ))
+                    fig_radar.update_layout(
+                        polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
+                        showlegend=False,
+                        title="Radar de Fortalezas"
+                    )
+                    st.plotly_chart(fig_radar, use_container_width=True)
+
+                try:
+                    updates = {
+                        "Score_Total": total_score,
+                        "Clasificacion": clasif,
+                        "Comentarios": comentarios,
+                        "Puntajes_Items": codificar_items(puntajes_items),
+                        "Fecha_Eval": str(datetime.datetime.now()),
+                        "Estado": "Evaluado"
+                    }
+                    guardar_prospecto(documento_id, updates)
+                    st.success("Evaluación guardada en la base de datos.")
+                except Exception as e:
+                    st.error(f"Error al guardar evaluación: {str(e)}")
+
+                pdf_bytes = futuro_pdf.result()
+
+                st.download_button(
+                    label="⬇️ Descargar Reporte PDF",
+                    data=pdf_bytes,
+                    file_name=f"Evaluacion_{documento_id}.pdf",
+                    mime="application/pdf"
+                )
+
+                send_email(
+                    studio_email,
+                    f"Evaluación Completada: {documento_id} - {clasif}",
+                    f"Score: {total_score}% - {clasif}\n\nComentarios: {comentarios or 'N/A'}",
+                    pdf_bytes,
+                    f"Evaluacion_{documento_id}.pdf"
+                )
+
+        except Exception as e:
+            st.error(f"Error al procesar evaluación: {str(e)}")
+
+    with st.expander("Recalcular evaluaciones guardadas"):
+        st.caption("Aplica los pesos y umbrales vigentes a todos los prospectos con puntajes por ítem guardados.")
+        if st.button("Recalcular todas"):
+            try:
+                cambios = get_rubrica().recalcular(get_almacen().registros())
+                if cambios:
+                    get_almacen().actualizar_lote(cambios)
+                    for doc, valores in cambios.items():
+                        registrar_cambio(doc, valores)
+                st.success(f"Evaluaciones actualizadas: {len(cambios)}")
+            except Exception as e:
+                st.error(f"No se pudo recalcular: {e}")
@@ -0,0 +1,256 @@
+import datetime
+
+import streamlit as st
+
+from servicios import (
+    get_almacen, get_diario, get_generador_pdf, get_headers, permitir_envio,
+    posibles_duplicados, registrar_cambio, send_email_con_pdf, studio_email
+)
+from validaciones import validar_edad_minima, validar_email, validar_nombre, validar_telefono
+
+
+def mostrar():
+    st.title("Pre-Inscripción - GlamourCam Studios")
+    _formulario()
+
+
+# Los campos quedan fuera de st.form para que los dependientes reaccionen, pero
+# dentro de un fragmento: cada cambio vuelve a ejecutar solo el formulario, no el
+# CSS, el logo, la barra lateral ni el enrutamiento de inscripcion.py
+@st.fragment
+def _formulario():
+    st.subheader("Datos Personales")
+    nombre = st.text_input("Nombres y apellidos")
+    tipo_id = st.selectbox("Tipo Identificación", ["C.C", "C.E", "P.P.T", "Pasaporte", "L.C"])
+    documento_id = st.text_input("Número de Documento")
+    whatsapp = st.text_input("WhatsApp / Celular")
+    email = st.text_input("E-mail")
+    direccion = st.text_input("Dirección de residencia")
+    barrio = st.text_input("Barrio")
+    departamento = st.text_input("Departamento")
+    ciudad = st.text_input("Ciudad")
+    genero = st.radio("Género", ["Masculino", "Femenino"])
+    orientacion = st.text_input("Orientación Sexual")
+    estado_civil = st.radio("Estado Civil", ["Soltero", "Casado", "Viudo", "Separado", "Unión Libre"])
+    sangre = st.text_input("Tipo de Sangre")
+
+    hijos, num_hijos = _hijos()
+
+    nacimiento_lugar = st.text_input("Lugar de Nacimiento")
+
+    hoy = datetime.date.today()
+    max_fecha = hoy - datetime.timedelta(days=18*365 + 4)
+    nacimiento_fecha = st.date_input(
+        "Fecha de Nacimiento",
+        min_value=datetime.date(1950, 1, 1),
+        max_value=max_fecha,
+        value=max_fecha - datetime.timedelta(days=365*10),
+        format="DD/MM/YYYY"
+    )
+
+    medio, medio_otro = _medio()
+
+    st.subheader("Formación Académica")
+    estudios = st.radio("Nivel de estudios", [
+        "Primaria", "Secundaria", "Técnico/Tecnólogo",
+        "Universitario", "Especialista/Maestría"
+    ])
+    ingles = st.radio("Nivel de Inglés", ["Básico", "Intermedio", "Avanzado", "Nulo"])
+    computacion = st.radio("Manejo en Computación", ["Muy bueno", "Bueno", "Regular", "Malo", "Muy malo"])
+    exp_laboral = st.text_area("Experiencia Laboral General")
+    acuerdo_pre = st.checkbox("Acepto autorización preliminar de datos")
+
+    # Formulario principal (solo submit)
+    with st.form("pre_prospecto_submit"):
+        submit_pre = st.form_submit_button("Enviar Pre-Inscripción")
+
+    if submit_pre:
+        if not acuerdo_pre:
+            st.error("Debes aceptar la autorización.")
+            st.stop()
+
+        if not validar_nombre(nombre):
+            st.error("Nombre inválido (mínimo 3 caracteres).")
+            st.stop()
+        if not validar_email(email):
+            st.error("Correo inválido.")
+            st.stop()
+        if not validar_telefono(whatsapp):
+            st.error("Teléfono inválido.")
+            st.stop()
+        if not documento_id:
+            st.error("Documento requerido.")
+            st.stop()
+
+        if hijos == "Sí" and num_hijos == 0:
+            st.error("Si tiene hijos, la cantidad no puede ser 0.")
+            st.stop()
+
+        edad_valida, mensaje_edad = validar_edad_minima(nacimiento_fecha)
+        if not edad_valida:
+            st.error(mensaje_edad)
+            st.stop()
+
+        documento_id = documento_id.strip()
+        almacen = get_almacen()
+        encontrado = False
+        try:
+            headers = get_headers()
+            header_map = {col: i+1 for i, col in enumerate(headers)}
+            col_doc = header_map.get("Documento_ID")
+            if not col_doc:
+                st.error("La columna 'Documento_ID' no existe en la hoja. Verifica el encabezado.")
+                st.stop()
+            encontrado = get_diario().contiene(documento_id) or almacen.existe(documento_id)
+        except Exception as e:
+            st.error(f"Error al verificar documento: {str(e)}")
+            st.stop()
+
+        if encontrado:
+            st.error("Este número de documento ya fue registrado.")
+            st.stop()
+
+        # Por cliente y en el caché compartido (otra pestaña u otra réplica no lo saltan); solo
+        # cuenta los envíos que pasaron todas las validaciones
+        if not permitir_envio(30):
+            st.warning("⏳ Debes esperar 30 segundos antes de enviar otro formulario.")
+            st.stop()
+
+        # Posibles duplicados con otro documento (mismo email/WhatsApp, nombre parecido):
+        # no bloquean; se marcan en el registro y se avisan solo al estudio
+        try:
+            posibles = posibles_duplicados({
+                "Documento_ID": documento_id, "Nombre": nombre, "Email": email, "WhatsApp": whatsapp
+            })
+        except Exception:
+            posibles = []
+        posible_duplicado = "; ".join(
+            f"{doc} {nombre_previo} ({int(puntaje * 100)}%: {', '.join(motivos)})"
+            for puntaje, doc, nombre_previo, motivos in posibles
+        )
+
+        try:
+            data = {
+                "Documento_ID": documento_id,
+                "Nombre": nombre,
+                "Tipo_ID": tipo_id,
+                "WhatsApp": whatsapp,
+                "Email": email,
+                "Direccion": direccion,
+                "Barrio": barrio,
+                "Departamento": departamento,
+                "Ciudad": ciudad,
+                "Genero": genero,
+                "Orientacion": orientacion,
+                "Estado_Civil": estado_civil,
+                "Sangre": sangre,
+                "Hijos": hijos,
+                "Num_Hijos": num_hijos if hijos == "Sí" else 0,
+                "Nacimiento_Lugar": nacimiento_lugar,
+                "Nacimiento_Fecha": str(nacimiento_fecha),
+                "Medio": medio,
+                "Medio_Otro": medio_otro if medio == "Otros" else "",
+                "Estudios": estudios,
+                "Ingles": ingles,
+                "Computacion": computacion,
+                "Exp_Laboral": exp_laboral,
+                "Fecha_Pre": str(datetime.datetime.now()),
+                "Estado": "Pre-inscrito",
+                "Posible_Duplicado": posible_duplicado
+            }
+            get_diario().registrar(data)
+            registrar_cambio(documento_id, data)
+        except Exception as e:
+            st.error(f"Error al guardar en base de datos: {str(e)}")
+            st.stop()
+
+        # Generar PDF (en segundo plano; los correos se encolan al terminar)
+        from reportes_pdf import PLANTILLA_PRE
+        futuro_pdf = get_generador_pdf().enviar(PLANTILLA_PRE, {
+            "nombre": nombre,
+            "tipo_id": tipo_id,
+            "documento_id": documento_id,
+            "whatsapp": whatsapp,
+            "email": email,
+            "direccion": direccion,
+            "barrio": barrio,
+            "ciudad": ciudad,
+            "departamento": departamento,
+            "genero": genero,
+            "orientacion": orientacion,
+            "estado_civil": estado_civil,
+            "sangre": sangre,
+            "hijos": hijos,
+            "cantidad_hijos": num_hijos if hijos == "Sí" else "N/A",
+            "nacimiento_lugar": nacimiento_lugar,
+            "nacimiento_fecha": str(nacimiento_fecha),
+            "medio": medio,
+            "medio_otro": medio_otro if medio == "Otros" else "",
+            "estudios": estudios,
+            "ingles": ingles,
+            "computacion": computacion,
+            "exp_laboral": exp_laboral or "No especificado"
+        })
+
+        # Enviar correos
+        enlace_entrevista = "https://tu-app.streamlit.app/?page=Entrevista+Prospecto"  # CAMBIA ESTA URL
+
+        cuerpo_prospecto = f"""
+Gracias por tu pre-inscripción en GlamourCam Studios.
+Tu ID de prospecto es: {documento_id}
+
+Pronto nos pondremos en contacto para agendar tu entrevista presencial.
+PDF adjunto con tus datos.
+
+¡Te esperamos!
+GlamourCam Studios
+"""
+
+        cuerpo_studio = f"""
+Nueva pre-inscripción recibida:
+ID: {documento_id}
+Nombre: {nombre}
+WhatsApp: {whatsapp}
+Email: {email}
+{f"Posible duplicado de: {posible_duplicado}" if posible_duplicado else ""}
+PDF adjunto con todos los datos.
+Formulario de entrevista para este prospecto: {enlace_entrevista}
+"""
+
+        try:
+            send_email_con_pdf(futuro_pdf, email, "Gracias por tu Pre-Inscripción", cuerpo_prospecto, f"Pre_{documento_id}.pdf")
+            send_email_con_pdf(futuro_pdf, studio_email, f"Nueva Pre-Inscripción: {documento_id}", cuerpo_studio, f"Pre_{documento_id}.pdf")
+            st.success("✅ Pre-inscripción enviada correctamente. Revisa tu correo.")
+        except Exception as e:
+            st.warning(f"⚠️ Pre-inscripción guardada, pero hubo problema enviando uno o ambos correos: {str(e)}")
+
+        # Limpieza forzada
+        for key in list(st.session_state.keys()):
+            if key not in ['authenticated', 'cliente_id']:
+                del st.session_state[key]
+        st.rerun()
+
+
+# Campos dinámicos: cada par se vuelve a ejecutar solo, sin el resto del formulario.
+# En una ejecución completa devuelven los valores actuales al formulario.
+@st.fragment
+def _hijos():
+    hijos = st.radio("¿Tienes Hijos?", ["Sí", "No"], horizontal=True)
+    num_hijos = st.number_input(
+        "Cantidad de hijos",
+        min_value=0,
+        step=1,
+        disabled=(hijos == "No"),
+        value=1 if hijos == "Sí" else 0
+    )
+    return hijos, num_hijos
+
+
+@st.fragment
+def _medio():
+    medio = st.radio("Medio por el cual te enteraste de Nosotros", [
+        "Redes Sociales", "Página web", "Anuncios en internet",
+        "Referido o voz a voz", "Otros"
+    ])
+    medio_otro = st.text_input("Especifica (si Otros)", disabled=(medio != "Otros"))
+    return medio, medio_otro
@@ -0,0 +1,53 @@
+import streamlit as st
+
+from arquetipos import codificar, dominantes, puntuar, questions, recalcular
+from paginas.buscador import seleccionar_prospecto
+from servicios import get_almacen, get_headers, registrar_cambio
+
+
+def mostrar():
+    st.title("Test de Arquetipos - Itaca")
+    documento_id = seleccionar_prospecto("Prospecto (opcional para guardar)", key="arquetipos_busqueda")
+    respuestas = []
+
+    with st.form("arquetipos"):
+        for q in questions:
+            st.subheader(f"Pregunta {q['num']}: {q['text']}")
+            ans = st.radio("Selecciona:", list(q["options"].keys()), format_func=lambda k: q["options"][k], key=f"q{q['num']}")
+            respuestas.append(ans)
+
+        if st.form_submit_button("Calcular Arquetipo"):
+            resultado = dominantes(puntuar([respuestas]))[0]
+            st.success(f"Arquetipo dominante: **{resultado}**")
+
+            if documento_id:
+                try:
+                    headers = get_headers()
+                    header_map = {col: i+1 for i, col in enumerate(headers)}
+                    col_doc = header_map.get("Documento_ID")
+                    if not col_doc:
+                        st.error("La columna 'Documento_ID' no existe en la hoja.")
+                        st.stop()
+                    if not get_almacen().existe(documento_id):
+                        st.warning("Documento no encontrado en la base.")
+                    elif "Arquetipo" in header_map:
+                        # Las respuestas crudas permiten re-puntuar si cambia la tabla de mapeo
+                        cambios = {"Arquetipo": resultado, "Respuestas_Arquetipo": codificar(respuestas)}
+                        get_almacen().actualizar(documento_id, cambios)
+                        registrar_cambio(documento_id, cambios)
+                        st.success("Resultado guardado.")
+                except Exception as e:
+                    st.error(f"No se pudo guardar: {e}")
+
+    with st.expander("Recalcular arquetipos guardados"):
+        st.caption("Vuelve a puntuar todas las respuestas almacenadas con la tabla de mapeo actual.")
+        if st.button("Recalcular todos"):
+            try:
+                cambios = recalcular(get_almacen().registros())
+                if cambios:
+                    get_almacen().actualizar_lote(cambios)
+                    for doc, valores in cambios.items():
+                        registrar_cambio(doc, valores)
+                st.success(f"Arquetipos actualizados: {len(cambios)}")
+            except Exception as e:
+                st.error(f"No se pudo recalcular: {e}")
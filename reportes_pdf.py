@@ -0,0 +1,182 @@
+import contextvars
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from fpdf import FPDF
+
+from metricas import REGISTRO, medir
+
+# Cada bloque es una tupla (tipo, *args):
+#   ("fondo", r, g, b)          rectángulo de página completa
+#   ("color", r, g, b)          color del texto
+#   ("fuente", estilo, tamaño)
+#   ("celda", alto, texto[, align])
+#   ("texto", alto, texto)      multi_cell con salto de línea
+#   ("espacio", alto)
+#   ("lista", alto, clave)      una celda por elemento de campos[clave]
+# Los textos de los bloques dinámicos se completan con str.format_map(campos).
+
+
+def _latin1(texto):
+    # Las fuentes estándar de FPDF solo cubren latin-1
+    return str(texto).encode("latin-1", "replace").decode("latin-1")
+
+
+def _dibujar(pdf, bloques, campos=None):
+    for tipo, *args in bloques:
+        if tipo == "fondo":
+            pdf.set_fill_color(*args)
+            pdf.rect(0, 0, pdf.w, pdf.h, "F")
+        elif tipo == "color":
+            pdf.set_text_color(*args)
+        elif tipo == "fuente":
+            pdf.set_font("Helvetica", args[0], args[1])
+        elif tipo == "celda":
+            alto, texto, *align = args
+            texto = texto.format_map(campos) if campos is not None else texto
+            pdf.cell(0, alto, _latin1(texto), new_x="LMARGIN", new_y="NEXT", align=align[0] if align else "L")
+        elif tipo == "texto":
+            alto, texto = args
+            texto = texto.format_map(campos) if campos is not None else texto
+            pdf.multi_cell(0, alto, _latin1(texto), new_x="LMARGIN", new_y="NEXT")
+        elif tipo == "espacio":
+            pdf.ln(args[0])
+        elif tipo == "lista":
+            alto, clave = args
+            for item in campos[clave]:
+                pdf.cell(0, alto, _latin1(item), new_x="LMARGIN", new_y="NEXT")
+        else:
+            raise ValueError(f"Bloque PDF desconocido: {tipo}")
+
+
+class Plantilla:
+    """Documento cuya parte fija se dibuja una sola vez y se copia en cada render."""
+
+    def __init__(self, nombre, estaticos, dinamicos):
+        self.nombre = nombre
+        self.estaticos = estaticos
+        self.dinamicos = dinamicos
+        self._base = None
+        self._lock = threading.Lock()
+
+    def _preparada(self):
+        with self._lock:
+            if self._base is None:
+                pdf = FPDF()
+                pdf.add_page()
+                _dibujar(pdf, self.estaticos)
+                self._base = pdf
+            return copy.deepcopy(self._base)
+
+    def render(self, campos):
+        with medir(f"pdf.{self.nombre}"):
+            pdf = self._preparada()
+            _dibujar(pdf, self.dinamicos, campos)
+            return bytes(pdf.output())
+
+
+PLANTILLA_PRE = Plantilla(
+    "pre_inscripcion",
+    [
+        ("fondo", 131, 197, 190),
+        ("color", 13, 13, 13),
+        ("fuente", "B", 14),
+        ("celda", 12, "DOCUMENTO DE PERFIL DEL PROSPECTO A MODELO", "C"),
+        ("fuente", "", 10),
+        ("texto", 6, "Bienvenido a GlamourCam Studios, somos un estudio que busca mejorar la calidad de vida de nuestros modelos formando y desarrollando personas íntegras, a través de herramientas, servicios y acompañamiento personalizado e integral."),
+        ("espacio", 10),
+        ("fuente", "B", 11),
+        ("celda", 8, "Datos Personales"),
+        ("fuente", "", 10),
+    ],
+    [
+        ("texto", 6, "Nombres y apellidos: {nombre}"),
+        ("texto", 6, "Identificación: {tipo_id} Número: {documento_id}"),
+        ("texto", 6, "WhatsApp/Celular: {whatsapp} E-mail: {email}"),
+        ("texto", 6, "Dirección: {direccion} Barrio: {barrio} Ciudad: {ciudad} Departamento: {departamento}"),
+        ("texto", 6, "Género: {genero} Orientación Sexual: {orientacion}"),
+        ("texto", 6, "Estado Civil: {estado_civil} Tipo de Sangre: {sangre}"),
+        ("texto", 6, "Hijos: {hijos} Cantidad: {cantidad_hijos}"),
+        ("texto", 6, "Lugar de Nacimiento: {nacimiento_lugar} Fecha: {nacimiento_fecha}"),
+        ("texto", 6, "Medio de enterarse: {medio} {medio_otro}"),
+        ("espacio", 5),
+        ("fuente", "B", 11),
+        ("celda", 8, "Formación Académica"),
+        ("fuente", "", 10),
+        ("texto", 6, "Nivel de estudios: {estudios}"),
+        ("texto", 6, "Nivel de Inglés: {ingles}"),
+        ("texto", 6, "Manejo en Computación: {computacion}"),
+        ("espacio", 5),
+        ("fuente", "B", 11),
+        ("celda", 8, "Experiencia Laboral General"),
+        ("fuente", "", 10),
+        ("texto", 6, "{exp_laboral}"),
+    ],
+)
+
+PLANTILLA_EVALUACION = Plantilla(
+    "evaluacion",
+    [
+        ("fuente", "B", 16),
+        ("celda", 10, "Reporte de Evaluación - GlamourCam Studios", "C"),
+        ("espacio", 5),
+        ("fuente", "", 12),
+    ],
+    [
+        ("celda", 8, "Prospecto ID: {documento_id}"),
+        ("celda", 8, "Nombre: {nombre}"),
+        ("celda", 8, "Arquetipo: {arquetipo}"),
+        ("celda", 8, "Score Final: {total_score}% - {clasif}"),
+        ("espacio", 5),
+        ("fuente", "B", 12),
+        ("celda", 8, "Puntuación por Categoría:"),
+        ("fuente", "", 11),
+        ("lista", 6, "categorias"),
+        ("espacio", 5),
+        ("texto", 8, "Comentarios: {comentarios}"),
+    ],
+)
+
+
+class GeneradorPDF:
+    """Renderiza plantillas en un pool de hilos y guarda el resultado por hash de los campos."""
+
+    def __init__(self, hilos=2, max_cache=256):
+        self.max_cache = max_cache
+        self._pool = ThreadPoolExecutor(hilos, thread_name_prefix="pdf")
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def clave(plantilla, campos):
+        datos = json.dumps([plantilla.nombre, campos], sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(datos.encode("utf-8")).hexdigest()
+
+    def enviar(self, plantilla, campos):
+        clave = self.clave(plantilla, campos)
+        with self._lock:
+            futuro = self._cache.get(clave)
+            REGISTRO.cache("pdf", futuro is not None)
+            if futuro is not None:
+                self._cache.move_to_end(clave)
+                return futuro
+            # El contexto copiado conserva la página que pidió el PDF para las métricas
+            futuro = self._pool.submit(contextvars.copy_context().run, plantilla.render, dict(campos))
+            self._cache[clave] = futuro
+            while len(self._cache) > self.max_cache:
+                self._cache.popitem(last=False)
+        futuro.add_done_callback(lambda f: self._descartar_fallido(clave, f))
+        return futuro
+
+    def generar(self, plantilla, campos, timeout=None):
+        return self.enviar(plantilla, campos).result(timeout)
+
+    def _descartar_fallido(self, clave, futuro):
+        if futuro.exception() is not None:
+            with self._lock:
+                if self._cache.get(clave) is futuro:
+                    del self._cache[clave]
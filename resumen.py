@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import Counter
+
+# Histograma de Score_Total en tramos de 10 puntos (el último incluye 100)
+TRAMOS = [f"{i}-{i + 10}" for i in range(0, 100, 10)]
+
+
+def _tramo(score):
+    try:
+        score = float(score)
+    except (TypeError, ValueError):
+        return None
+    if score != score:  # NaN
+        return None
+    return TRAMOS[min(max(int(score // 10), 0), len(TRAMOS) - 1)]
+
+
+def _aprobada(clasificacion):
+    # Misma regla que el filtro "Muy Bueno|Bueno" del dashboard
+    return "Bueno" in str(clasificacion or "")
+
+
+class ResumenProspectos:
+    """Conteos del dashboard mantenidos en cada escritura en vez de recalcularse."""
+
+    def __init__(self, ttl=600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._construido = None
+        self._estado_doc = {}
+        self.por_estado = Counter()
+        self.por_tramo = Counter()
+        self.aprobadas = 0
+
+    def vigente(self):
+        return self._construido is not None and time.monotonic() - self._construido < self.ttl
+
+    def construir(self, registros):
+        with self._lock:
+            self._estado_doc = {}
+            self.por_estado = Counter()
+            self.por_tramo = Counter()
+            self.aprobadas = 0
+            for i, r in enumerate(registros):
+                documento_id = str(r.get("Documento_ID", "")).strip()
+                self._aplicar(documento_id or f"#fila{i + 2}", r)
+            self._construido = time.monotonic()
+
+    def aplicar(self, documento_id, cambios):
+        # Sin construir todavía: el primer dashboard lo cargará completo
+        if self._construido is None:
+            return
+        with self._lock:
+            self._aplicar(str(documento_id).strip(), cambios)
+
+    def _aplicar(self, documento_id, cambios):
+        previo = self._estado_doc.get(documento_id)
+        if previo is None:
+            estado, score, clasif = "", None, ""
+        else:
+            estado, score, clasif = previo
+            self.por_estado[estado] -= 1
+            if not self.por_estado[estado]:
+                del self.por_estado[estado]
+            if _tramo(score):
+                self.por_tramo[_tramo(score)] -= 1
+            self.aprobadas -= _aprobada(clasif)
+        estado = cambios.get("Estado", estado)
+        score = cambios.get("Score_Total", score)
+        clasif = cambios.get("Clasificacion", clasif)
+        self._estado_doc[documento_id] = (estado, score, clasif)
+        self.por_estado[estado] += 1
+        if _tramo(score):
+            self.por_tramo[_tramo(score)] += 1
+        self.aprobadas += _aprobada(clasif)
+
+    def foto(self):
+        with self._lock:
+            return {
+                "total": len(self._estado_doc),
+                "por_estado": dict(self.por_estado),
+                "aprobadas": self.aprobadas,
+                "por_tramo": {t: self.por_tramo.get(t, 0) for t in TRAMOS},
+            }
@@ -0,0 +1,368 @@
+import logging
+import time
+import uuid
+
+import streamlit as st
+
+import metricas
+
+# Los módulos pesados (gspread, pandas, fpdf, smtplib) se importan dentro de
+# cada función para que una página solo cargue lo que realmente usa.
+
+studio_email = "glamourcam.studio@gmail.com"
+
+# ==============================
+# CACHÉ COMPARTIDO
+# ==============================
+# Con varias réplicas: shared_cache = "/datos/cache.db" (SQLite en un volumen común)
+# o "redis://host:6379/0". Sin configurar, cada réplica cachea solo para sí
+@st.cache_resource
+def get_cache():
+    from cache_compartido import crear_cache
+    return crear_cache(st.secrets.get("shared_cache", ""))
+
+def _cache_compartido():
+    cache = get_cache()
+    return cache if cache.compartido else None
+
+# ==============================
+# GOOGLE SHEETS
+# ==============================
+# Hoja compartida por todas las sesiones: cuota por minuto, reintentos con
+# backoff, lecturas idénticas unidas y un pool de conexiones HTTP
+@st.cache_resource
+def get_gsheet():
+    try:
+        import gspread
+        from google.oauth2.service_account import Credentials
+        from cliente_sheets import HojaProtegida, SesionSheets
+        scope = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+        creds_info = st.secrets["gcp_service_account"].to_dict()
+        creds_info["private_key"] = creds_info["private_key"].replace("\\n", "\n")
+        creds = Credentials.from_service_account_info(creds_info, scopes=scope)
+        client = gspread.authorize(creds, session=SesionSheets(creds))
+        client.set_timeout(30)
+        lecturas = int(st.secrets.get("sheets_lecturas_minuto", 60))
+        escrituras = int(st.secrets.get("sheets_escrituras_minuto", 60))
+        hoja = HojaProtegida(
+            client.open("GlamourProspectosDB").sheet1,
+            lecturas_por_minuto=lecturas,
+            escrituras_por_minuto=escrituras
+        )
+        cache = _cache_compartido()
+        if cache is not None:
+            # La cuota es del proyecto: se cuenta entre todas las réplicas
+            from cache_compartido import LimiteCompartido
+            hoja.lecturas = LimiteCompartido(cache, "cuota:lecturas", lecturas)
+            hoja.escrituras = LimiteCompartido(cache, "cuota:escrituras", escrituras)
+        return hoja
+    except Exception as e:
+        st.error(f"Error conectando Google Sheets: {str(e)}")
+        st.stop()
+
+# Motor de persistencia: "sheets" (por defecto) o "sqlite" con espejo opcional a la hoja
+@st.cache_resource
+def get_almacen():
+    try:
+        from almacenamiento import AlmacenSheets, AlmacenSQLite
+        motor = st.secrets.get("storage_backend", "sheets")
+        if motor == "sqlite":
+            espejo = AlmacenSheets(get_gsheet()) if st.secrets.get("sqlite_mirror", False) else None
+            return AlmacenSQLite(st.secrets.get("sqlite_path", "glamour.db"), espejo=espejo)
+        hoja = get_gsheet()
+        archivo = None
+        if st.secrets.get("archive_sheets", False):
+            # Prospectos finalizados movidos por archivo.py a hojas "Archivo <periodo>"
+            from archivo import ArchivoHojas
+            archivo = ArchivoHojas(hoja.spreadsheet, envolver=hoja.hermana)
+        return AlmacenSheets(hoja, archivo=archivo, cache=_cache_compartido())
+    except Exception as e:
+        st.error(f"Error conectando base de datos: {str(e)}")
+        st.stop()
+
+# Las pre-inscripciones se confirman en un diario local y se vuelcan en lotes
+@st.cache_resource
+def get_diario():
+    from diario import DiarioInscripciones
+    bandeja = get_bandeja()
+    def al_fallar(data, error):
+        # La hoja rechazó el registro: el estudio recibe los datos para cargarlos a mano
+        datos = "\n".join(f"{col}: {valor}" for col, valor in data.items())
+        bandeja.encolar(
+            studio_email, f"Pre-Inscripción NO guardada: {data.get('Documento_ID', '')}",
+            f"La base de datos rechazó esta pre-inscripción ({error}).\n"
+            f"A la persona ya se le confirmó el envío; hay que cargarla a mano.\n\n{datos}\n"
+        )
+    return DiarioInscripciones(
+        st.secrets.get("journal_path", "diario.db"),
+        get_almacen(),
+        tam_lote=int(st.secrets.get("journal_batch", 50)),
+        intervalo=float(st.secrets.get("journal_interval", 5)),
+        al_fallar=al_fallar
+    )
+
+@metricas.con_cache("get_headers")
+@st.cache_data(ttl=300)
+def get_headers():
+    metricas.calculado()
+    return get_almacen().encabezados()
+
+# Con Google Sheets solo se descargan filas nuevas y filas cuyo estado cambió
+@st.cache_resource
+def get_sincronizacion():
+    from sincronizacion import SincronizacionIncremental
+    return SincronizacionIncremental(get_almacen(), cache=_cache_compartido())
+
+def _sincronizacion():
+    # sincronizacion importa gspread; con SQLite no hace falta cargarlo
+    almacen = get_almacen()
+    if hasattr(almacen, "hoja"):
+        from sincronizacion import es_incremental
+        if es_incremental(almacen):
+            return get_sincronizacion()
+    return None
+
+# Los cambios de esta réplica llegan a la copia local por get_feed(); la hoja solo se
+# consulta (el delta) cuando la copia tiene más de 60 s, para ver los de otras réplicas
+def get_dataframe():
+    import pandas as pd
+    try:
+        sinc = _sincronizacion()
+        if sinc is None:
+            return _dataframe_local(get_feed().version)
+        get_feed()
+        metricas.REGISTRO.cache("get_dataframe", sinc.edad() < 60)
+        return sinc.dataframe(max_edad=60)
+    except:
+        return pd.DataFrame()
+
+# Motores locales: se reconstruye cuando esta réplica escribió o cada 60 s
+@metricas.con_cache("get_dataframe")
+@st.cache_data(ttl=60, max_entries=1)
+def _dataframe_local(version):
+    import pandas as pd
+    metricas.calculado()
+    return pd.DataFrame(get_almacen().registros())
+
+def version_datos():
+    # Cambia cuando cambia lo que devuelve get_dataframe()
+    sinc = _sincronizacion()
+    return sinc.version if sinc is not None else get_feed().version
+
+# Tabla del dashboard: columnas tipadas e índices de orden listos para paginar.
+# Se reconstruye solo cuando cambió la versión de los datos
+def get_tabla_prospectos():
+    df = get_dataframe()
+    return _tabla_prospectos(version_datos(), df)
+
+@metricas.con_cache("get_tabla_prospectos")
+@st.cache_resource(max_entries=1)
+def _tabla_prospectos(version, _df):
+    from tabla_prospectos import TablaProspectos
+    metricas.calculado()
+    return TablaProspectos(_df)
+
+# Rúbrica de evaluación; pesos y umbrales se pueden ajustar en st.secrets["rubrica"]
+@st.cache_resource
+def get_rubrica():
+    from evaluacion import Rubrica
+    return Rubrica.desde_config(st.secrets.get("rubrica"))
+
+# Conteos del dashboard que cada escritura actualiza al momento
+@st.cache_resource
+def get_resumen():
+    from resumen import ResumenProspectos
+    return ResumenProspectos()
+
+# Embudo de reclutamiento con acumulados diarios por Medio y Ciudad
+@st.cache_resource
+def get_embudo():
+    from analitica import EmbudoProspectos
+    return EmbudoProspectos()
+
+# Todas las escrituras publican aquí el Documento_ID y los campos que cambiaron;
+# el resumen y la copia local de la hoja se actualizan solo en esas filas
+@st.cache_resource
+def get_feed():
+    from cambios import FeedCambios
+    feed = FeedCambios()
+    feed.suscribir(get_resumen().aplicar)
+    feed.suscribir(get_embudo().aplicar)
+    feed.suscribir(get_indice_duplicados().aplicar)
+    feed.suscribir(get_indice_busqueda().aplicar)
+    sinc = _sincronizacion()
+    if sinc is not None:
+        feed.suscribir(sinc.aplicar)
+    return feed
+
+def registrar_cambio(documento_id, cambios):
+    get_feed().publicar(documento_id, cambios)
+
+# Claves de bloqueo sobre Email, WhatsApp, Nombre y Documento_ID para detectar
+# re-inscripciones con otro documento; se reconstruye con un batch_get cada 10 min
+@st.cache_resource
+def get_indice_duplicados():
+    from duplicados import IndiceDuplicados
+    return IndiceDuplicados()
+
+def posibles_duplicados(data):
+    from duplicados import COLUMNAS_INDICE
+    indice = get_indice_duplicados()
+    if not indice.vigente():
+        with metricas.medir("duplicados.indice"):
+            indice.construir(get_almacen().columnas(COLUMNAS_INDICE))
+    return indice.buscar(data)
+
+# Búsqueda de prospectos por nombre, WhatsApp, email o documento para los entrevistadores;
+# cada consulta es local, la hoja solo se lee al (re)construir el índice
+@st.cache_resource
+def get_indice_busqueda():
+    from busqueda import IndiceBusqueda
+    return IndiceBusqueda()
+
+def buscar_prospectos(texto, maximo=10):
+    from busqueda import COLUMNAS_BUSQUEDA
+    indice = get_indice_busqueda()
+    if not indice.vigente():
+        with metricas.medir("busqueda.indice"):
+            indice.construir(get_almacen().columnas(COLUMNAS_BUSQUEDA))
+    return indice.buscar(texto, maximo)
+
+# ==============================
+# PROSPECTO DE LA SESIÓN
+# ==============================
+# Entrevista y Evaluación leen el prospecto una vez por sesión (fila y valores);
+# escribir notas o mover sliders no vuelve a consultar la hoja hasta "Guardar"
+def leer_prospecto(documento_id):
+    prospectos = st.session_state.setdefault("prospectos", {})
+    entrada = prospectos.get(documento_id)
+    feed = get_feed()
+    if entrada is not None:
+        # Lo que otras sesiones guardaron después de leerlo llega por el feed
+        cambios = feed.desde(entrada["version"])
+        if cambios is None:
+            entrada = None
+        else:
+            for _, doc, campos, _ in cambios:
+                if doc == documento_id:
+                    entrada["datos"].update(campos)
+            entrada["version"] = feed.version
+    metricas.REGISTRO.cache("prospecto_sesion", entrada is not None)
+    if entrada is None:
+        version = feed.version
+        fila, data = get_almacen().leer_con_fila(documento_id)
+        if data is None:
+            return None
+        entrada = prospectos[documento_id] = {"fila": fila, "datos": data, "version": version}
+    return entrada["datos"]
+
+def guardar_prospecto(documento_id, cambios):
+    encontrado = get_almacen().actualizar(documento_id, cambios)
+    registrar_cambio(documento_id, cambios)
+    return encontrado
+
+# ==============================
+# LÍMITES POR CLIENTE
+# ==============================
+# Bloqueo de login y espera entre envíos en el caché compartido: recargar la página
+# y caer en otra réplica no los reinicia
+def cliente_id():
+    # IP del cliente; sin ella, la sesión. Detrás de `trusted_proxies` proxies propios es la
+    # que agregó el más externo a X-Forwarded-For (la N-ésima desde la derecha): las de
+    # más a la izquierda las escribe el cliente y se pueden falsificar
+    try:
+        ip = st.context.ip_address
+        proxies = int(st.secrets.get("trusted_proxies", 0))
+        if proxies > 0:
+            reenviado = (st.context.headers or {}).get("X-Forwarded-For", "")
+            saltos = [s.strip() for s in reenviado.split(",") if s.strip()]
+            if len(saltos) >= proxies:
+                ip = saltos[-proxies]
+    except Exception:
+        ip = None
+    if isinstance(ip, str) and ip:
+        return ip
+    return st.session_state.setdefault("cliente_id", uuid.uuid4().hex)
+
+def bloqueo_login():
+    # Segundos que le quedan al bloqueo de este cliente (0 si no está bloqueado)
+    hasta = get_cache().obtener(f"login_bloqueo:{cliente_id()}")
+    return max(0.0, hasta - time.time()) if hasta else 0.0
+
+def login_fallido(max_intentos=5, minutos=5):
+    # Intentos restantes; al agotarlos el cliente queda bloqueado `minutos`
+    cache = get_cache()
+    cliente = cliente_id()
+    intentos = cache.incrementar(f"login_intentos:{cliente}", minutos * 60)
+    if intentos < max_intentos:
+        return max_intentos - intentos
+    cache.guardar(f"login_bloqueo:{cliente}", time.time() + minutos * 60, minutos * 60)
+    cache.borrar(f"login_intentos:{cliente}")
+    return 0
+
+def login_exitoso():
+    get_cache().borrar(f"login_intentos:{cliente_id()}")
+
+def permitir_envio(segundos=30, maximo=1):
+    # Hasta `maximo` envíos por cliente en cada ventana de `segundos`; con un NAT compartido
+    # se puede subir `maximo` sin dejar de frenar a quien inunda el formulario
+    return get_cache().incrementar(f"envio:{cliente_id()}", segundos) <= maximo
+
+# ==============================
+# EMAIL
+# ==============================
+# Bandeja persistente: los envíos se encolan y un hilo los despacha con una
+# conexión SMTP reutilizada y reintentos con backoff
+@st.cache_resource
+def get_bandeja():
+    from correo import BandejaSalida
+    return BandejaSalida(
+        st.secrets.get("outbox_path", "outbox.db"),
+        st.secrets["gmail_user"],
+        st.secrets["gmail_pass"],
+        host=st.secrets.get("smtp_host", "smtp.gmail.com"),
+        puerto=int(st.secrets.get("smtp_port", 587)),
+        starttls=bool(st.secrets.get("smtp_starttls", True))
+    )
+
+def send_email(to, subject, body, attachment_bytes=None, filename="documento.pdf"):
+    try:
+        with metricas.medir("correo.encolar"):
+            get_bandeja().encolar(to, subject, body, attachment_bytes, filename)
+        return True
+    except Exception as e:
+        st.warning(f"No se pudo enviar correo: {str(e)}")
+        return False
+
+def send_email_con_pdf(futuro_pdf, to, subject, body, filename):
+    # Se encola cuando el PDF termina de generarse; si falla, se envía sin adjunto
+    bandeja = get_bandeja()
+    def encolar(futuro):
+        try:
+            pdf_bytes = futuro.result()
+        except Exception:
+            logging.exception("No se pudo generar %s", filename)
+            pdf_bytes = None
+        bandeja.encolar(to, subject, body, pdf_bytes, filename)
+    futuro_pdf.add_done_callback(encolar)
+
+# ==============================
+# PDF
+# ==============================
+# Plantillas con la parte fija preparada, render en pool y caché por hash de campos
+@st.cache_resource
+def get_generador_pdf():
+    from reportes_pdf import GeneradorPDF
+    return GeneradorPDF()
+
+# ==============================
+# MÉTRICAS
+# ==============================
+# Con st.secrets["metrics_path"] (p.ej. el directorio del textfile collector de
+# node_exporter) las métricas se vuelcan en formato Prometheus cada minuto
+@st.cache_resource
+def get_exportador_metricas():
+    ruta = st.secrets.get("metrics_path")
+    if not ruta:
+        return None
+    return metricas.ExportadorArchivo(ruta, intervalo=float(st.secrets.get("metrics_interval", 60)))
@@ -0,0 +1,263 @@
+import threading
+import time
+
+import pandas as pd
+from gspread.utils import numericise_all, rowcol_to_a1
+
+# Columnas que cambian cuando un prospecto avanza de etapa. Si alguna difiere
+# de la copia local, la fila completa se vuelve a leer.
+COLUMNAS_MARCA = ["Documento_ID", "Estado", "Arquetipo", "Fecha_Entrevista", "Fecha_Eval"]
+
+# Prospectos publicados por esta réplica que aún no aparecen en la hoja (p.ej. en el
+# diario de inscripciones); pasado este tiempo se descartan y manda la hoja
+VIDA_NUEVOS = 600
+
+# Copia de la hoja en el caché compartido: la relee una sola réplica y las demás la adoptan
+CLAVE_COPIA = "copia_hoja"
+VIDA_COPIA = 3600
+
+
+class SincronizacionIncremental:
+    """Copia local de la hoja que se actualiza solo con las filas nuevas o cambiadas.
+
+    Con `cache` (cache_compartido) la réplica que sincroniza publica su copia y las
+    demás solo aplican las filas que difieren, sin consultar la hoja.
+    """
+
+    def __init__(self, almacen, columnas_marca=COLUMNAS_MARCA, max_cambios=0.25, cache=None):
+        self.almacen = almacen
+        self.cache = cache
+        self._instante_compartido = None
+        self.columnas_marca = columnas_marca
+        self.max_cambios = max_cambios
+        self._headers = None
+        self._filas = []
+        self._df = pd.DataFrame()
+        self._posiciones = None
+        self._sucias = set()
+        # Posiciones de filas en blanco: se guardan para que _filas siga alineada con la
+        # hoja y se omiten al devolver el DataFrame
+        self._vacias = set()
+        self._nuevos = {}
+        self._sincronizado = 0.0
+        # Cambia cada vez que cambia el contenido devuelto por dataframe()
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def dataframe(self, max_edad=0):
+        # Con max_edad > 0 la hoja solo se consulta si la última sincronización es más vieja;
+        # mientras tanto los cambios de esta réplica llegan por aplicar()
+        with self._lock:
+            if self._headers is None or self.edad() >= max_edad:
+                if self.cache is None or not self._desde_compartida(max_edad):
+                    self._leer_hoja()
+            if self._sucias:
+                self._reemplazar(sorted(self._sucias))
+                self._sucias.clear()
+            return self._con_nuevos()
+
+    def edad(self):
+        return time.monotonic() - self._sincronizado
+
+    def invalidar(self):
+        with self._lock:
+            self._headers = None
+
+    def aplicar(self, documento_id, cambios):
+        """Refleja en la copia local un cambio hecho por esta réplica, sin leer la hoja."""
+        with self._lock:
+            if self._headers is None:
+                return
+            self.version += 1
+            pos = self._posicion(documento_id)
+            if pos is None:
+                data = dict(self._nuevos.get(documento_id, ({}, 0))[0], **cambios)
+                data["Documento_ID"] = documento_id
+                self._nuevos[documento_id] = (data, time.monotonic())
+                return
+            fila = self._filas[pos]
+            fila += [""] * (len(self._headers) - len(fila))
+            for col, valor in cambios.items():
+                if col in self._headers:
+                    # Como lo devolvería la hoja; así la próxima comparación de marcas coincide
+                    fila[self._headers.index(col)] = str(valor)
+            self._sucias.add(pos)
+
+    # ------------------------------------------------------------------
+    def _leer_hoja(self):
+        headers = self.almacen.encabezados()
+        if headers != self._headers:
+            self._carga_completa()
+        else:
+            self._sincronizar()
+        self._sincronizado = time.monotonic()
+        if self.cache is not None:
+            self._instante_compartido = time.time()
+            self.cache.guardar(CLAVE_COPIA, {
+                "headers": self._headers, "filas": self._filas, "instante": self._instante_compartido
+            }, VIDA_COPIA)
+
+    def _desde_compartida(self, max_edad):
+        # True si la copia quedó al día sin que esta réplica tuviera que leer la hoja
+        copia = self.cache.obtener(CLAVE_COPIA)
+        if copia is not None and copia["instante"] != self._instante_compartido:
+            self._adoptar(copia)
+        if copia is not None and time.time() - copia["instante"] < max_edad:
+            self._sincronizado = time.monotonic() - (time.time() - copia["instante"])
+            return True
+        # Vieja o ausente: una sola réplica relee la hoja (solo el delta desde la copia adoptada)
+        candado = CLAVE_COPIA + ":leyendo"
+        if self.cache.adquirir(candado, 60):
+            try:
+                self._leer_hoja()
+            finally:
+                self.cache.liberar(candado)
+            return True
+        # Otra réplica la está leyendo: mientras tanto sirve la copia que ya hay
+        return self._headers is not None
+
+    def _adoptar(self, copia):
+        headers, filas = copia["headers"], copia["filas"]
+        self._instante_compartido = copia["instante"]
+        n = len(self._filas)
+        cambiadas = []
+        if headers == self._headers and len(filas) >= n:
+            cambiadas = [i for i in range(n) if filas[i] != self._filas[i]]
+        if headers != self._headers or len(filas) < n or (n and len(cambiadas) > self.max_cambios * n):
+            self._headers = headers
+            self._filas = [list(f) for f in filas]
+            self._posiciones = None
+            self._sucias.clear()
+            self.version += 1
+            self._construir()
+            return
+        for i in cambiadas:
+            self._filas[i] = list(filas[i])
+        self._sucias.update(cambiadas)
+        if cambiadas:
+            self._posiciones = None
+            self.version += 1
+        self._agregar_filas([list(f) for f in filas[n:]])
+
+    def _agregar_filas(self, nuevas):
+        if not nuevas:
+            return
+        self._posiciones = None
+        self.version += 1
+        n = len(self._filas)
+        self._filas.extend(nuevas)
+        self._vacias.update(n + i for i, f in enumerate(nuevas) if _vacia(f))
+        extra = pd.DataFrame([self._registro(f) for f in nuevas], columns=self._headers)
+        self._df = pd.concat([self._df, extra], ignore_index=True) if len(self._df) else extra
+
+    def _registro(self, valores):
+        valores = list(valores) + [""] * (len(self._headers) - len(valores))
+        return numericise_all(valores[:len(self._headers)])
+
+    def _construir(self):
+        self._vacias = {i for i, f in enumerate(self._filas) if _vacia(f)}
+        self._df = pd.DataFrame(
+            [self._registro(f) for f in self._filas], columns=self._headers
+        ) if self._filas else pd.DataFrame(columns=self._headers)
+
+    def _posicion(self, documento_id):
+        if self._posiciones is None:
+            col = self._headers.index("Documento_ID") if "Documento_ID" in self._headers else None
+            self._posiciones = {}
+            if col is not None:
+                for i, f in enumerate(self._filas):
+                    if col < len(f) and str(f[col]).strip():
+                        self._posiciones.setdefault(str(f[col]).strip(), i)
+        return self._posiciones.get(str(documento_id).strip())
+
+    def _reemplazar(self, orden):
+        for i in orden:
+            (self._vacias.add if _vacia(self._filas[i]) else self._vacias.discard)(i)
+        nuevos = [self._registro(self._filas[i]) for i in orden]
+        # object para admitir valores de otro tipo en la columna; luego se re-infiere
+        df = self._df.astype(object)
+        df.iloc[orden] = nuevos
+        self._df = df.infer_objects()
+
+    def _con_nuevos(self):
+        df = self._df.drop(index=sorted(self._vacias)).reset_index(drop=True) if self._vacias else self._df
+        if not self._nuevos:
+            return df.copy()
+        limite = time.monotonic() - VIDA_NUEVOS
+        for doc, (_, creado) in list(self._nuevos.items()):
+            if self._posicion(doc) is not None or creado < limite:
+                del self._nuevos[doc]
+        if not self._nuevos:
+            return df.copy()
+        extra = pd.DataFrame(
+            [self._registro([d.get(c, "") for c in self._headers]) for d, _ in self._nuevos.values()],
+            columns=self._headers
+        )
+        return pd.concat([df, extra], ignore_index=True) if len(df) else extra
+
+    def _carga_completa(self):
+        valores = self.almacen.hoja.get_all_values()
+        self._headers = valores[0] if valores else []
+        self._filas = [list(f) for f in valores[1:]]
+        self._posiciones = None
+        self._sucias.clear()
+        self.version += 1
+        self._construir()
+
+    def _sincronizar(self):
+        n = len(self._filas)
+        ultima_col = len(self._headers)
+        marcas = [c for c in self.columnas_marca if c in self._headers]
+        rangos = []
+        for col in marcas:
+            letra = rowcol_to_a1(1, self._headers.index(col) + 1).rstrip("0123456789")
+            rangos.append(f"{letra}2:{letra}{n + 1}")
+        # Filas nuevas a partir de la última conocida, en la misma llamada
+        rangos.append(f"A{n + 2}:{rowcol_to_a1(1, ultima_col).rstrip('0123456789')}")
+        respuesta = self.almacen.hoja.batch_get(rangos)
+
+        if "Documento_ID" in marcas:
+            # La API recorta los vacíos del final, así que la columna llega hasta el último
+            # documento; si llega más corta que la copia es que se borraron filas (p.ej. el
+            # archivo de finalizados) y las posiciones ya no coinciden: recargar todo
+            pos = self._headers.index("Documento_ID")
+            ultimo = next((i + 1 for i in range(n - 1, -1, -1)
+                           if pos < len(self._filas[i]) and str(self._filas[i][pos]).strip()), 0)
+            if len(respuesta[marcas.index("Documento_ID")]) < ultimo:
+                self._carga_completa()
+                return
+
+        cambiadas = set()
+        for col, rango in zip(marcas, respuesta[:-1]):
+            pos = self._headers.index(col)
+            actuales = [r[0] if r else "" for r in rango]
+            actuales += [""] * (n - len(actuales))
+            for i, valor in enumerate(actuales[:n]):
+                local = self._filas[i][pos] if pos < len(self._filas[i]) else ""
+                if valor != local:
+                    cambiadas.add(i)
+
+        if n and len(cambiadas) > self.max_cambios * n:
+            # Demasiados cambios (p.ej. filas borradas o reordenadas): recargar todo
+            self._carga_completa()
+            return
+
+        if cambiadas:
+            orden = sorted(cambiadas)
+            filas = self.almacen.hoja.batch_get([f"{i + 2}:{i + 2}" for i in orden])
+            for i, rango in zip(orden, filas):
+                self._filas[i] = list(rango[0]) if rango else []
+            self._sucias.update(orden)
+            self._posiciones = None
+            self.version += 1
+
+        # Tal cual, con las filas en blanco intermedias: las posiciones deben seguir las de la hoja
+        self._agregar_filas([list(f) for f in respuesta[-1]])
+
+
+def _vacia(fila):
+    return not any(str(v).strip() for v in fila)
+
+
+def es_incremental(almacen):
+    return hasattr(getattr(almacen, "hoja", None), "batch_get")
@@ -0,0 +1,76 @@
+import math
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+COLUMNAS_TABLA = ["Documento_ID", "Nombre", "Estado", "Arquetipo", "Score_Total", "Clasificacion", "Ciudad", "Fecha_Pre"]
+COLUMNAS_BUSQUEDA = ["Documento_ID", "Nombre", "Email", "WhatsApp", "Ciudad"]
+NUMERICAS = ["Score_Total"]
+
+
+def normalizar(texto):
+    # Minúsculas y sin tildes: "gómez" y "Gomez" coinciden
+    texto = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode()
+    return texto.lower()
+
+
+class TablaProspectos:
+    """Vista de solo lectura de los prospectos para la tabla paginada del dashboard.
+
+    Las columnas se tipan una vez y el orden por cada columna se precalcula, así
+    que una consulta (filtro + búsqueda + orden + página) solo combina máscaras
+    e índices y devuelve las filas de la página pedida.
+    """
+
+    def __init__(self, df, columnas=COLUMNAS_TABLA, busqueda=COLUMNAS_BUSQUEDA):
+        self.columnas = [c for c in columnas if c in df.columns]
+        tabla = df[self.columnas].reset_index(drop=True)
+        for col in self.columnas:
+            if col in NUMERICAS:
+                tabla[col] = pd.to_numeric(tabla[col], errors="coerce")
+            else:
+                tabla[col] = tabla[col].fillna("").astype(str)
+        self.df = tabla
+        self.total = len(tabla)
+
+        cols_busqueda = [c for c in busqueda if c in df.columns]
+        if cols_busqueda:
+            unido = df[cols_busqueda].fillna("").astype(str).agg(" ".join, axis=1)
+            self._texto = pd.Series([normalizar(t) for t in unido], dtype=object)
+        else:
+            self._texto = pd.Series([""] * self.total, dtype=object)
+        self._estado = tabla["Estado"].to_numpy() if "Estado" in tabla.columns else None
+
+        # Por columna: permutación ascendente estable con los vacíos al final y cuántos no lo son
+        self._orden = {}
+        for col in self.columnas:
+            if col in NUMERICAS:
+                valores = tabla[col].to_numpy(dtype=float)
+                vacios = np.isnan(valores)
+            else:
+                valores = np.array([normalizar(v) for v in tabla[col]], dtype=object)
+                vacios = valores == ""
+            llenos = np.flatnonzero(~vacios)
+            llenos = llenos[np.argsort(valores[llenos], kind="stable")]
+            self._orden[col] = (np.concatenate([llenos, np.flatnonzero(vacios)]), len(llenos))
+
+    def consultar(self, estados=None, texto="", orden="Score_Total", descendente=True, pagina=1, por_pagina=50):
+        """Devuelve (DataFrame de la página, filas que cumplen el filtro, páginas)."""
+        mascara = np.ones(self.total, dtype=bool)
+        if estados is not None and self._estado is not None:
+            mascara &= np.isin(self._estado, list(estados))
+        texto = normalizar(texto).strip()
+        if texto:
+            mascara &= self._texto.str.contains(texto, regex=False).to_numpy()
+
+        permutacion, llenos = self._orden.get(orden) or (np.arange(self.total), self.total)
+        if descendente:
+            permutacion = np.concatenate([permutacion[:llenos][::-1], permutacion[llenos:]])
+        seleccion = permutacion[mascara[permutacion]]
+
+        filas = len(seleccion)
+        paginas = max(1, math.ceil(filas / por_pagina))
+        pagina = min(max(1, pagina), paginas)
+        inicio = (pagina - 1) * por_pagina
+        return self.df.iloc[seleccion[inicio:inicio + por_pagina]], filas, paginas
@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "bench"))
+
+
+@pytest.fixture(autouse=True)
+def _sin_recursos_compartidos():
+    # st.cache_resource vive en el proceso: cada AppTest arranca con su almacén, diario y caché
+    import streamlit as st
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    yield
+    st.cache_resource.clear()
+    st.cache_data.clear()
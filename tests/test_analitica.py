@@ -0,0 +1,62 @@
+import datetime
+
+from analitica import EmbudoProspectos
+
+
+def _registros():
+    return [
+        {"Documento_ID": "1", "Estado": "Evaluado", "Medio": "Instagram", "Ciudad": "Cali",
+         "Fecha_Pre": "2026-05-04 10:00:00", "Fecha_Entrevista": "2026-05-05 10:00:00",
+         "Fecha_Eval": "2026-05-06 10:00:00"},
+        {"Documento_ID": "2", "Estado": "Pre-Inscrito", "Medio": "Instagram", "Ciudad": "Cali",
+         "Fecha_Pre": "2026-05-04 12:00:00"},
+        {"Documento_ID": "3", "Estado": "Pre-Inscrito", "Medio": "Referido", "Ciudad": "Bogotá",
+         "Fecha_Pre": "2026-05-20 09:00:00"},
+    ]
+
+
+def _construido(registros):
+    embudo = EmbudoProspectos()
+    embudo.construir(registros)
+    return embudo
+
+
+def test_conversiones_por_medio():
+    df = _construido(_registros()).embudo(por="Medio")
+    instagram = df[df["Medio"] == "Instagram"].iloc[0]
+    assert df["Medio"].tolist() == ["Instagram", "Referido"]
+    assert (instagram["Prospectos"], instagram["Entrevistados"], instagram["Evaluados"]) == (2, 1, 1)
+    assert instagram["% Entrevista"] == 50.0
+    assert instagram["% Evaluación"] == 100.0
+
+
+def test_rango_de_fechas_filtra_por_pre_inscripcion():
+    embudo = _construido(_registros())
+    df = embudo.embudo(desde=datetime.date(2026, 5, 1), hasta=datetime.date(2026, 5, 10))
+    assert df["Prospectos"].tolist() == [2]
+    df = embudo.embudo(desde=datetime.date(2026, 5, 15), por="Ciudad")
+    assert df["Ciudad"].tolist() == ["Bogotá"]
+
+
+def test_aplicar_equivale_a_reconstruir():
+    embudo = _construido(_registros())
+    cambios = {"Estado": "Entrevistado", "Fecha_Entrevista": "2026-05-07 12:00:00"}
+    embudo.aplicar("2", cambios)
+    embudo.aplicar("4", {"Documento_ID": "4", "Medio": "Referido", "Ciudad": "Cali",
+                         "Fecha_Pre": "2026-05-21 08:00:00"})
+    registros = _registros()
+    registros[1].update(cambios)
+    registros.append({"Documento_ID": "4", "Medio": "Referido", "Ciudad": "Cali", "Fecha_Pre": "2026-05-21 08:00:00"})
+    reconstruido = _construido(registros)
+    for por in (None, "Medio", "Ciudad", "Semana"):
+        assert embudo.embudo(por=por).equals(reconstruido.embudo(por=por))
+    desde = datetime.date(2026, 5, 1)
+    assert embudo.embudo(desde=desde, por="Medio").equals(reconstruido.embudo(desde=desde, por="Medio"))
+
+
+def test_un_resultado_no_cambia_con_escrituras_posteriores():
+    embudo = _construido(_registros())
+    antes = embudo.embudo(por="Medio")
+    embudo.aplicar("2", {"Estado": "Entrevistado", "Fecha_Entrevista": "2026-05-07 12:00:00"})
+    assert antes["Entrevistados"].tolist() == [1, 0]
+    assert embudo.embudo(por="Medio")["Entrevistados"].tolist() == [2, 0]
@@ -0,0 +1,25 @@
+from falsos import HojaFalsa, LibroFalso, generar_prospectos
+
+from almacenamiento import COLUMNAS, AlmacenSheets
+from cliente_sheets import HojaProtegida
+
+
+class LimiteContado:
+    def __init__(self):
+        self.tomados = 0
+
+    def tomar(self):
+        self.tomados += 1
+        return 0.0
+
+
+def test_borrar_filas_pasa_por_la_cuota_de_escritura():
+    activa = HojaFalsa([list(COLUMNAS)] + generar_prospectos(20))
+    LibroFalso(activa)
+    hoja = HojaProtegida(activa)
+    hoja.escrituras = LimiteContado()
+    quedan = [f[0] for i, f in enumerate(activa.filas) if i + 1 not in (3, 4, 9)]
+    AlmacenSheets(hoja).eliminar_filas([3, 4, 9])
+    assert [f[0] for f in activa.filas] == quedan
+    assert hoja.escrituras.tomados == 1
+    assert activa.conteo()["spreadsheet_batch_update"] == 1
@@ -0,0 +1,43 @@
+import random
+from collections import Counter
+
+from arquetipos import CODIGOS, archetypes, codificar, decodificar, dominantes, mappings, puntuar, recalcular
+
+
+def _contar(respuestas):
+    # Puntaje pregunta por pregunta, como se contaba antes del motor vectorizado
+    conteo = Counter(mappings[q][r] for q, r in enumerate(respuestas) if r in "abcd")
+    return [conteo[c] for c in CODIGOS]
+
+
+def test_puntuar_coincide_con_el_conteo_por_pregunta():
+    rnd = random.Random(1)
+    tests = [[rnd.choice("abcd-") for _ in mappings] for _ in range(200)]
+    assert puntuar(tests).tolist() == [_contar(t) for t in tests]
+    # Índices de opción igual que letras
+    assert puntuar([[0] * len(mappings)]).tolist() == puntuar([["a"] * len(mappings)]).tolist()
+
+
+def test_dominantes_une_los_empates():
+    assert dominantes([[5, 5, 2, 8], [6, 6, 4, 4]]) == [
+        archetypes["M"], f"{archetypes['G']}, {archetypes['A']}"
+    ]
+
+
+def test_codificar_y_decodificar():
+    respuestas = ["a", "d", None] + ["b"] * (len(mappings) - 3)
+    texto = codificar(respuestas)
+    assert texto.startswith("ad-")
+    assert decodificar(texto)[:3] == [0, 3, -1]
+    assert decodificar("abc") is None
+
+
+def test_recalcular_devuelve_solo_los_que_cambian():
+    todas_a = "a" * len(mappings)
+    actual = dominantes(puntuar([list(todas_a)]))[0]
+    registros = [
+        {"Documento_ID": "1", "Respuestas_Arquetipo": todas_a, "Arquetipo": actual},
+        {"Documento_ID": "2", "Respuestas_Arquetipo": todas_a, "Arquetipo": "El Guerrero"},
+        {"Documento_ID": "3", "Respuestas_Arquetipo": "", "Arquetipo": "El Mago"},
+    ]
+    assert recalcular(registros) == {"2": {"Arquetipo": actual}}
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+from falsos import generar_prospectos, registros
+
+from almacenamiento import COLUMNAS, AlmacenSQLite
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def entrevista(tmp_path):
+    from streamlit.testing.v1 import AppTest
+    db = str(tmp_path / "glamour.db")
+    filas = generar_prospectos(50)
+    AlmacenSQLite(db).agregar_lote(registros(filas))
+    at = AppTest.from_file(os.path.join(RAIZ, "inscripcion.py"), default_timeout=120)
+    at.secrets.update({
+        "admin_password": "x", "gmail_user": "a@b.c", "gmail_pass": "x",
+        "storage_backend": "sqlite", "sqlite_path": db,
+        "journal_path": str(tmp_path / "diario.db"), "outbox_path": str(tmp_path / "outbox.db"),
+    })
+    at.session_state["authenticated"] = True
+    at.run()
+    at.sidebar.selectbox[0].select("Entrevista Prospecto").run()
+    return at, filas
+
+
+def _buscar(at, texto):
+    next(w for w in at.text_input if w.label == "Buscar prospecto para entrevista").input(texto).run()
+    assert not at.exception
+
+
+def _guardar(at):
+    return [b for b in at.button if b.label == "Guardar Entrevista"]
+
+
+def test_una_busqueda_parcial_no_elige_prospecto(entrevista):
+    at, filas = entrevista
+    nombre = filas[0][COLUMNAS.index("Nombre")].split()[0]
+    _buscar(at, nombre)
+    coincidencias = next(w for w in at.selectbox if w.label.startswith("Coincidencias"))
+    assert coincidencias.value is None
+    assert not _guardar(at)
+
+    coincidencias.select(filas[0][0]).run()
+    assert _guardar(at)
+    assert any(filas[0][COLUMNAS.index("Nombre")] in str(m.value) for m in at.markdown)
+
+
+def test_texto_sin_coincidencias_no_se_usa_como_documento(entrevista):
+    at, _ = entrevista
+    _buscar(at, "zzzz")
+    assert not [w for w in at.selectbox if w.label.startswith("Coincidencias")]
+    assert not _guardar(at)
+    assert not at.error
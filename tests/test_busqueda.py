@@ -0,0 +1,59 @@
+from busqueda import IndiceBusqueda
+
+
+def _indice():
+    indice = IndiceBusqueda()
+    indice.construir([
+        {"Documento_ID": "1020304050", "Nombre": "Ana María Gómez", "WhatsApp": "+57 300 123 4567",
+         "Email": "ana.gomez@correo.com", "Estado": "Pre-Inscrito"},
+        {"Documento_ID": "1020", "Nombre": "Anabel Ruiz", "WhatsApp": "3109876543",
+         "Email": "anabel@correo.com", "Estado": "Entrevistado"},
+        {"Documento_ID": "55667788", "Nombre": "Carlos Pérez", "WhatsApp": "3201112233",
+         "Email": "cperez@correo.com", "Estado": "Evaluado"},
+    ])
+    return indice
+
+
+def _documentos(resultados):
+    return [datos["Documento_ID"] for _, datos in resultados]
+
+
+def test_busca_por_prefijo_de_nombre():
+    indice = _indice()
+    # "ana" exacto puntúa más que el prefijo de "anabel"
+    assert _documentos(indice.buscar("ana")) == ["1020304050", "1020"]
+    assert _documentos(indice.buscar("perez")) == ["55667788"]
+    assert _documentos(indice.buscar("ana gomez")) == ["1020304050"]
+
+
+def test_busca_por_email_y_telefono():
+    indice = _indice()
+    assert _documentos(indice.buscar("ana.gomez@correo.com")) == ["1020304050"]
+    assert _documentos(indice.buscar("cperez")) == ["55667788"]
+    assert _documentos(indice.buscar("300 123 4567")) == ["1020304050"]
+    # Últimos dígitos del WhatsApp
+    assert _documentos(indice.buscar("6543")) == ["1020"]
+
+
+def test_documento_exacto_primero():
+    resultados = _indice().buscar("1020")
+    assert _documentos(resultados) == ["1020", "1020304050"]
+    assert resultados[0][0] == 2.0
+
+
+def test_sin_coincidencias():
+    indice = _indice()
+    assert indice.buscar("zz") == []
+    assert indice.buscar("ana perez") == []
+    assert indice.buscar("a") == []
+
+
+def test_aplicar_mueve_las_claves_del_prospecto():
+    indice = _indice()
+    indice.aplicar("55667788", {"Nombre": "Carlos Díaz"})
+    assert indice.buscar("perez") == []
+    assert _documentos(indice.buscar("diaz")) == ["55667788"]
+    assert indice.buscar("diaz")[0][1]["Email"] == "cperez@correo.com"
+    indice.aplicar("999", {"Nombre": "Daniela Ortiz", "WhatsApp": "3150000000"})
+    assert len(indice) == 4
+    assert _documentos(indice.buscar("daniela")) == ["999"]
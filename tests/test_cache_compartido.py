@@ -0,0 +1,42 @@
+import pickle
+import sqlite3
+
+from cache_compartido import CacheSQLite, _deserializar, _serializar
+
+
+class _Ejecutado(Exception):
+    pass
+
+
+class _Malicioso:
+    def __reduce__(self):
+        return (exec, ("raise _Ejecutado()",))
+
+
+def test_valores_del_cache_van_en_json():
+    indice = {"filas": {str(i): i + 2 for i in range(20000)}, "instante": 1.5}
+    datos = _serializar(indice)
+    assert datos[:1] == b"z"
+    assert _deserializar(datos) == indice
+    assert _deserializar(_serializar(["Nombre", "Ciudad"])) == ["Nombre", "Ciudad"]
+
+
+def test_un_pickle_escrito_en_el_cache_no_se_ejecuta(tmp_path):
+    ruta = str(tmp_path / "cache.db")
+    cache = CacheSQLite(ruta)
+    cache.guardar("encabezados", ["Documento_ID"], 60)
+    conn = sqlite3.connect(ruta)
+    with conn:
+        conn.execute("UPDATE cache SET valor = ? WHERE clave = 'encabezados'",
+                     (b"p" + pickle.dumps(_Malicioso()),))
+    conn.close()
+    # Cuenta como ausente y se recalcula
+    assert cache.obtener("encabezados") is None
+    assert cache.obtener_o_calcular("encabezados", lambda: ["Documento_ID"], 60) == ["Documento_ID"]
+
+
+def test_incrementar_vence(tmp_path):
+    cache = CacheSQLite(str(tmp_path / "cache.db"))
+    assert [cache.incrementar("intentos", 60) for _ in range(3)] == [1, 2, 3]
+    assert cache.incrementar("breve", -1) == 1
+    assert cache.incrementar("breve", 60) == 1
@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+from falsos import HojaFalsa, _Respuesta, generar_prospectos
+from gspread.exceptions import APIError
+
+from almacenamiento import COLUMNAS
+from cliente_sheets import HojaProtegida, LimiteTokens
+
+
+class HojaQueFalla(HojaFalsa):
+    """HojaFalsa cuyas próximas llamadas responden con los códigos de `fallos`."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fallos = []
+
+    def _llamada(self, metodo, escritura=False):
+        super()._llamada(metodo, escritura)
+        if self.fallos:
+            raise APIError(_Respuesta(self.fallos.pop(0)))
+
+
+def _protegida(hoja):
+    return HojaProtegida(hoja, espera_base=0.001, espera_max=0.01)
+
+
+def test_lecturas_identicas_en_curso_se_unen():
+    hoja = HojaFalsa([list(COLUMNAS)] + generar_prospectos(20), latencia=0.2)
+    protegida = _protegida(hoja)
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(protegida.col_values(1))) for _ in range(8)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert hoja.conteo() == {"col_values": 1}
+    assert len(resultados) == 8 and all(r == resultados[0] for r in resultados)
+    # Cada sesión recibe su propia lista
+    assert len({id(r) for r in resultados}) == 8
+
+
+def test_lecturas_reintentan_cuota_y_5xx():
+    hoja = HojaQueFalla([list(COLUMNAS)] + generar_prospectos(5))
+    hoja.fallos = [429, 503]
+    assert len(_protegida(hoja).col_values(1)) == 6
+    assert hoja.conteo()["col_values"] == 3
+
+
+def test_un_4xx_no_se_reintenta():
+    hoja = HojaQueFalla([list(COLUMNAS)])
+    hoja.fallos = [400]
+    with pytest.raises(APIError):
+        _protegida(hoja).row_values(1)
+    assert hoja.conteo()["row_values"] == 1
+
+
+def test_append_solo_se_reintenta_por_cuota():
+    hoja = HojaQueFalla([list(COLUMNAS)])
+    protegida = _protegida(hoja)
+    hoja.fallos = [429]
+    protegida.append_rows([["1"]])
+    assert hoja.conteo()["append_rows"] == 2
+    # Un 5xx pudo haberse aplicado: repetirlo duplicaría la fila
+    hoja.fallos = [503]
+    with pytest.raises(APIError):
+        protegida.append_rows([["2"]])
+    assert hoja.conteo()["append_rows"] == 3
+
+
+def test_limite_de_tokens():
+    limite = LimiteTokens(600, capacidad=2)
+    inicio = time.monotonic()
+    esperas = [limite.tomar() for _ in range(4)]
+    assert esperas[:2] == [0.0, 0.0]
+    assert time.monotonic() - inicio >= 0.15
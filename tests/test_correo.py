@@ -0,0 +1,89 @@
+import smtplib
+import time
+
+import pytest
+
+from correo import BandejaSalida
+
+
+class SMTPFalso:
+    """Conexión SMTP en memoria; `fallos` es una lista de excepciones a lanzar en los próximos envíos."""
+
+    conexiones = []
+
+    def __init__(self, host, puerto, timeout=None):
+        self.enviados = []
+        self.fallos = SMTPFalso.fallos
+        SMTPFalso.conexiones.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, usuario, clave):
+        pass
+
+    def sendmail(self, remitente, destinatario, mensaje):
+        if self.fallos:
+            raise self.fallos.pop(0)
+        self.enviados.append(destinatario)
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def bandeja(tmp_path):
+    SMTPFalso.conexiones = []
+    SMTPFalso.fallos = []
+    b = BandejaSalida(str(tmp_path / "outbox.db"), "estudio@example.com", "x", smtp_factory=SMTPFalso,
+                      max_intentos=3, espera_base=0.01, espera_max=0.05)
+    yield b
+    b.detener()
+
+
+def _esperar(bandeja, ids, timeout=5):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        estados = [bandeja.estado(i) for i in ids]
+        if "pendiente" not in estados:
+            return estados
+        time.sleep(0.01)
+    raise AssertionError(f"Correos sin despachar: {estados}")
+
+
+def _enviados():
+    return [d for c in SMTPFalso.conexiones for d in c.enviados]
+
+
+def test_una_conexion_para_varios_correos(bandeja):
+    ids = [bandeja.encolar(f"p{i}@example.com", "Asunto", "Cuerpo", b"%PDF", "a.pdf") for i in range(5)]
+    assert _esperar(bandeja, ids) == ["enviado"] * 5
+    assert _enviados() == [f"p{i}@example.com" for i in range(5)]
+    assert len(SMTPFalso.conexiones) == 1
+
+
+def test_reconecta_si_el_servidor_cerro_la_conexion(bandeja):
+    primero = bandeja.encolar("a@example.com", "Asunto", "Cuerpo")
+    _esperar(bandeja, [primero])
+    SMTPFalso.fallos.append(smtplib.SMTPServerDisconnected("cerrada"))
+    segundo = bandeja.encolar("b@example.com", "Asunto", "Cuerpo")
+    assert _esperar(bandeja, [segundo]) == ["enviado"]
+    assert _enviados() == ["a@example.com", "b@example.com"]
+    assert len(SMTPFalso.conexiones) == 2
+
+
+def test_reintenta_con_backoff_y_descarta_tras_max_intentos(bandeja):
+    SMTPFalso.fallos.extend([OSError("caído")])
+    reintentado = bandeja.encolar("a@example.com", "Asunto", "Cuerpo")
+    assert _esperar(bandeja, [reintentado]) == ["enviado"]
+    SMTPFalso.fallos.extend([OSError("caído")] * 3)
+    descartado = bandeja.encolar("b@example.com", "Asunto", "Cuerpo")
+    assert _esperar(bandeja, [descartado]) == ["fallido"]
+    assert bandeja.pendientes() == 0
+
+
+def test_destinatario_rechazado_no_se_reintenta(bandeja):
+    SMTPFalso.fallos.append(smtplib.SMTPRecipientsRefused({"x@example": (550, b"no existe")}))
+    rechazado = bandeja.encolar("x@example", "Asunto", "Cuerpo")
+    assert _esperar(bandeja, [rechazado]) == ["fallido"]
+    assert len(SMTPFalso.conexiones) == 1
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from falsos import generar_prospectos, registros
+
+from almacenamiento import AlmacenSQLite
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def dashboard(tmp_path):
+    from streamlit.testing.v1 import AppTest
+    db = str(tmp_path / "glamour.db")
+    AlmacenSQLite(db).agregar_lote(registros(generar_prospectos(300)))
+    at = AppTest.from_file(os.path.join(RAIZ, "inscripcion.py"), default_timeout=120)
+    at.secrets.update({
+        "admin_password": "x", "gmail_user": "a@b.c", "gmail_pass": "x",
+        "storage_backend": "sqlite", "sqlite_path": db,
+        "journal_path": str(tmp_path / "diario.db"), "outbox_path": str(tmp_path / "outbox.db"),
+    })
+    at.session_state["authenticated"] = True
+    at.run()
+    at.sidebar.selectbox[0].select("Dashboard").run()
+    assert not at.exception
+    return at
+
+
+def _pagina(at):
+    return next(w for w in at.number_input if w.label == "Página")
+
+
+@pytest.mark.parametrize("cambiar", [
+    lambda at: next(w for w in at.text_input if w.label.startswith("Buscar")).input("a"),
+    lambda at: next(w for w in at.selectbox if w.label == "Ordenar por").select("Nombre"),
+    lambda at: next(w for w in at.toggle if w.label == "Descendente").set_value(False),
+    lambda at: next(w for w in at.selectbox if w.label == "Filas").select(25),
+], ids=["busqueda", "orden", "sentido", "filas"])
+def test_cambiar_la_consulta_vuelve_a_la_primera_pagina(dashboard, cambiar):
+    _pagina(dashboard).set_value(3).run()
+    assert _pagina(dashboard).value == 3
+    cambiar(dashboard).run()
+    assert not dashboard.exception
+    assert _pagina(dashboard).value == 1
+    assert not dashboard.warning
+
+
+def test_otra_pagina_sin_cambiar_la_consulta_se_conserva(dashboard):
+    _pagina(dashboard).set_value(2).run()
+    dashboard.run()
+    assert _pagina(dashboard).value == 2
+
+
+def test_una_pagina_fuera_de_rango_se_acota_al_maximo(dashboard):
+    # P.ej. la página guardada de antes de que otra réplica archivara prospectos
+    maximo = _pagina(dashboard).max
+    dashboard.session_state["dashboard_pagina"] = maximo + 5
+    dashboard.run()
+    assert not dashboard.exception
+    assert 1 <= _pagina(dashboard).value <= maximo
+    assert not dashboard.warning
@@ -0,0 +1,103 @@
+import pytest
+
+from diario import DiarioInscripciones
+
+
+class _Respuesta:
+    def __init__(self, codigo):
+        self.status_code = codigo
+
+
+class ErrorAPI(Exception):
+    def __init__(self, codigo):
+        super().__init__(f"HTTP {codigo}")
+        self.response = _Respuesta(codigo)
+
+
+class DestinoFalso:
+    """Almacen mínimo: agregar_lote puede fallar después de aplicar, o rechazar un documento."""
+
+    def __init__(self):
+        self.filas = []
+        self.fallar_tras_aplicar = 0
+        self.rechazados = set()
+
+    def existe(self, documento_id):
+        return any(f["Documento_ID"] == documento_id for f in self.filas)
+
+    def agregar_lote(self, registros):
+        if any(r["Documento_ID"] in self.rechazados for r in registros):
+            raise ErrorAPI(400)
+        self.filas.extend(registros)
+        if self.fallar_tras_aplicar:
+            self.fallar_tras_aplicar -= 1
+            raise ErrorAPI(503)
+
+
+@pytest.fixture
+def avisos():
+    return []
+
+
+@pytest.fixture
+def diario(tmp_path, avisos):
+    destino = DestinoFalso()
+    d = DiarioInscripciones(str(tmp_path / "diario.db"), destino, tam_lote=10, intervalo=3600,
+                            al_fallar=lambda data, error: avisos.append((data["Documento_ID"], str(error))))
+    d.detener()
+    yield d, destino
+
+
+def test_lote_aplicado_con_5xx_no_se_duplica(diario):
+    d, destino = diario
+    for i in range(3):
+        d.registrar({"Documento_ID": str(i)})
+    destino.fallar_tras_aplicar = 1
+    with pytest.raises(ErrorAPI):
+        d.vaciar()
+    assert d.resumen() == {"enviando": 3}
+    d.vaciar()
+    assert [f["Documento_ID"] for f in destino.filas] == ["0", "1", "2"]
+    assert d.resumen() == {"escrito": 3}
+
+
+def test_registro_rechazado_queda_fallido_sin_retener_el_lote(diario, avisos):
+    d, destino = diario
+    destino.rechazados = {"1"}
+    for i in range(3):
+        d.registrar({"Documento_ID": str(i)})
+    d.vaciar()
+    assert [f["Documento_ID"] for f in destino.filas] == ["0", "2"]
+    assert d.resumen() == {"escrito": 2, "fallido": 1}
+    assert d.estado("1")["estado"] == "fallido"
+    assert not d.contiene("1")
+    assert avisos == [("1", "HTTP 400")]
+    # Los fallidos no vuelven a la cola
+    d.registrar({"Documento_ID": "3"})
+    d.vaciar()
+    assert [f["Documento_ID"] for f in destino.filas] == ["0", "2", "3"]
+
+
+def test_un_registro_solo_rechazado_se_avisa_una_vez(diario, avisos):
+    d, destino = diario
+    destino.rechazados = {"7"}
+    d.registrar({"Documento_ID": "7", "Nombre": "Ana"})
+    d.vaciar()
+    d.vaciar()
+    assert avisos == [("7", "HTTP 400")]
+    assert d.resumen() == {"fallido": 1}
+
+
+def test_un_aviso_que_falla_no_detiene_el_diario(tmp_path):
+    destino = DestinoFalso()
+    destino.rechazados = {"1"}
+
+    def al_fallar(data, error):
+        raise RuntimeError("SMTP caído")
+
+    d = DiarioInscripciones(str(tmp_path / "diario.db"), destino, intervalo=3600, al_fallar=al_fallar)
+    d.detener()
+    d.registrar({"Documento_ID": "1"})
+    d.registrar({"Documento_ID": "2"})
+    d.vaciar()
+    assert d.resumen() == {"escrito": 1, "fallido": 1}
@@ -0,0 +1,61 @@
+import difflib
+
+from duplicados import MAX_BLOQUE, IndiceDuplicados
+
+
+def _indice(registros):
+    indice = IndiceDuplicados()
+    indice.construir(registros)
+    return indice
+
+
+ANA = {"Documento_ID": "1032456789", "Nombre": "Ana María Gómez", "Email": "ana.gomez@gmail.com",
+       "WhatsApp": "+57 310 555 1234"}
+
+
+def test_mismo_email_con_documento_mal_escrito():
+    indice = _indice([ANA])
+    nuevo = {"Documento_ID": "9999999999", "Nombre": "A. Gomez", "Email": "Ana.Gomez+cam@gmail.com",
+             "WhatsApp": "3000000000"}
+    assert [(doc, motivos) for _, doc, _, motivos in indice.buscar(nuevo)] == [("1032456789", ["email"])]
+
+
+def test_mismo_whatsapp_basta():
+    indice = _indice([ANA])
+    nuevo = {"Documento_ID": "1032456788", "Nombre": "Carolina Ruiz", "Email": "caro@hotmail.com",
+             "WhatsApp": "310-555-1234"}
+    assert [doc for _, doc, _, _ in indice.buscar(nuevo)] == ["1032456789"]
+
+
+def test_solo_un_nombre_parecido_no_marca():
+    indice = _indice([ANA])
+    nuevo = {"Documento_ID": "52111222", "Nombre": "Ana Maria Gomez", "Email": "otra@yahoo.com",
+             "WhatsApp": "3209998877"}
+    assert indice.buscar(nuevo) == []
+
+
+def test_altas_por_el_feed_se_encuentran():
+    indice = _indice([])
+    indice.aplicar("1032456789", ANA)
+    assert indice.buscar(dict(ANA, Documento_ID="1032456780"))[0][1] == "1032456789"
+    # El propio documento nunca es su duplicado
+    assert indice.buscar(ANA) == []
+
+
+def test_partes_locales_comunes_no_se_comparan_con_todos(monkeypatch):
+    registros = [{"Documento_ID": str(10**6 + i), "Nombre": f"Empresa {i}", "Email": f"info@dominio{i}.com"}
+                 for i in range(MAX_BLOQUE + 10)]
+    indice = _indice(registros)
+    comparados = []
+    comparar = difflib.SequenceMatcher
+
+    def contar(*args, **kwargs):
+        comparados.append(1)
+        return comparar(*args, **kwargs)
+
+    monkeypatch.setattr(difflib, "SequenceMatcher", contar)
+    # Sin el tope, el bloque "u:info" traería a todos como candidatos
+    assert indice.buscar({"Documento_ID": "5", "Nombre": "Otra Empresa", "Email": "info@otro.com"}) == []
+    assert len(comparados) < 10
+    # El email completo sigue encontrando al duplicado
+    assert indice.buscar({"Documento_ID": "5", "Nombre": "X", "Email": "info@dominio7.com"})[0][1] == "1000007"
@@ -0,0 +1,38 @@
+import pytest
+
+from evaluacion import BUENO, MALO, MUY_BUENO, Rubrica, codificar
+
+
+@pytest.fixture
+def rubrica():
+    return Rubrica()
+
+
+def test_evaluar_pondera_categorias_y_suma_bono(rubrica):
+    n = len(rubrica.items)
+    assert rubrica.evaluar([4] * n, "")[:2] == (100.0, MUY_BUENO)
+    total, clasif, por_cat = rubrica.evaluar([1] * n, "El Mago")
+    assert (total, clasif) == (30.0, MALO)
+    assert set(por_cat.values()) == {25.0}
+    assert rubrica.evaluar([3] * n, "")[:2] == (75.0, BUENO)
+
+
+def test_las_etiquetas_siguen_los_pesos_configurados():
+    rubrica = Rubrica.desde_config({"pesos": {"Actitud y Valores": 0.1, "Conocimientos y Background (30%)": 0.4}})
+    assert rubrica.etiquetas["Actitud y Valores"] == "Actitud y Valores (10%)"
+    assert rubrica.etiquetas["Conocimientos y Background"] == "Conocimientos y Background (40%)"
+    _, _, por_cat = rubrica.evaluar([4] * len(rubrica.items), "")
+    assert list(por_cat) == list(rubrica.etiquetas.values())
+    assert "Actitud y Valores (20%)" in Rubrica().etiquetas.values()
+
+
+def test_recalcular_devuelve_solo_los_que_cambian(rubrica):
+    n = len(rubrica.items)
+    registros = [
+        {"Documento_ID": "1", "Puntajes_Items": codificar([4] * n), "Score_Total": 100.0, "Clasificacion": MUY_BUENO},
+        {"Documento_ID": "2", "Puntajes_Items": codificar([3] * n), "Score_Total": 10, "Clasificacion": MALO},
+        {"Documento_ID": "3", "Puntajes_Items": "", "Score_Total": 50},
+    ]
+    assert rubrica.recalcular(registros) == {"2": {"Score_Total": 75.0, "Clasificacion": BUENO}}
+    umbral_alto = Rubrica.desde_config({"umbral_bueno": 80, "umbral_muy_bueno": 99})
+    assert umbral_alto.recalcular(registros[1:2]) == {"2": {"Score_Total": 75.0, "Clasificacion": MALO}}
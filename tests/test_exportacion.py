@@ -0,0 +1,42 @@
+import csv
+
+import pytest
+from falsos import HojaFalsa, generar_prospectos
+
+from almacenamiento import COLUMNAS, AlmacenSheets
+from exportacion import ExportadorProspectos
+
+
+def _exportar(filas, tmp_path, tam_bloque=1000):
+    ruta = str(tmp_path / "prospectos.csv")
+    total = ExportadorProspectos(AlmacenSheets(HojaFalsa([list(COLUMNAS)] + filas)), tam_bloque).exportar(ruta)
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        return total, list(csv.DictReader(archivo))
+
+
+def test_fila_en_blanco_al_final_de_un_bloque_no_corta_la_exportacion(tmp_path):
+    filas = generar_prospectos(2500)
+    # Fila 1000 de la hoja: la última del primer bloque (filas 2..1001)
+    filas[998] = [""] * len(COLUMNAS)
+    total, exportadas = _exportar(filas, tmp_path)
+    assert total == 2499
+    assert exportadas[-1]["Documento_ID"] == filas[-1][0]
+
+
+def test_bloque_completo_en_blanco_en_medio(tmp_path):
+    filas = generar_prospectos(250)
+    for i in range(100, 200):
+        filas[i] = [""] * len(COLUMNAS)
+    total, _ = _exportar(filas, tmp_path, tam_bloque=50)
+    assert total == 150
+
+
+def test_parquet_tipado(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    filas = generar_prospectos(120)
+    ruta = str(tmp_path / "prospectos.parquet")
+    total = ExportadorProspectos(AlmacenSheets(HojaFalsa([list(COLUMNAS)] + filas)), 50).exportar(ruta)
+    tabla = pq.read_table(ruta)
+    assert total == tabla.num_rows == 120
+    assert str(tabla.schema.field("Fecha_Pre").type).startswith("timestamp")
+    assert tabla.column("Documento_ID").to_pylist() == [str(f[0]) for f in filas]
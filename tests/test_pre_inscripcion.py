@@ -0,0 +1,69 @@
+import os
+import sqlite3
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def formulario(tmp_path):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.join(RAIZ, "inscripcion.py"), default_timeout=120)
+    at.secrets.update({
+        "admin_password": "x", "gmail_user": "a@b.c", "gmail_pass": "x",
+        "storage_backend": "sqlite", "sqlite_path": str(tmp_path / "glamour.db"),
+        "journal_path": str(tmp_path / "diario.db"), "outbox_path": str(tmp_path / "outbox.db"),
+        "shared_cache": str(tmp_path / "cache.db"),
+    })
+    at.run()
+    return at
+
+
+def _widget(lista, etiqueta):
+    return next(w for w in lista if w.label == etiqueta)
+
+
+def _llenar(at, documento):
+    for etiqueta, valor in [
+        ("Nombres y apellidos", f"Prospecto {documento}"),
+        ("Número de Documento", documento),
+        ("WhatsApp / Celular", f"3{documento[-9:]}"),
+        ("E-mail", f"p{documento}@example.com"),
+        ("Ciudad", "Medellín"),
+    ]:
+        _widget(at.text_input, etiqueta).input(valor)
+    _widget(at.checkbox, "Acepto autorización preliminar de datos").check()
+
+
+def _enviar(at):
+    _widget(at.button, "Enviar Pre-Inscripción").click().run()
+    assert not at.exception
+    return [e.value for e in at.error], [w.value for w in at.warning]
+
+
+def _registrados(tmp_path):
+    with sqlite3.connect(str(tmp_path / "diario.db")) as conn:
+        return [d for (d,) in conn.execute("SELECT documento_id FROM diario ORDER BY id")]
+
+
+def test_un_envio_rechazado_por_validacion_no_cuenta_para_la_espera(formulario, tmp_path):
+    _llenar(formulario, "1000000001")
+    _widget(formulario.radio, "¿Tienes Hijos?").set_value("Sí")
+    _widget(formulario.number_input, "Cantidad de hijos").set_value(0)
+    errores, _ = _enviar(formulario)
+    assert errores == ["Si tiene hijos, la cantidad no puede ser 0."]
+
+    _widget(formulario.number_input, "Cantidad de hijos").set_value(1)
+    errores, avisos = _enviar(formulario)
+    assert not errores and not avisos
+    assert _registrados(tmp_path) == ["1000000001"]
+
+
+def test_la_espera_es_por_cliente_y_no_por_documento(formulario, tmp_path):
+    _llenar(formulario, "1000000002")
+    assert _enviar(formulario) == ([], [])
+    _llenar(formulario, "1000000003")
+    _, avisos = _enviar(formulario)
+    assert avisos == ["Debes esperar 30 segundos antes de enviar otro formulario."]
+    assert _registrados(tmp_path) == ["1000000002"]
@@ -0,0 +1,41 @@
+from falsos import HojaFalsa, generar_prospectos
+
+from almacenamiento import COLUMNAS, AlmacenSheets
+from sincronizacion import SincronizacionIncremental
+
+
+def test_filas_borradas_al_final_recargan_la_copia():
+    hoja = HojaFalsa([list(COLUMNAS)] + generar_prospectos(100))
+    sinc = SincronizacionIncremental(AlmacenSheets(hoja))
+    assert len(sinc.dataframe()) == 100
+    # Archivo de finalizados: se borran las últimas filas, pocas frente al total
+    del hoja.filas[-3:]
+    df = sinc.dataframe()
+    assert len(df) == 97
+    assert df["Documento_ID"].astype(str).tolist() == [str(f[0]) for f in hoja.filas[1:]]
+
+
+def test_sin_borrados_no_recarga():
+    hoja = HojaFalsa([list(COLUMNAS)] + generar_prospectos(100))
+    sinc = SincronizacionIncremental(AlmacenSheets(hoja))
+    sinc.dataframe()
+    hoja.filas.append(generar_prospectos(101)[-1])
+    assert len(sinc.dataframe()) == 101
+    assert hoja.conteo().get("get_all_values") == 1
+
+
+def test_filas_en_blanco_agregadas_no_corren_las_posiciones():
+    hoja = HojaFalsa([list(COLUMNAS)] + generar_prospectos(50))
+    sinc = SincronizacionIncremental(AlmacenSheets(hoja))
+    sinc.dataframe()
+    nuevas = generar_prospectos(53)[-3:]
+    hoja.filas += [nuevas[0], [""] * len(COLUMNAS), nuevas[1], nuevas[2]]
+    df = sinc.dataframe()
+    assert df["Documento_ID"].astype(str).tolist()[-3:] == [str(f[0]) for f in nuevas]
+    # Un cambio en la última fila se relee en su posición real de la hoja
+    estado = COLUMNAS.index("Estado")
+    hoja.filas[-1][estado] = "Evaluado"
+    df = sinc.dataframe()
+    assert df.iloc[-1]["Estado"] == "Evaluado"
+    assert df["Documento_ID"].astype(str).tolist() == [str(f[0]) for f in hoja.filas[1:] if f[0]]
+    assert hoja.conteo().get("get_all_values") == 1
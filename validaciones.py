@@ -0,0 +1,36 @@
+import datetime
+import re
+
+# Formatos de fecha aceptados en la hoja y en archivos importados (además de ISO con hora)
+FORMATOS_FECHA = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d"]
+
+# ==============================
+# VALIDACIONES
+# ==============================
+def validar_email(email):
+    return bool(re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", email))
+
+def validar_nombre(nombre):
+    return len(nombre.strip()) >= 3
+
+def validar_telefono(tel):
+    cleaned = re.sub(r'[^0-9]', '', tel)
+    return 7 <= len(cleaned) <= 15
+
+def validar_edad_minima(fecha_nacimiento):
+    hoy = datetime.date.today()
+
+    if fecha_nacimiento > hoy:
+        return False, "La fecha de nacimiento no puede ser futura."
+
+    edad = hoy.year - fecha_nacimiento.year - (
+        (hoy.month, hoy.day) < (fecha_nacimiento.month, fecha_nacimiento.day)
+    )
+
+    if edad < 18:
+        return False, f"Debe tener al menos 18 años (edad actual: {edad})"
+
+    if edad > 55:
+        return False, f"La edad máxima permitida es 55 años (edad actual: {edad})"
+
+    return True, f"Edad válida: {edad} años (prospecto permitido)"